@@ -0,0 +1,18 @@
+"""
+Lil' Bin Boy, sans GUI: stream TRTs out of Avid bins from your own scripts.
+
+	from lilbinboy import api
+
+	settings = api.TRTCalculationSettings(trim_head="8:00", trim_tail="4:00")
+	for entry in api.iter_trt(["Reel 1.avb", "Reel 2.avb"], settings):
+		print(entry.timeline.timelineName(), entry.running_total)
+
+Nothing in here touches Qt.
+"""
+
+from ..lbb_features.trt.logic_trt import BinReadMode, TimelineInfo, get_timelines_from_bin
+from ..lbb_features.trt.executors_trt import ParseBackend
+from ..lbb_features.trt.index_trt import BinIndexOptions
+from ..lbb_features.trt.scan_trt import BinScanOptions, iter_bin_paths
+from ..lbb_features.trt.calc_trt import LBMarkerPreset, NameContainsFilter, SequenceSelectionMode, TRTCalculationSettings, TrimmedTimeline, total_runtime
+from .pipeline import BinResult, TRTBinError, TRTEntry, TRTSummary, calculate_trt, iter_bins, iter_trt
@@ -0,0 +1,137 @@
+"""
+Streaming TRT pipeline: bin paths go in, trimmed timelines (with running totals) come out
+as the bins get parsed.  Nothing gets held on to that the caller doesn't hold on to.
+"""
+
+import dataclasses, typing
+from timecode import Timecode
+from ..lbb_features.trt import calc_trt, executors_trt, identity_trt, index_trt, logic_trt
+
+class TRTBinError(Exception):
+	"""A bin couldn't be read"""
+
+	def __init__(self, bin_path:str, error:Exception):
+		super().__init__(f"Couldn't read {bin_path}: {error}")
+		self.bin_path = bin_path
+		self.error = error
+
+@dataclasses.dataclass(frozen=True)
+class BinResult:
+	"""A bin, once it's been parsed (or failed to be)"""
+
+	bin_path:str
+	timelines:list[logic_trt.TimelineInfo]
+	error:Exception|None = None
+
+	def isLocked(self) -> bool:
+		return any(t.bin_lock for t in self.timelines)
+
+@dataclasses.dataclass(frozen=True)
+class TRTEntry:
+	"""A timeline that counts towards the TRT, plus the totals so far"""
+
+	timeline:calc_trt.TrimmedTimeline
+	"""The timeline, trimmed"""
+
+	bin_path:str
+	"""The bin it came from"""
+
+	running_total:Timecode
+	"""TRT so far, including this timeline and the final adjustment"""
+
+	sequence_count:int
+	"""Timelines counted so far, including this one"""
+
+	bin_count:int
+	"""Bins read so far"""
+
+@dataclasses.dataclass(frozen=True)
+class TRTSummary:
+	"""The bottom line"""
+
+	total_runtime:Timecode
+	sequence_count:int
+	bin_count:int
+	locked_bins:list[str]
+	failed_bins:list[str]
+
+def iter_bins(bin_paths:typing.Iterable[str], max_workers:int|None=None, max_pending:int|None=None, index_options:index_trt.BinIndexOptions|None=index_trt.DEFAULT_INDEX_OPTIONS, read_mode:logic_trt.BinReadMode=logic_trt.BinReadMode.AUTO, backend:executors_trt.ParseBackend=executors_trt.ParseBackend.AUTO) -> typing.Iterator[BinResult]:
+	"""Parse bins in parallel, yielding each one as it finishes (not necessarily in order).  A bin given twice, by any path, is only read once."""
+
+	for bin_path, timelines, error in logic_trt.iter_timelines_from_bins(identity_trt.iter_unique_bin_paths(bin_paths), max_workers=max_workers, max_pending=max_pending, index_options=index_options, read_mode=read_mode, backend=backend):
+		yield BinResult(bin_path=bin_path, timelines=timelines or [], error=error)
+
+def iter_trt(bin_paths:typing.Iterable[str], settings:calc_trt.TRTCalculationSettings|None=None, max_workers:int|None=None, max_pending:int|None=None, on_bin:typing.Callable[[BinResult], None]|None=None, index_options:index_trt.BinIndexOptions|None=index_trt.DEFAULT_INDEX_OPTIONS, read_mode:logic_trt.BinReadMode=logic_trt.BinReadMode.AUTO, backend:executors_trt.ParseBackend=executors_trt.ParseBackend.AUTO) -> typing.Iterator[TRTEntry]:
+	"""
+	Parse bins and yield each selected, trimmed timeline with the running TRT.
+
+	Bins that can't be read raise `TRTBinError`, unless `on_bin` is given: it's called with every
+	`BinResult` (errors and all) before that bin's timelines are yielded, and errors are left to it.
+	"""
+
+	settings = settings or calc_trt.TRTCalculationSettings()
+	trim_total = settings.trimTotal()
+
+	running_duration = Timecode(0, rate=settings.rate)
+	sequence_count = 0
+	bin_count = 0
+
+	for bin_result in iter_bins(bin_paths, max_workers=max_workers, max_pending=max_pending, index_options=index_options, read_mode=read_mode, backend=backend):
+
+		if on_bin is not None:
+			on_bin(bin_result)
+		elif bin_result.error is not None:
+			raise TRTBinError(bin_result.bin_path, bin_result.error) from bin_result.error
+
+		if bin_result.error is not None:
+			continue
+
+		bin_count += 1
+
+		for timeline_info in settings.selectTimelines(bin_result.timelines):
+
+			trimmed = settings.trimTimeline(timeline_info)
+
+			running_duration += trimmed.timelineTimecodeTrimmed().duration
+			sequence_count += 1
+
+			yield TRTEntry(
+				timeline       = trimmed,
+				bin_path       = bin_result.bin_path,
+				running_total  = max(Timecode(0, rate=settings.rate), running_duration + trim_total),
+				sequence_count = sequence_count,
+				bin_count      = bin_count,
+			)
+
+def calculate_trt(bin_paths:typing.Iterable[str], settings:calc_trt.TRTCalculationSettings|None=None, max_workers:int|None=None, max_pending:int|None=None, index_options:index_trt.BinIndexOptions|None=index_trt.DEFAULT_INDEX_OPTIONS, read_mode:logic_trt.BinReadMode=logic_trt.BinReadMode.AUTO, backend:executors_trt.ParseBackend=executors_trt.ParseBackend.AUTO) -> TRTSummary:
+	"""Run the whole pipeline and just report the totals.  Unreadable bins are skipped and listed."""
+
+	settings = settings or calc_trt.TRTCalculationSettings()
+
+	locked_bins:list[str] = []
+	failed_bins:list[str] = []
+	bin_count = 0
+
+	def track_bin(bin_result:BinResult):
+		nonlocal bin_count
+		if bin_result.error is not None:
+			failed_bins.append(bin_result.bin_path)
+			return
+		bin_count += 1
+		if bin_result.isLocked():
+			locked_bins.append(bin_result.bin_path)
+
+	total_runtime = max(Timecode(0, rate=settings.rate), settings.trimTotal())
+	sequence_count = 0
+
+	for entry in iter_trt(bin_paths, settings, max_workers=max_workers, max_pending=max_pending, on_bin=track_bin, index_options=index_options, read_mode=read_mode, backend=backend):
+		total_runtime = entry.running_total
+		sequence_count = entry.sequence_count
+
+	return TRTSummary(
+		total_runtime  = total_runtime,
+		sequence_count = sequence_count,
+		bin_count      = bin_count,
+		locked_bins    = locked_bins,
+		failed_bins    = failed_bins,
+	)
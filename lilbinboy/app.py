@@ -0,0 +1,255 @@
+import logging, sys, typing
+from PySide6 import QtWidgets, QtGui, QtCore
+from . import Config, import_report, lbb_common, lbb_features
+
+class LBBApplication(QtWidgets.QApplication):
+
+	def __init__(self, *args, **kwargs):
+
+		super().__init__(*args, **kwargs)
+
+		# Time each startup stage, so it's clear what's slowing down that first paint
+		self._startup_timer = QtCore.QElapsedTimer()
+		self._startup_timer.start()
+		self._stage_timer = QtCore.QElapsedTimer()
+		self._stage_timer.start()
+		self._deferred_startup_stages:list[tuple[str, typing.Callable[[], None]]] = []
+
+		self.setStyle(Config.APP_STYLE)
+
+
+		self.setOrganizationName(Config.ORG_NAME)
+		self.setOrganizationDomain(Config.ORG_DOMAIN)
+		self.setApplicationName(Config.APP_NAME)
+		self.setApplicationVersion(Config.APP_VERSION)
+
+		# Setup settings manager
+		self.settings_manager = lbb_common.LBSettingsManager(basepath=self.userDataLocation().toLocalFile(), format=QtCore.QSettings.Format.IniFormat)
+		app_settings = self.settings_manager.bufferedSettings("lbb")
+
+		# Settings changes are buffered and written in the background, so make sure they all land before quitting
+		self.aboutToQuit.connect(self.settings_manager.sync)
+
+		# Setup logging (written out on a background thread)
+		self.logging_manager = lbb_common.LBLoggingManager(self.userDataLocation().toLocalFile(), app_settings)
+		self.logging_manager.start()
+		self.aboutToQuit.connect(self.logging_manager.stop)
+		
+		log_app = logging.getLogger(__name__)
+		log_app.info("Using user data location %s", self.userDataLocation())
+		self._logStartupStage("Settings and logging")
+
+		# macOS Translucent background setup
+		if sys.platform == "darwin":
+			log_app.debug("Detected macOS, applying translucent surface")
+			surface_format = QtGui.QSurfaceFormat()
+			surface_format.setAlphaBufferSize(8)
+			QtGui.QSurfaceFormat.setDefaultFormat(surface_format)
+		
+		# Setup main window
+		self.wnd_main = lbb_common.wnd_main.LBMainWindow()
+		self.wnd_main.setWindowTitle(self.applicationName())
+
+		# Apply macOS translucent background
+		if sys.platform == "darwin":
+			self.wnd_main.setAttribute(QtCore.Qt.WA_TranslucentBackground)
+
+		# Attach window manager
+		self._windowmanager = lbb_common.windowmanager.WindowManager(self.wnd_main, app_settings, "main")
+		self._windowmanager.restoreWindowGeometry()
+
+		self.wnd_main.show()
+		self._logStartupStage("Main window")
+
+		# Setup main window
+		self.mnu_file = self.wnd_main.menuBar().addMenu("&File")
+
+		self.act_quit = QtGui.QAction("Quit")
+		self.act_quit.setMenuRole(QtGui.QAction.MenuRole.ApplicationSpecificRole)
+		self.act_quit.triggered.connect(self.wnd_main.close)
+		self.act_quit.setIcon(QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.ApplicationExit))
+		self.mnu_file.addAction(self.act_quit)
+
+		self.wnd_main.menuBar().addMenu("&Edit")
+		self.mnu_tools = self.wnd_main.menuBar().addMenu("&Tools")
+
+		self.act_datalocation = QtGui.QAction("Open Data Storage Location...")
+		self.act_datalocation.triggered.connect(lambda: QtGui.QDesktopServices.openUrl(self.userDataLocation()))
+		self.act_datalocation.setIcon(QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.FolderOpen))
+		self.mnu_tools.addAction(self.act_datalocation)
+
+
+		self.mnu_help = QtWidgets.QMenu("&Help")
+
+		self.act_wiki = QtGui.QAction("Lil' Bin Boy Wiki...")
+		self.act_wiki.triggered.connect(lambda: QtGui.QDesktopServices.openUrl(QtCore.QUrl("https://github.com/mjiggidy/lilbinboy/wiki")))
+		self.mnu_help.addAction(self.act_wiki)
+
+		self.act_updates = QtGui.QAction("Check For Updates...")
+		self.act_updates.setMenuRole(QtGui.QAction.MenuRole.ApplicationSpecificRole)
+		self.act_updates.triggered.connect(self.showCheckForUpdatesWindow)
+		self.mnu_help.addAction(self.act_updates)
+
+		self.mnu_help.addSeparator()
+		
+
+		self.act_aboutbox = QtGui.QAction("About Lil' Bin Boy...")
+		self.act_aboutbox.setMenuRole(QtGui.QAction.MenuRole.AboutRole)
+		self.act_aboutbox.triggered.connect(lambda: lbb_common.wnd_about.LBAboutWindow(self.wnd_main).exec())
+		self.act_aboutbox.setIcon(QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.HelpAbout))
+		self.mnu_help.addAction(self.act_aboutbox)
+		
+		self.wnd_main.menuBar().addMenu(self.mnu_help)
+
+		self._logStartupStage("Menus")
+
+		# The compiled resources are hefty, and nothing on the first paint really needs them
+		self._deferStartupStage("Resources", self._setupResources)
+
+		# Add feature tabs: the first one is visible, so it's built now.  The rest get placeholders for the time being.
+		self.updateManager = None
+		self.wnd_check = None
+
+		for feature_index, feature in enumerate(lbb_features.features):
+			if feature_index == 0:
+				self._addFeatureTab(feature)
+				self._logStartupStage(f"Feature tab \"{feature.title}\"")
+			else:
+				tab_index = self.wnd_main.tabs.addTab(QtWidgets.QWidget(), feature.title)
+				self._deferStartupStage(f"Feature tab \"{feature.title}\"", lambda feature=feature, tab_index=tab_index: self._addFeatureTab(feature, tab_index))
+
+		# Coming soon...
+		self.wnd_main.tabs.addTab(QtWidgets.QWidget(), str("Bin Snitch"))
+		self.wnd_main.tabs.addTab(QtWidgets.QWidget(), str("Attic Scrounger"))
+		self.wnd_main.tabs.addTab(QtWidgets.QWidget(), str("Batch Bin"))
+		self.wnd_main.tabs.addTab(QtWidgets.QWidget(), str("Porta-Nexis"))
+
+		# Check for Updates
+		self._deferStartupStage("Update manager", self._setupUpdateManager)
+
+		log_app.debug("Window ready in %i ms; %i startup stages deferred", self._startup_timer.elapsed(), len(self._deferred_startup_stages))
+		QtCore.QTimer.singleShot(0, self._runNextStartupStage)
+	
+	def _addFeatureTab(self, feature:lbb_features.LBFeature, tab_index:int|None=None):
+		"""Build a feature tab, optionally replacing the placeholder at `tab_index`"""
+
+		feature_instance = feature.factory(settings=self.settings_manager.bufferedSettings(feature.id))
+
+		if tab_index is None:
+			tab_index = self.wnd_main.tabs.addTab(feature_instance, feature.title)
+		else:
+			placeholder = self.wnd_main.tabs.widget(tab_index)
+			is_current = self.wnd_main.tabs.currentIndex() == tab_index
+			self.wnd_main.tabs.removeTab(tab_index)
+			self.wnd_main.tabs.insertTab(tab_index, feature_instance, feature.title)
+			placeholder.deleteLater()
+
+			if is_current:
+				self.wnd_main.tabs.setCurrentIndex(tab_index)
+		
+		self.wnd_main.tabs.setTabIcon(tab_index, QtGui.QIcon(feature_instance.PATH_ICON))
+	
+	def _setupResources(self):
+		"""Register the compiled resources, then set the icons that come from them"""
+
+		lbb_common.load_resources()
+
+		# Setup icon I guess
+		main_icon = QtGui.QIcon()
+		main_icon.addFile(":/app/icons/icon_16.png", QtCore.QSize(16,16))
+		main_icon.addFile(":/app/icons/icon_24.png", QtCore.QSize(24,24))
+		main_icon.addFile(":/app/icons/icon_32.png", QtCore.QSize(32,32))
+		main_icon.addFile(":/app/icons/icon_64.png", QtCore.QSize(64,64))
+		main_icon.addFile(":/app/icons/icon_128.png", QtCore.QSize(128,128))
+		main_icon.addFile(":/app/icons/icon_256.png", QtCore.QSize(256,256))
+
+		self.setWindowIcon(main_icon)
+
+		# Tabs built before now have some catching up to do
+		for tab_index in range(self.wnd_main.tabs.count()):
+			if isinstance(self.wnd_main.tabs.widget(tab_index), lbb_common.LBUtilityTab):
+				self.wnd_main.tabs.widget(tab_index).resourcesLoaded()
+	
+	def _setupUpdateManager(self):
+		"""Setup the update manager and its autocheck"""
+
+		if self.updateManager is not None:
+			return
+
+		app_settings = self.settings_manager.bufferedSettings("lbb")
+
+		self.updateManager = lbb_common.wnd_checkforupdates.LBUpdateManager()
+		self.updateManager.setReleasesUrl(QtCore.QUrl(app_settings.value("updates_manager/releases_url", lbb_common.wnd_checkforupdates.URL_RELEASES)))
+		self.updateManager.setCooldownInterval(int(app_settings.value("updates_manager/cooldown_interval_msec", 30 * 1000)))
+		self.updateManager.setAutoCheckInterval(int(app_settings.value("updates_manager/autocheck_interval_msec", 30 * 60 * 1000)))
+		self.updateManager.setAutoCheckEnabled(bool(int(app_settings.value("updates_manager/autocheck_enabled", 0))))
+		self.updateManager.sig_autoCheckChanged.connect(lambda is_enabled: app_settings.setValue("updates_manager/autocheck_enabled", int(is_enabled)))
+		self.updateManager.sig_newReleaseAvailable.connect(self.showCheckForUpdatesWindow)
+	
+	# ---
+	# Staged startup
+	# ---
+	def _logStartupStage(self, stage_name:str):
+		"""Log how long the stage that just finished took"""
+
+		logging.getLogger(__name__).debug("Startup stage \"%s\" took %i ms (%i ms since launch)", stage_name, self._stage_timer.restart(), self._startup_timer.elapsed())
+	
+	def _deferStartupStage(self, stage_name:str, stage:typing.Callable[[], None]):
+		"""Queue up a startup stage to run once the event loop is going"""
+
+		self._deferred_startup_stages.append((stage_name, stage))
+	
+	@QtCore.Slot()
+	def _runNextStartupStage(self):
+		"""Run one deferred startup stage, then give the event loop a turn before the next"""
+
+		if not self._deferred_startup_stages:
+			logging.getLogger(__name__).info("Startup complete in %i ms", self._startup_timer.elapsed())
+			if import_report.import_timer() is not None:
+				import_report.import_timer().logStartupReport()
+			return
+		
+		stage_name, stage = self._deferred_startup_stages.pop(0)
+
+		self._stage_timer.restart()
+		try:
+			stage()
+		except Exception as e:
+			logging.getLogger(__name__).exception("Deferred startup stage \"%s\" failed: %s", stage_name, e)
+		self._logStartupStage(stage_name)
+
+		QtCore.QTimer.singleShot(0, self._runNextStartupStage)
+
+	@QtCore.Slot()
+	def showCheckForUpdatesWindow(self):
+		"""Show the "Check For Updates" window"""
+
+		self._setupUpdateManager()
+
+		if self.wnd_check is None:
+			# Create new window if it wasn't visible
+			self.wnd_check = lbb_common.wnd_checkforupdates.LBCheckForUpdatesWindow(parent=self.wnd_main)
+			self.wnd_check.setUpdateManager(self.updateManager)
+
+			# Unset instance once closed
+			self.wnd_check.setAttribute(QtCore.Qt.WidgetAttribute.WA_DeleteOnClose)
+			self.wnd_check.destroyed.connect(lambda: setattr(self, "wnd_check", None))
+
+
+		# Check for updates on window open, unless a new release is already known
+		if self.updateManager.latestReleaseInfo() is None:
+			self.updateManager.checkForUpdates()
+			
+		self.wnd_check.show()
+
+	def userDataLocation(self) -> QtCore.QUrl:
+		logging.getLogger(__name__).debug("Reporting userDataLocation: %s",  QtCore.QUrl.fromLocalFile(QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.StandardLocation.AppDataLocation)))
+		return QtCore.QUrl.fromLocalFile(QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.StandardLocation.AppDataLocation))
+		
+
+def main():
+	app = LBBApplication()
+	app.exec()
+
+	# Catch anything saved by other `aboutToQuit` handlers after the first sync
+	app.settings_manager.sync()
\ No newline at end of file
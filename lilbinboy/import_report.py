@@ -0,0 +1,111 @@
+"""
+Lil' Import Timer Boy: keeps track of how long modules take to import, `-X importtime`-style,
+so slow startups can be blamed on somebody
+"""
+
+import sys, time, logging, threading
+import importlib.abc
+
+class LBImportTimer(importlib.abc.MetaPathFinder):
+	"""Meta path finder that times each module's first import"""
+
+	LAZY_IMPORT_LOG_THRESHOLD:float = 0.005
+	"""Once startup's reported, log any imports that take longer than this (in seconds)"""
+
+	def __init__(self):
+
+		self._timings:list[tuple[str, float, float]] = []
+		"""Module name, self time, cumulative time (in seconds)"""
+
+		self._local = threading.local()
+		self._startup_reported = False
+
+	def _stack(self) -> list[float]:
+		"""Time spent in nested imports, per import currently in progress on this thread"""
+		if not hasattr(self._local, "stack"):
+			self._local.stack = []
+		return self._local.stack
+
+	def find_spec(self, fullname:str, path, target=None):
+
+		# Ask everybody else, then time whatever loader they come up with
+		for finder in sys.meta_path:
+			if finder is self or not hasattr(finder, "find_spec"):
+				continue
+
+			spec = finder.find_spec(fullname, path, target)
+			if spec is not None:
+				break
+		else:
+			return None
+
+		# Builtin and frozen importers are classes shared by every module they load; leave those alone
+		loader = spec.loader
+		if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+			return spec
+
+		exec_module = loader.exec_module
+
+		def timed_exec_module(module):
+
+			stack = self._stack()
+			stack.append(0.0)
+			time_start = time.perf_counter()
+
+			try:
+				exec_module(module)
+			finally:
+				time_cumulative = time.perf_counter() - time_start
+				time_nested = stack.pop()
+
+				if stack:
+					stack[-1] += time_cumulative
+
+				# Startup's all that gets reported in full; after that, only the slowpokes get a mention
+				if not self._startup_reported:
+					self._timings.append((fullname, time_cumulative - time_nested, time_cumulative))
+				elif not stack and time_cumulative >= self.LAZY_IMPORT_LOG_THRESHOLD:
+					logging.getLogger(__name__).debug("Lazily imported %s in %.1f ms", fullname, time_cumulative * 1000)
+
+		loader.exec_module = timed_exec_module
+		return spec
+
+	def timings(self) -> list[tuple[str, float, float]]:
+		"""Module name, self time, and cumulative time (in seconds) for every module imported during startup"""
+		return list(self._timings)
+
+	def report(self, limit:int=15, prefix:str|None=None) -> str:
+		"""Format the slowest imports (by self time), optionally only for modules starting with `prefix`"""
+
+		timings = [t for t in self.timings() if prefix is None or t[0].startswith(prefix)]
+		total_time = sum(t[1] for t in timings)
+
+		lines = [f"{len(timings)} modules imported in {total_time * 1000:.1f} ms; slowest:", "   self [ms] | cumulative [ms] | module"]
+		for module_name, time_self, time_cumulative in sorted(timings, key=lambda t: t[1], reverse=True)[:limit]:
+			lines.append(f"{time_self * 1000:11.1f} | {time_cumulative * 1000:15.1f} | {module_name}")
+
+		return "\n".join(lines)
+
+	def logStartupReport(self, limit:int=15):
+		"""Log the import report for startup, and keep an eye on lazy imports from here on out"""
+
+		logging.getLogger(__name__).debug("Import time report:\n%s", self.report(limit))
+		self._startup_reported = True
+
+
+_import_timer:LBImportTimer|None = None
+
+def install() -> LBImportTimer:
+	"""Start timing imports (if not already)"""
+
+	global _import_timer
+
+	if _import_timer is None:
+		_import_timer = LBImportTimer()
+		sys.meta_path.insert(0, _import_timer)
+
+	return _import_timer
+
+def import_timer() -> LBImportTimer|None:
+	"""The installed import timer, if any"""
+	return _import_timer
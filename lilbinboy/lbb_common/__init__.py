@@ -1,11 +1,25 @@
 """Common classes and methods to help that Lil' Bin Boy do his Lil' Bin Thang"""
 
-from . import resources, wnd_about, wnd_main, dlg_errorlog, wnd_checkforupdates, windowmanager
+import importlib
+from . import wnd_main, windowmanager
 from .wdg_clipcolorpicker import LBClipColorPicker
 from .wdg_timelineview import LBTimelineView
 from .wdg_timecodespinbox import LBSpinBoxTC
 from .wdg_utilitytab import LBUtilityTab
-from .settings_manager import LBSettingsManager
+from .settings_manager import LBSettingsManager, LBBufferedSettings
 from .log_handler import *
+from .log_config import LBLoggingManager, LBJsonLinesFormatter
 
-from .helper_funcs import *
\ No newline at end of file
+from .helper_funcs import *
+
+_LAZY_SUBMODULES = ("resources", "wnd_about", "dlg_errorlog", "wnd_checkforupdates")
+"""Submodules that aren't needed for the first paint, imported on first use instead"""
+
+def __getattr__(name:str):
+	if name in _LAZY_SUBMODULES:
+		return importlib.import_module(f".{name}", __name__)
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def load_resources():
+	"""Register the compiled Qt resources (`:/...` paths), if they haven't been already"""
+	importlib.import_module(".resources", __name__)
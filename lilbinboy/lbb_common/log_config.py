@@ -0,0 +1,186 @@
+"""
+Lil' Log Config Boy: file and console logging, written out on a background thread
+"""
+
+import logging, queue, json, sys, copy
+from logging import handlers
+from datetime import datetime
+from PySide6 import QtCore
+from .settings_manager import LBBufferedSettings
+
+class LBJsonLinesFormatter(logging.Formatter):
+	"""One JSON object per log record, for anybody who'd rather grep with a parser"""
+
+	def format(self, record:logging.LogRecord) -> str:
+
+		log_entry = {
+			"timestamp": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+			"logger":    record.name,
+			"level":     record.levelname,
+			"module":    record.module,
+			"line":      record.lineno,
+			"thread":    record.threadName,
+			"process":   record.process,
+			"message":   record.getMessage(),
+		}
+
+		if record.exc_info and not record.exc_text:
+			record.exc_text = self.formatException(record.exc_info)
+		if record.exc_text:
+			log_entry["exception"] = record.exc_text
+
+		if record.stack_info:
+			log_entry["stack"] = self.formatStack(record.stack_info)
+
+		return json.dumps(log_entry, default=str)
+
+class LBQueueHandler(handlers.QueueHandler):
+	"""Queue handler that keeps tracebacks separate from the message, so formatters downstream can decide what to do with them"""
+
+	def prepare(self, record:logging.LogRecord) -> logging.LogRecord:
+
+		# Args get merged now, since they may not be safe to read from another thread later
+		record = copy.copy(record)
+		record.msg  = record.getMessage()
+		record.args = None
+
+		if record.exc_info:
+			record.exc_text = logging.Formatter().formatException(record.exc_info)
+			record.exc_info = None
+		
+		return record
+
+class LBLoggingManager:
+	"""
+	Sets up logging for the app: loggers hand records off to a queue, and a
+	listener thread does the formatting and writing to disk and console
+	"""
+
+	LOG_FORMATS:dict[str,str] = {
+		"tsv":   "Tab Separated Values",
+		"jsonl": "JSON Lines",
+	}
+	"""Available log file formats"""
+
+	DEFAULT_FORMAT:str = "tsv"
+	DEFAULT_LEVEL:str  = "DEBUG"
+
+	MAX_LOG_BYTES:int  = 1_000_000
+	BACKUP_COUNT:int   = 5
+
+	KEY_LEVEL:str         = "logging/level"
+	KEY_FORMAT:str        = "logging/format"
+	KEY_CONSOLE:str       = "logging/console_enabled"
+	GROUP_MODULE_LEVELS   = "logging_module_levels"
+	"""Settings group of `logger.name = LEVEL` pairs"""
+
+	def __init__(self, log_directory:str, settings:QtCore.QSettings|LBBufferedSettings):
+
+		self._log_directory = log_directory
+		self._settings = settings
+
+		self._queue:queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+		self._queue_handler = LBQueueHandler(self._queue)
+		self._listener:handlers.QueueListener|None = None
+
+	def logFormat(self) -> str:
+		"""Log file format from settings (`tsv` or `jsonl`)"""
+
+		log_format = str(self._settings.value(self.KEY_FORMAT, self.DEFAULT_FORMAT)).lower()
+		return log_format if log_format in self.LOG_FORMATS else self.DEFAULT_FORMAT
+
+	def logFilePath(self) -> str:
+		"""Path to the current log file"""
+
+		file_name = "lbb_log.jsonl" if self.logFormat() == "jsonl" else "lbb_log.log"
+		return QtCore.QDir(self._log_directory).filePath(file_name)
+
+	def moduleLevels(self) -> dict[str,int]:
+		"""Per-logger level overrides from settings"""
+
+		module_levels = {}
+
+		self._settings.beginGroup(self.GROUP_MODULE_LEVELS)
+		for logger_name in self._settings.childKeys():
+			level = logging.getLevelName(str(self._settings.value(logger_name)).upper())
+			if isinstance(level, int):
+				module_levels[logger_name] = level
+		self._settings.endGroup()
+
+		return module_levels
+
+	def setModuleLevel(self, logger_name:str, level:int|str):
+		"""Set and save the level for a specific logger"""
+
+		level_name = logging.getLevelName(level) if isinstance(level, int) else str(level).upper()
+		logging.getLogger(logger_name).setLevel(level_name)
+
+		self._settings.beginGroup(self.GROUP_MODULE_LEVELS)
+		self._settings.setValue(logger_name, level_name)
+		self._settings.endGroup()
+
+	def _fileHandler(self) -> logging.Handler:
+
+		QtCore.QDir().mkpath(self._log_directory)
+
+		file_handler = handlers.RotatingFileHandler(
+			filename    = self.logFilePath(),
+			maxBytes    = self.MAX_LOG_BYTES,
+			backupCount = self.BACKUP_COUNT,
+			encoding    = "utf-8",
+			delay       = True,
+		)
+
+		if self.logFormat() == "jsonl":
+			file_handler.setFormatter(LBJsonLinesFormatter())
+		else:
+			file_handler.setFormatter(logging.Formatter("\t".join([
+				"%(asctime)s",
+				"%(name)s",
+				"%(levelname)s",
+				"%(message)s"
+			])))
+
+		return file_handler
+
+	def start(self):
+		"""Route all logging through the queue and start writing in the background"""
+
+		if self._listener is not None:
+			return
+
+		output_handlers = [self._fileHandler()]
+
+		if bool(int(self._settings.value(self.KEY_CONSOLE, 1))):
+			console_handler = logging.StreamHandler(sys.stderr)
+			console_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+			output_handlers.append(console_handler)
+
+		root_level = logging.getLevelName(str(self._settings.value(self.KEY_LEVEL, self.DEFAULT_LEVEL)).upper())
+
+		root_logger = logging.getLogger()
+		root_logger.setLevel(root_level if isinstance(root_level, int) else self.DEFAULT_LEVEL)
+		root_logger.addHandler(self._queue_handler)
+
+		for logger_name, level in self.moduleLevels().items():
+			logging.getLogger(logger_name).setLevel(level)
+
+		self._listener = handlers.QueueListener(self._queue, *output_handlers, respect_handler_level=True)
+		self._listener.start()
+
+		logging.getLogger(__name__).debug("Logging to %s in %s format", self.logFilePath(), self.logFormat())
+
+	def stop(self):
+		"""Flush whatever's left in the queue and stop the listener thread"""
+
+		if self._listener is None:
+			return
+
+		logging.getLogger().removeHandler(self._queue_handler)
+
+		self._listener.stop()
+
+		for handler in self._listener.handlers:
+			handler.close()
+
+		self._listener = None
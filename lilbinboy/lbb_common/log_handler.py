@@ -1,7 +1,27 @@
-import logging
+import logging, collections
 from datetime import datetime
 from PySide6 import QtCore, QtWidgets, QtGui
 
+class LBLogEntry:
+	"""A log record, with display strings formatted only once somebody actually looks at it"""
+
+	__slots__ = ("record", "_timestamp", "_message")
+
+	def __init__(self, record:logging.LogRecord):
+		self.record = record
+		self._timestamp = None
+		self._message = None
+	
+	def timestamp(self) -> str:
+		if self._timestamp is None:
+			self._timestamp = str(datetime.fromtimestamp(self.record.created).strftime("%Y-%m-%d %H:%M:%S"))
+		return self._timestamp
+	
+	def message(self) -> str:
+		if self._message is None:
+			self._message = self.record.getMessage()
+		return self._message
+
 class LBLogDataModel(QtCore.QAbstractItemModel):
 	"""Qt Data model for Lil' Gui' Loggin Boy"""
 
@@ -16,37 +36,131 @@ class LBLogDataModel(QtCore.QAbstractItemModel):
 	DEFAULT_MAX_RECORDS:int = 128
 	"""Default number of maxmimum records unless explicitly set per instance"""
 
+	DRAIN_INTERVAL:int = 100
+	"""Time (in msec) to collect incoming records before adding them to the model as a batch"""
+
+	MAX_PENDING_RECORDS:int = 10_000
+	"""Incoming records held while waiting on the GUI thread; the oldest are dropped past this"""
+
 	sig_record_count_changed = QtCore.Signal(int)
 	"""Number of records has changed"""
 
 	sig_max_records_changed = QtCore.Signal(int)
 	"""Maxmimum number of allowed records has changed"""
 
+	sig_records_pending = QtCore.Signal()
+	"""New records are waiting in the queue (may be emitted from any thread)"""
+
 	def __init__(self, max_records:int=DEFAULT_MAX_RECORDS, *args, **kwargs):
 
 		super().__init__(*args, **kwargs)
-		
-		self._records:list[logging.LogRecord] = []
+
 		self._max_records = max(int(max_records), 0)
+		
+		# Ring buffer of entries; `_ring_head` is where the next (newest) entry goes
+		self._ring:list[LBLogEntry|None] = [None] * self._max_records
+		self._ring_head  = 0
+		self._ring_count = 0
+
+		# Incoming records from any thread.  deque append/popleft are atomic, so no locking needed here
+		self._pending:collections.deque[logging.LogRecord] = collections.deque(maxlen=self.MAX_PENDING_RECORDS)
+		self._drain_scheduled = False
+
+		self._timer_drain = QtCore.QTimer(self, singleShot=True, interval=self.DRAIN_INTERVAL)
+		self._timer_drain.timeout.connect(self.drainPendingRecords)
+
+		# Queued when emitted from a worker thread, so the timer gets started over here
+		self.sig_records_pending.connect(self._scheduleDrain)
 	
 	def addLogRecord(self, record:logging.LogRecord):
-		"""Add a log record"""
+		"""Add a log record.  Safe to call from any thread; it'll show up with the next batch."""
+
+		self._pending.append(record)
+
+		if not self._drain_scheduled:
+			self._drain_scheduled = True
+			self.sig_records_pending.emit()
+	
+	@QtCore.Slot()
+	def _scheduleDrain(self):
+
+		if not self._timer_drain.isActive():
+			self._timer_drain.start()
+	
+	@QtCore.Slot()
+	def drainPendingRecords(self) -> int:
+		"""Add all pending records to the model in one go.  Returns the number of records added."""
 
-		self.beginInsertRows(QtCore.QModelIndex(), 0, 0)
-		self._records.insert(0, record)
+		# Clear the flag first, so anything logged during the drain schedules another one
+		self._drain_scheduled = False
+
+		records:list[logging.LogRecord] = []
+		try:
+			while True:
+				records.append(self._pending.popleft())
+		except IndexError:
+			pass
+
+		# Pick up any resizing put off by `setMaxRecords(delay_cull=True)`
+		if len(self._ring) != self._max_records:
+			self.cullRecords()
+
+		if not records or not self._max_records:
+			return 0
+
+		# Anything past capacity would just be culled right away, so don't bother
+		records = records[-self._max_records:]
+		
+		# Make room at the bottom for the new batch
+		evict_count = max(self._ring_count + len(records) - self._max_records, 0)
+		if evict_count:
+			self.beginRemoveRows(QtCore.QModelIndex(), self._ring_count - evict_count, self._ring_count - 1)
+			self._ring_count -= evict_count
+			self.endRemoveRows()
+
+		# Newest records go in up top
+		self.beginInsertRows(QtCore.QModelIndex(), 0, len(records) - 1)
+		for record in records:
+			self._ring[self._ring_head] = LBLogEntry(record)
+			self._ring_head = (self._ring_head + 1) % self._max_records
+		self._ring_count += len(records)
 		self.endInsertRows()
 
-		self.cullRecords()
+		self.sig_record_count_changed.emit(self._ring_count)
+
+		return len(records)
+	
+	def _entry(self, row:int) -> LBLogEntry:
+		"""Entry for a given row (row 0 being the newest)"""
+
+		if not 0 <= row < self._ring_count:
+			raise IndexError(f"Row {row} out of range")
+
+		return self._ring[(self._ring_head - 1 - row) % len(self._ring)]
+	
+	def _entries(self) -> list[LBLogEntry]:
+		"""All entries, newest first"""
+
+		return [self._entry(row) for row in range(self._ring_count)]
 	
 	def cullRecords(self) -> int:
 		"""Keep record count below max length"""
 
-		extra_records = max(len(self._records) - self._max_records, 0)
+		extra_records = max(self._ring_count - self._max_records, 0)
+		entries = self._entries()
 
 		if extra_records:
 			self.beginRemoveRows(QtCore.QModelIndex(), self._max_records, self._max_records + extra_records - 1)
-			self._records = self._records[:self._max_records]
+			entries = entries[:self._max_records]
+			self._ring_count = len(entries)
 			self.endRemoveRows()
+		
+		# Rebuild the ring at the current capacity, oldest first
+		self._ring = list(reversed(entries)) + [None] * (self._max_records - len(entries))
+		self._ring_head = len(entries) % self._max_records if self._max_records else 0
+
+		if extra_records:
+			self.sig_record_count_changed.emit(self._ring_count)
 
 		# Return how many records have been yeeted gracefully	
 		return extra_records
@@ -57,9 +171,13 @@ class LBLogDataModel(QtCore.QAbstractItemModel):
 		if max_records < 0:
 			raise ValueError("Max records cannot be negative")
 
+		# Get any in-flight records in under the old limit so they're culled consistently
+		self.drainPendingRecords()
+
 		self._max_records = int(max_records)
 		
 		# Trim off them extras real good. No room for you fellas!
+		# (Otherwise it happens with the next batch of records)
 		if not delay_cull:
 			self.cullRecords()
 		
@@ -82,7 +200,7 @@ class LBLogDataModel(QtCore.QAbstractItemModel):
 		if parent.isValid():
 			return 0
 			
-		return len(self._records)
+		return self._ring_count
 		
 	def columnCount(self, /, parent:QtCore.QModelIndex=None) -> int:
 		"""Return the number of column headers"""
@@ -92,16 +210,17 @@ class LBLogDataModel(QtCore.QAbstractItemModel):
 	def data(self, index:QtCore.QModelIndex, /, role:QtCore.Qt.ItemDataRole):
 		"""Return the requested data for an index"""
 
-		record = self._records[index.row()]
+		entry = self._entry(index.row())
+		record = entry.record
 		header = self.HEADERS[index.column()]
 
 		if role == QtCore.Qt.ItemDataRole.DisplayRole:
 			if header == "Module":
 				return record.module
 			elif header == "Timestamp":
-				return str(datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S"))
+				return entry.timestamp()
 			elif header == "Message":
-				return record.getMessage()
+				return entry.message()
 			elif header == "Level":
 				return record.levelname.title()
 			else:
@@ -135,14 +254,14 @@ class LBLogDataModel(QtCore.QAbstractItemModel):
 		"""Get a record"""
 		# TODO: Needs work
 
-		record = self._records[log_index]
+		entry = self._entry(log_index)
 
 		if log_attribute == 0:
-			return record.module
+			return entry.record.module
 		elif log_attribute == 1:
-			return str(datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S"))
+			return entry.timestamp()
 		elif log_attribute == 2:
-			return record.getMessage()
+			return entry.message()
 	
 	def index(self, row:int, column:int, /, parent:QtCore.QModelIndex=QtCore.QModelIndex()):
 		return self.createIndex(row, column)
@@ -163,5 +282,8 @@ class LBLogHandler(logging.Handler):
 		return self._data_model
 	
 	def emit(self, record:logging.LogRecord):
-		"""Do a log real nice"""
-		self.data_model().addLogRecord(record)
\ No newline at end of file
+		"""Do a log real nice (from any thread; the model batches them up for the GUI thread)"""
+		try:
+			self.data_model().addLogRecord(record)
+		except Exception:
+			self.handleError(record)
\ No newline at end of file
@@ -58,4 +58,58 @@ def LBClipColorPainter(rect:QtCore.QRect, painter:QtGui.QPainter, outline_color:
 		# DEBUG
 		#painter.drawText(color_box, str(rect.height()), QtCore.Qt.AlignmentFlag.AlignCenter|QtCore.Qt.AlignmentFlag.AlignVCenter)
 
-		painter.restore()
\ No newline at end of file
+		painter.restore()
+
+def LBClipColorPixmap(size:QtCore.QSize, device_pixel_ratio:float=1.0, outline_color:QtGui.QColor=None, clip_color:QtGui.QColor=None, pen_width:int=1, padding:QtCore.QSize=None, shadow_offset:QtCore.QPoint=None) -> QtGui.QPixmap:
+	"""Clip Color graphic as a pixmap, rendered once and shared via `QPixmapCache`"""
+
+	outline_color = outline_color or QtGui.QColor("Black")
+	clip_color = clip_color or QtGui.QColor()
+	padding = padding or QtCore.QSize(3,3)
+	shadow_offset = shadow_offset or QtCore.QPoint(1,1)
+
+	cache_key = "lbb_clipcolor:{clip}:{outline}:{w}x{h}@{dpr}:{pen}:{pad_w},{pad_h}:{shadow_x},{shadow_y}".format(
+		clip     = clip_color.rgba() if clip_color.isValid() else "none",
+		outline  = outline_color.rgba(),
+		w        = size.width(),
+		h        = size.height(),
+		dpr      = round(device_pixel_ratio, 2),
+		pen      = pen_width,
+		pad_w    = padding.width(),
+		pad_h    = padding.height(),
+		shadow_x = shadow_offset.x(),
+		shadow_y = shadow_offset.y(),
+	)
+
+	pixmap = QtGui.QPixmapCache.find(cache_key)
+	if pixmap is not None:
+		return pixmap
+	
+	pixmap = QtGui.QPixmap(size * device_pixel_ratio)
+	pixmap.setDevicePixelRatio(device_pixel_ratio)
+	pixmap.fill(QtCore.Qt.GlobalColor.transparent)
+
+	painter = QtGui.QPainter(pixmap)
+	LBClipColorPainter(QtCore.QRect(QtCore.QPoint(0,0), size), painter, outline_color=outline_color, clip_color=clip_color, pen_width=pen_width, padding=padding, shadow_offset=shadow_offset)
+	painter.end()
+
+	QtGui.QPixmapCache.insert(cache_key, pixmap)
+	return pixmap
+
+def LBCachedClipColorPainter(rect:QtCore.QRect|QtCore.QRectF, painter:QtGui.QPainter, outline_color:QtGui.QColor=None, clip_color:QtGui.QColor=None, pen_width:int=1, padding:QtCore.QSize=None, shadow_offset:QtCore.QPoint=None):
+	"""Same as `LBClipColorPainter`, but blits a cached pixmap instead of drawing it all over again"""
+
+	if not painter.isActive():
+		import logging
+		logging.getLogger(__name__).debug("No active painter")
+		return
+	
+	rect = QtCore.QRectF(rect)
+	if rect.isEmpty():
+		return
+
+	device = painter.device()
+	device_pixel_ratio = device.devicePixelRatioF() if device is not None else 1.0
+	
+	pixmap = LBClipColorPixmap(rect.size().toSize(), device_pixel_ratio, outline_color=outline_color, clip_color=clip_color, pen_width=pen_width, padding=padding, shadow_offset=shadow_offset)
+	painter.drawPixmap(rect.topLeft(), pixmap)
@@ -2,34 +2,295 @@
 Manage QSettings location & format
 """
 
-import logging
+import logging, typing
 from os import PathLike
 from PySide6 import QtCore
 
+_REMOVED = object()
+"""Stand-in for a key that's been removed but not yet flushed"""
+
+_NOT_BUFFERED = object()
+"""Stand-in for a key with no unflushed changes"""
+
+class LBSettingsFlushJob(QtCore.QRunnable):
+	"""Write a batch of settings changes to disk, away from the GUI thread"""
+
+	class LBSettingsFlushSignals(QtCore.QObject):
+		sig_flushed = QtCore.Signal(int)
+		"""The batch (by ID) has been written"""
+
+	def __init__(self, settings_factory:typing.Callable[[], QtCore.QSettings], changes:dict[str, typing.Any], batch_id:int=0):
+		super().__init__()
+		self._settings_factory = settings_factory
+		self._changes = changes
+		self._batch_id = batch_id
+		self._signals = self.LBSettingsFlushSignals()
+
+	def signals(self) -> LBSettingsFlushSignals:
+		return self._signals
+
+	@staticmethod
+	def writeChanges(settings:QtCore.QSettings, changes:dict[str, typing.Any]):
+		"""Apply a batch of changes to a `QSettings` and sync it"""
+
+		for key, value in changes.items():
+			if value is _REMOVED:
+				settings.remove(key)
+			else:
+				settings.setValue(key, value)
+
+		settings.sync()
+
+		if settings.status() != QtCore.QSettings.Status.NoError:
+			logging.getLogger(__name__).error("Error writing settings to %s: %s", settings.fileName(), settings.status().name)
+
+	def run(self):
+
+		# QSettings objects aren't to be shared across threads, so this one gets its own
+		self.writeChanges(self._settings_factory(), self._changes)
+		self.signals().sig_flushed.emit(self._batch_id)
+
+
+class LBBufferedSettings(QtCore.QObject):
+	"""
+	Stands in for `QSettings`, but holds on to changes in memory and writes them
+	out in batches on a background thread.  Call `sync()` to write everything now.
+	"""
+
+	DEFAULT_FLUSH_INTERVAL:int = 1000
+	"""Milliseconds to wait after the last change before writing to disk"""
+
+	def __init__(self, settings_factory:typing.Callable[[], QtCore.QSettings], flush_interval:int=DEFAULT_FLUSH_INTERVAL, parent:QtCore.QObject|None=None):
+
+		super().__init__(parent)
+
+		self._settings_factory = settings_factory
+		self._settings = settings_factory()
+		"""Settings on this thread, for reads"""
+
+		self._pending:dict[str, typing.Any] = {}
+		self._in_flight:dict[int, dict[str, typing.Any]] = {}
+		"""Batches being written, by batch ID, oldest first"""
+		self._next_batch_id = 0
+		self._groups:list[str] = []
+
+		self._pool = QtCore.QThreadPool(self)
+		self._pool.setMaxThreadCount(1)	# One writer, so batches land in order
+
+		self._timer_flush = QtCore.QTimer(self, singleShot=True, interval=flush_interval)
+		self._timer_flush.timeout.connect(self.flush)
+
+	def _key(self, key:str) -> str:
+		"""Full key path, including any current groups"""
+		return "/".join(self._groups + [str(key)])
+
+	def _bufferedValue(self, full_key:str) -> typing.Any:
+		"""Latest value for a key that hasn't hit the disk yet, or `_NOT_BUFFERED` if there isn't one"""
+
+		if full_key in self._pending:
+			return self._pending[full_key]
+
+		for changes in reversed(self._in_flight.values()):
+			if full_key in changes:
+				return changes[full_key]
+
+		return _NOT_BUFFERED
+
+	def fileName(self) -> str:
+		return self._settings.fileName()
+
+	def flushInterval(self) -> int:
+		return self._timer_flush.interval()
+
+	def setFlushInterval(self, flush_interval:int):
+		self._timer_flush.setInterval(flush_interval)
+
+	def hasPendingChanges(self) -> bool:
+		return bool(self._pending or self._in_flight)
+
+	def beginGroup(self, prefix:str):
+		self._groups.append(str(prefix).strip("/"))
+
+	def endGroup(self):
+		if self._groups:
+			self._groups.pop()
+
+	def group(self) -> str:
+		return "/".join(self._groups)
+
+	def value(self, key:str, defaultValue:typing.Any=None, type:typing.Any=None) -> typing.Any:
+		"""Get a value, as `QSettings.value()` would"""
+
+		full_key = self._key(key)
+		buffered_value = self._bufferedValue(full_key)
+
+		if buffered_value is _REMOVED:
+			return defaultValue
+
+		elif buffered_value is not _NOT_BUFFERED:
+			return self._coerced(buffered_value, type)
+
+		if type is not None:
+			return self._settings.value(full_key, defaultValue, type=type)
+		else:
+			return self._settings.value(full_key, defaultValue)
+
+	@staticmethod
+	def _coerced(value:typing.Any, type:typing.Any) -> typing.Any:
+		"""A buffered value as the `type` asked for, the way `QSettings` would hand it back from disk"""
+
+		if type is None or value is None or isinstance(value, type):
+			return value
+
+		if type is list:
+			return list(value) if isinstance(value, (tuple, set)) else [value]
+
+		if type is bool and isinstance(value, str):
+			return value.strip().lower() in ("true", "1")
+
+		try:
+			return type(value)
+		except (TypeError, ValueError):
+			logging.getLogger(__name__).debug("Couldn't make %r a %s", value, type)
+			return value
+
+	def contains(self, key:str) -> bool:
+
+		buffered_value = self._bufferedValue(self._key(key))
+
+		if buffered_value is not _NOT_BUFFERED:
+			return buffered_value is not _REMOVED
+
+		return self._settings.contains(self._key(key))
+
+	def childKeys(self) -> list[str]:
+		"""Keys directly under the current group, saved or not"""
+
+		self._settings.beginGroup(self.group())
+		child_keys = dict.fromkeys(self._settings.childKeys())
+		self._settings.endGroup()
+
+		prefix = self.group() + "/" if self._groups else ""
+
+		for changes in list(self._in_flight.values()) + [self._pending]:
+			for full_key, value in changes.items():
+				if not full_key.startswith(prefix) or "/" in full_key[len(prefix):]:
+					continue
+
+				child_key = full_key[len(prefix):]
+				if value is _REMOVED:
+					child_keys.pop(child_key, None)
+				else:
+					child_keys[child_key] = None
+
+		return list(child_keys)
+
+	def setValue(self, key:str, value:typing.Any):
+		"""Set a value, to be written out a bit later"""
+
+		self._pending[self._key(key)] = value
+		self._timer_flush.start()
+
+	def remove(self, key:str):
+		"""Remove a key, to be written out a bit later"""
+
+		# NOTE: Like `QSettings.remove()`, sub-keys go too
+		full_key = self._key(key)
+
+		for pending_key in list(self._pending):
+			if pending_key.startswith(full_key + "/"):
+				del self._pending[pending_key]
+
+		self._pending[full_key] = _REMOVED
+		self._timer_flush.start()
+
+	@QtCore.Slot()
+	def flush(self):
+		"""Write pending changes on the background thread"""
+
+		self._timer_flush.stop()
+
+		if not self._pending:
+			return
+
+		changes = self._pending
+		self._pending = {}
+
+		batch_id = self._next_batch_id
+		self._next_batch_id += 1
+		self._in_flight[batch_id] = changes
+
+		flush_job = LBSettingsFlushJob(self._settings_factory, changes, batch_id)
+		flush_job.signals().sig_flushed.connect(self._batchFlushed)
+		self._pool.start(flush_job)
+
+	@QtCore.Slot(int)
+	def _batchFlushed(self, batch_id:int):
+
+		# Batches already written out by `sync()` are long gone; that's fine
+		self._in_flight.pop(batch_id, None)
+
+	@QtCore.Slot()
+	def sync(self):
+		"""Write everything right now, and wait for it"""
+
+		self._timer_flush.stop()
+		self._pool.waitForDone()
+		self._in_flight.clear()
+
+		changes = self._pending
+		self._pending = {}
+
+		# Pick up whatever the background thread wrote, then add the rest
+		self._settings.sync()
+		LBSettingsFlushJob.writeChanges(self._settings, changes)
+
+
 class LBSettingsManager:
 
 	def __init__(self, format:QtCore.QSettings.Format=QtCore.QSettings.Format.IniFormat, basepath:str|PathLike|None=None):
 
 		self._format = format
 		self._basepath   = basepath or QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.StandardLocation.AppDataLocation)
-	
+
+		self._buffered_settings:dict[str, LBBufferedSettings] = {}
+
 	def basePath(self) -> QtCore.QUrl:
 		"""The current path"""
 		return QtCore.QUrl.fromLocalFile(self._basepath)
-	
+
 	def format(self) -> QtCore.QSettings.Format:
 		"""The file format used for settings"""
 		return self._format
-	
+
 	def settings(self, feature_name:str) -> QtCore.QSettings:
 		"""Get a settings handler for a given feature"""
 
-		if self.format() == QtCore.QSettings.Format.IniFormat:			
-			settings= QtCore.QSettings(self.settingsPath(feature_name).toLocalFile(), QtCore.QSettings.Format.IniFormat)
-			logging.getLogger(__name__).debug("Handing off settings for %s at %s", feature_name, settings.fileName())
-			return settings
+		settings = self._createSettings(feature_name)
+		logging.getLogger(__name__).debug("Handing off settings for %s at %s", feature_name, settings.fileName())
+		return settings
+
+	def _createSettings(self, feature_name:str) -> QtCore.QSettings:
+
+		if self.format() == QtCore.QSettings.Format.IniFormat:
+			return QtCore.QSettings(self.settingsPath(feature_name).toLocalFile(), QtCore.QSettings.Format.IniFormat)
 		else:
 			return QtCore.QSettings(self.format())
-	
+
+	def bufferedSettings(self, feature_name:str) -> LBBufferedSettings:
+		"""Get the shared, buffered settings handler for a given feature"""
+
+		if feature_name not in self._buffered_settings:
+			self._buffered_settings[feature_name] = LBBufferedSettings(lambda: self._createSettings(feature_name))
+			logging.getLogger(__name__).debug("Handing off buffered settings for %s at %s", feature_name, self._buffered_settings[feature_name].fileName())
+
+		return self._buffered_settings[feature_name]
+
+	def sync(self):
+		"""Write out any buffered changes for all features, and wait for them to finish"""
+
+		for buffered_settings in self._buffered_settings.values():
+			buffered_settings.sync()
+
 	def settingsPath(self, feature_name:str) -> QtCore.QUrl:
-		return QtCore.QUrl.fromLocalFile(self.basePath().toLocalFile() + "/" + feature_name + "_config.ini")
\ No newline at end of file
+		return QtCore.QUrl.fromLocalFile(self.basePath().toLocalFile() + "/" + feature_name + "_config.ini")
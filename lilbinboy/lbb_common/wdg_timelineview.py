@@ -1,7 +1,22 @@
-import math
+import math, dataclasses
 from PySide6 import QtWidgets, QtCore, QtGui
 from timecode import Timecode
 
+@dataclasses.dataclass(frozen=True)
+class LBTimelineViewItemLayout:
+	"""Pre-calculated geometry for drawing an item in the timeline"""
+
+	item_box_rect:QtCore.QRect
+	label_box_rect:QtCore.QRect
+	label_text:str|None
+	"""Elided label, or `None` if there's no room for it"""
+	tick_x:int
+	timecode_box_rect:QtCore.QRect
+	tick_text:str|None
+	"""Abbreviated timecode, or `None` if it would overlap its neighbor"""
+	color:QtGui.QColor
+	x_end:float
+
 class LBTimelineView(QtWidgets.QWidget):
 	"""A little timeline layout graphic thing"""
 
@@ -10,6 +25,13 @@ class LBTimelineView(QtWidgets.QWidget):
 		super().__init__(*args, **kwargs)
 
 		self._items = []
+		self._pallette = []
+		self._total = 0
+
+		# Cached stuff
+		self._layout_items:list[LBTimelineViewItemLayout]|None = None
+		self._pixmap_cache:QtGui.QPixmap|None = None
+		self._tick_text_cache:dict[int,str] = {}
 
 		# Calculation Stuff
 		self._total_adjust  = 0
@@ -27,6 +49,8 @@ class LBTimelineView(QtWidgets.QWidget):
 		self._text_options = QtGui.QTextOption()
 		self._text_options.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter)
 		self._text_options.setWrapMode(QtGui.QTextOption.WrapMode.NoWrap)
+		self._min_label_width = QtGui.QFontMetrics(self._font).horizontalAdvance("W…")
+		"""Labels narrower than this aren't worth drawing"""
 
 		self.setSizePolicy(
 			QtWidgets.QSizePolicy.Policy.MinimumExpanding,
@@ -43,8 +67,11 @@ class LBTimelineView(QtWidgets.QWidget):
 		self._bottom_margin = margin
 
 	def setTotalAdjust(self, adjust:int):
+		if adjust == self._total_adjust:
+			return
+		
 		self._total_adjust = adjust
-		self.update()
+		self.invalidateLayout()
 
 	def totalAdjust(self) -> int:
 		"""Get the adjustment to the total"""
@@ -63,27 +90,146 @@ class LBTimelineView(QtWidgets.QWidget):
 	# Debug
 	def setItems(self, items:list[tuple[str,int]]):
 		"""Set the items to be displayed in a timeline"""
+
+		items = list(items)
+
+		# Models like to chatter; skip all the work if nothing actually changed
+		if items == self._items:
+			return
 		
-		self._items = items
+		# Build the color pallette based on item count (only changes when the count does)
+		if len(items) != len(self._pallette):
+			self._pallette = [QtGui.QColor.fromHsvF(x/len(items), .4, .4) for x in range(len(items))]
 		
-		# Build the color pallette based on item count
-		self._pallette = [QtGui.QColor.fromHsvF(x/len(items), .4, .4) for x in range(len(items))]
+		self._items = items
 		
 		# Set the total
 		self._total = sum([dur for sequence_name, dur in items])
 		
+		self.invalidateLayout()
+	
+	def invalidateLayout(self):
+		"""Items or geometry changed: lay everything out again on the next paint"""
+
+		self._layout_items = None
+		self._pixmap_cache = None
 		self.update()
+	
+	def _itemBoxHeight(self) -> int:
+		return self._font_height + self._box_inner_padding*2 + self._box_line_width*2
+	
+	def _tickText(self, frame_number:int) -> str:
+		"""Abbreviated timecode for a tick"""
+
+		if frame_number not in self._tick_text_cache:
+			if len(self._tick_text_cache) > 4096:
+				self._tick_text_cache.clear()
+			self._tick_text_cache[frame_number] = str(Timecode(int(frame_number))).lstrip("0:") or "0:00"
+		
+		return self._tick_text_cache[frame_number]
+
+	def _itemLayout(self) -> list[LBTimelineViewItemLayout]:
+		"""Box, label and tick geometry for each item, calculated once per item or size change"""
+
+		if self._layout_items is not None:
+			return self._layout_items
+		
+		self._layout_items = []
+
+		# TODO: Avoiding DivideByZero below -- probably should do things differently
+		if not len(self._items) or not self.adjustedTotal():
+			return self._layout_items
+		
+		font_metrics = QtGui.QFontMetrics(self._font)
+		item_box_height = self._itemBoxHeight()
+		width = self.width()
+
+		x_pos = 0
+		cumulative = 0
+		tick_text_right = None
+
+		for idx, (sequence_name, sequence_duration) in enumerate(self._items):
+			
+			# Item box
+			item_box_width = math.ceil((sequence_duration / self.adjustedTotal()) * width)
+			item_box_rect = QtCore.QRect(int(x_pos), 0, item_box_width, item_box_height).adjusted(self._box_line_width//2, self._box_line_width//2, -self._box_line_width//2, -self._box_line_width//2)
+
+			# Box label, elided to fit or dropped entirely if there's no room for anything legible
+			label_box_rect = item_box_rect.adjusted(self._box_inner_padding + self._tick_line_width, self._box_inner_padding, -self._box_inner_padding-self._box_line_width, -self._box_inner_padding)
+			
+			if label_box_rect.width() < self._min_label_width:
+				label_text = None
+			else:
+				label_text = font_metrics.elidedText(sequence_name, QtCore.Qt.TextElideMode.ElideRight, label_box_rect.width())
+
+			# Tick
+			tick_x = max(int(x_pos), self._tick_line_width//2)
+
+			# Timecode box rect is based on the label box, but moved down below the rect + stroke + padding
+			# Ticks get their timecode only if it won't run into the previous one
+			timecode_box_rect = QtCore.QRect(label_box_rect)
+			timecode_box_rect.moveTop(item_box_rect.height() + self._box_inner_padding + self._box_line_width//2)
+			
+			tick_text = self._tickText(cumulative)
+			tick_text_width = font_metrics.horizontalAdvance(tick_text)
+			
+			if tick_text_right is not None and timecode_box_rect.left() <= tick_text_right + self._box_inner_padding:
+				tick_text = None
+			else:
+				tick_text_right = timecode_box_rect.left() + tick_text_width
+
+			self._layout_items.append(LBTimelineViewItemLayout(
+				item_box_rect     = item_box_rect,
+				label_box_rect    = label_box_rect,
+				label_text        = label_text,
+				tick_x            = tick_x,
+				timecode_box_rect = timecode_box_rect,
+				tick_text         = tick_text,
+				color             = self._pallette[idx],
+				x_end             = x_pos + (sequence_duration/self.adjustedTotal())*width,
+			))
+			
+			x_pos += (sequence_duration/self.adjustedTotal())*width
+			cumulative += sequence_duration
+		
+		return self._layout_items
+	
+	def resizeEvent(self, event:QtGui.QResizeEvent):
+		super().resizeEvent(event)
+		self.invalidateLayout()
+	
+	def changeEvent(self, event:QtCore.QEvent):
+		super().changeEvent(event)
+
+		if event.type() in (QtCore.QEvent.Type.PaletteChange, QtCore.QEvent.Type.StyleChange, QtCore.QEvent.Type.FontChange):
+			self.invalidateLayout()
 
 	def paintEvent(self, e:QtGui.QPaintEvent):
 
 		super().paintEvent(e)
 
+		# Everything here only changes with the items or the size, so draw it once and blit it after that
+		device_pixel_ratio = self.devicePixelRatioF()
+
+		if self._pixmap_cache is None or self._pixmap_cache.devicePixelRatio() != device_pixel_ratio:
+			self._pixmap_cache = QtGui.QPixmap(self.size() * device_pixel_ratio)
+			self._pixmap_cache.setDevicePixelRatio(device_pixel_ratio)
+			self._pixmap_cache.fill(QtCore.Qt.GlobalColor.transparent)
+			
+			cache_painter = QtGui.QPainter(self._pixmap_cache)
+			self._drawTimeline(cache_painter, QtCore.QRect(QtCore.QPoint(0,0), self.size()))
+			cache_painter.end()
 
 		painter = QtGui.QPainter(self)
+		painter.drawPixmap(0, 0, self._pixmap_cache)
+		painter.end()
+	
+	def _drawTimeline(self, painter:QtGui.QPainter, rect:QtCore.QRect):
+		"""Draw the full timeline graphic"""
+
 		#painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
 
-		rect = QtCore.QRect(0, 0, painter.device().width(), painter.device().height())
-		item_box_height = self._font_height + self._box_inner_padding*2 + self._box_line_width*2
+		item_box_height = self._itemBoxHeight()
 
 		background_box = QtCore.QRect(0, 0, rect.width(), item_box_height)
 		background_box_rect = background_box.adjusted(self._box_line_width//2, self._box_line_width//2, -self._box_line_width//2, -self._box_line_width//2)
@@ -98,105 +244,60 @@ class LBTimelineView(QtWidgets.QWidget):
 		painter.setBrush(brush)
 		painter.drawRect(background_box_rect)
 
+		layout_items = self._itemLayout()
 
-		if not len(self._items):
+		if not layout_items:
 			return
-		
-
-		x_pos = 0
-		cumulative = 0
 
 		painter.setFont(self._font)
+		text_color = self.palette().color(QtGui.QPalette.ColorRole.Text)
 
-		# TODO: Avoiding DivideByZero below -- probably should do things differently
-		if not self.adjustedTotal():
-			return
-
-		for idx, thing in enumerate(self._items):
-
-			sequence_name, sequence_duration = thing
+		for layout_item in layout_items:
 
 			# Draw Box
-			
-			# Item box
-			item_box_width = math.ceil((sequence_duration / self.adjustedTotal()) * rect.width())
-			item_box_rect = QtCore.QRect(x_pos, 0, item_box_width, item_box_height).adjusted(self._box_line_width//2, self._box_line_width//2, -self._box_line_width//2, -self._box_line_width//2)
-			
 			brush = painter.brush()
-			brush.setColor(self._pallette[idx])
+			brush.setColor(layout_item.color)
 			brush.setStyle(QtGui.Qt.BrushStyle.SolidPattern)
 			painter.setBrush(brush)
 			
 			pen = painter.pen()
-			pen.setColor(painter.brush().color().lighter(200))
+			pen.setColor(layout_item.color.lighter(200))
 			pen.setWidth(self._box_line_width)
 			pen.setJoinStyle(QtCore.Qt.PenJoinStyle.MiterJoin)
 			painter.setPen(pen)
 			
-			painter.drawRect(item_box_rect)
-
+			painter.drawRect(layout_item.item_box_rect)
 
 			# Draw Box Label
-
-			label_box_rect = item_box_rect.adjusted(self._box_inner_padding + self._tick_line_width, self._box_inner_padding, -self._box_inner_padding-self._box_line_width, -self._box_inner_padding)
-
-			pen = painter.pen()
-			pen.setColor(painter.brush().color().lighter(300))
-			painter.setPen(pen)
-			painter.drawText(label_box_rect, sequence_name, self._text_options)
-
+			if layout_item.label_text:
+				pen = painter.pen()
+				pen.setColor(layout_item.color.lighter(300))
+				painter.setPen(pen)
+				painter.drawText(layout_item.label_box_rect, layout_item.label_text, self._text_options)
 
 			# Draw tick
-			#painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, False)
 			pen = painter.pen()
 			pen.setWidth(self._tick_line_width)
-			pen.setColor(self._pallette[idx].lighter(200))
+			pen.setColor(layout_item.color.lighter(200))
 			painter.setPen(pen)
 
-			tick_start_pos = QtCore.QPoint(max(x_pos, int(pen.width()//2)), 0)
-			tick_end_pos   = QtCore.QPoint(tick_start_pos.x(), painter.device().height())
-
-			painter.drawLine(tick_start_pos, tick_end_pos)
+			painter.drawLine(QtCore.QPoint(layout_item.tick_x, 0), QtCore.QPoint(layout_item.tick_x, rect.height()))
 
 			# Draw Timecode
-			tick_text = str(Timecode(int(cumulative))).lstrip("0:") or "0:00"
-			
-			pen = painter.pen()	
-			pen.setColor(QtGui.QPalette().color(QtGui.QPalette.ColorRole.Text))
-			painter.setPen(pen)
-			
-			# Timecode box rect is based on the label box, but moved down below the rect + stroke + padding
-			timecode_box_rect = QtCore.QRect(label_box_rect)
-			timecode_box_rect.moveTop(item_box_rect.height() + self._box_inner_padding + self._box_line_width//2)
-			painter.drawText(timecode_box_rect, tick_text, self._text_options)
-			
-			x_pos += (sequence_duration/self.adjustedTotal())*(rect.width())
-			cumulative += sequence_duration
+			if layout_item.tick_text:
+				pen = painter.pen()	
+				pen.setColor(text_color)
+				painter.setPen(pen)
+				painter.drawText(layout_item.timecode_box_rect, layout_item.tick_text, self._text_options)
 
 		# Draw final tick
-		#painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, False)
 		pen = painter.pen()
 		pen.setWidth(self._tick_line_width)
-		pen.setColor(self._pallette[-1].lighter(200))
+		pen.setColor(layout_items[-1].color.lighter(200))
 		painter.setPen(pen)
 
-		tick_start_pos = QtCore.QPoint(item_box_rect.right() + self._tick_line_width//2, 0)
-		tick_end_pos   = QtCore.QPoint(tick_start_pos.x(), rect.height())
-
-		painter.drawLine(tick_start_pos, tick_end_pos)
-
-		# Draw Final Timecode
-		pen = painter.pen()	
-		pen.setColor(QtGui.QPalette().color(QtGui.QPalette.ColorRole.Text))
-		painter.setPen(pen)
-		tick_text = str(Timecode(int(cumulative))).lstrip("0:") or "0:00"
-
-		#text_location.setX(tick_start_pos.x() - font_box.width() - 5 - painter.pen().width())
-		
-		#painter.drawText(text_location, tick_text)
-
-
-		painter.end()
+		tick_x = layout_items[-1].item_box_rect.right() + self._tick_line_width//2
+		painter.drawLine(QtCore.QPoint(tick_x, 0), QtCore.QPoint(tick_x, rect.height()))
 	
 	def event(self, event:QtCore.QEvent):
 
@@ -208,11 +309,9 @@ class LBTimelineView(QtWidgets.QWidget):
 
 	def toolTip(self, position:QtCore.QPoint) -> str:
 		
-		item_pos = 0
-		for idx,item in enumerate(self._items):
-
-			sequence_name, sequence_duration = item
+		for (sequence_name, sequence_duration), layout_item in zip(self._items, self._itemLayout()):
 			
-			item_pos += (sequence_duration/self.adjustedTotal()) * self.width()
-			if position.x() < item_pos:
-				return f"{sequence_name} ({Timecode(sequence_duration)})"
\ No newline at end of file
+			if position.x() < layout_item.x_end:
+				return f"{sequence_name} ({Timecode(sequence_duration)})"
+		
+		return ""
@@ -1,4 +1,8 @@
 from PySide6 import QtWidgets
 
 class LBUtilityTab(QtWidgets.QWidget):
-	"""Lil' Utility Container Boy"""
\ No newline at end of file
+	"""Lil' Utility Container Boy"""
+
+	def resourcesLoaded(self):
+		"""The compiled resources (`:/...` paths) showed up after this tab was built; swap in anything that needed them"""
+		pass
@@ -1,8 +1,9 @@
 from PySide6 import QtCore, QtGui, QtWidgets
+from .settings_manager import LBBufferedSettings
 
 class WindowManager(QtCore.QObject):
 
-	def __init__(self, window:QtWidgets.QWidget, settings:QtCore.QSettings, settings_name:str, relative_to:QtWidgets.QWidget|None=None):
+	def __init__(self, window:QtWidgets.QWidget, settings:QtCore.QSettings|LBBufferedSettings, settings_name:str, relative_to:QtWidgets.QWidget|None=None):
 
 		super().__init__()
 		
@@ -11,17 +12,12 @@ class WindowManager(QtCore.QObject):
 		self._settings_name = settings_name
 		self._wndow_relative_to = relative_to
 
-		self._timer_window_geometry = QtCore.QTimer(singleShot=True, interval=200)
-
 		self._setupSignals()
 
 		self._window.installEventFilter(self)
 
 	def _setupSignals(self):
 
-		# Timer to save window geometry changes (fired via self.eventFilter)
-		self._timer_window_geometry.timeout.connect(self.saveWindowGeometry)
-
 		# Screens added or removed
 		QtWidgets.QApplication.instance().screenAdded.connect(self.screenWasAdded)
 		QtWidgets.QApplication.instance().screenAdded.connect(self.screenLayoutChanged)
@@ -74,8 +70,9 @@ class WindowManager(QtCore.QObject):
 		"""Watch window events"""
 
 		if watched == self._window:
+			# NOTE: Buffered settings do the debouncing
 			if event.type() == QtCore.QEvent.Type.Resize or event.type() == QtCore.QEvent.Type.Move:
-				self._timer_window_geometry.start()
+				self.saveWindowGeometry()
 
 
 		return super().eventFilter(watched, event)
\ No newline at end of file
@@ -1,4 +1,5 @@
 from PySide6 import QtCore, QtGui, QtWidgets
+from . import resources
 
 class LBAboutWindow(QtWidgets.QDialog):
 
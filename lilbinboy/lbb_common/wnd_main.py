@@ -1,5 +1,4 @@
 from PySide6 import QtCore, QtWidgets
-from .dlg_errorlog import LBErrorLogWindow
 
 class LBMainWindow(QtWidgets.QMainWindow):
 	"""Lil' Main Window Boy"""
@@ -39,6 +38,7 @@ class LBMainWindow(QtWidgets.QMainWindow):
 	
 	@QtCore.Slot()
 	def errorLogRequested(self):
+		from .dlg_errorlog import LBErrorLogWindow
 		wnd_errors = LBErrorLogWindow(self)
 		
 		wnd_errors.show()
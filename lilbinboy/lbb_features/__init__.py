@@ -1,17 +1,27 @@
-import dataclasses
-from lilbinboy.lbb_features.trt import panel_trt
-from lilbinboy.lbb_common import LBUtilityTab
+import dataclasses, importlib, typing
+
+if typing.TYPE_CHECKING:
+	from lilbinboy.lbb_common import LBUtilityTab
 
 @dataclasses.dataclass
 class LBFeature:
+	"""A feature tab, whose module isn't imported until the tab is actually built"""
+
 	title:str
 	id:str
-	factory:LBUtilityTab
+	module_name:str
+	class_name:str
+
+	@property
+	def factory(self) -> type["LBUtilityTab"]:
+		"""The feature's `LBUtilityTab` class (imports the feature module on first use)"""
+		return getattr(importlib.import_module(self.module_name), self.class_name)
 
 features = [
 	LBFeature(
 		title="Runtime Metrics",
 		id="trt",
-		factory=panel_trt.LBTRTCalculator
+		module_name="lilbinboy.lbb_features.trt.panel_trt",
+		class_name="LBTRTCalculator"
 	)
-]
\ No newline at end of file
+]
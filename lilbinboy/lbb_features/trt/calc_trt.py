@@ -0,0 +1,364 @@
+"""
+The TRT math: trims, marker matching, sequence selection and totals.
+No Qt in here, so it can run headless (command line, render farm, etc).
+"""
+
+import dataclasses, enum, typing
+import avbutils
+from timecode import Timecode, TimecodeRange
+from ...lbb_features.trt import logic_trt
+
+LFOA_PERFS_PER_FOOT:int = 16
+"""35mm 4-perf"""
+
+class SequenceSelectionMode(enum.Enum):
+	"""Modes for choosing sequences from a bin"""
+
+	ONE_SEQUENCE_PER_BIN  = "Single"
+	"""Select only one sequence from a given bin"""
+
+	ALL_SEQUENCES_PER_BIN = "All"
+	"""Select all sequences from a given bin"""
+
+@dataclasses.dataclass()
+class LBMarkerPreset:
+	"""Marker criteria presets"""
+
+	color: str | None
+	comment: str | None
+	author:  str | None
+
+@dataclasses.dataclass(frozen=True)
+class SequenceField:
+	"""A per-sequence field, as shown in the list and exported"""
+
+	name:str
+	"""Human-readable name (column header)"""
+
+	field:str
+	"""Field key"""
+
+	is_accumulating_value:bool = False
+	"""Can be summed for totals"""
+
+SEQUENCE_FIELDS:list[SequenceField] = [
+	SequenceField("Sequence Color","sequence_color"),
+	SequenceField("Sequence Name","sequence_name"),
+	SequenceField("Full Duration (TC)","duration_total_tc", is_accumulating_value=True),
+	SequenceField("Full Duration (F+F)","duration_total_ff", is_accumulating_value=True),
+	SequenceField("Full Duration (Frames)","duration_total_frames", is_accumulating_value=True),
+	SequenceField("Trimmed Duration (TC)","duration_trimmed_tc", is_accumulating_value=True),
+	SequenceField("Trimmed Duration (F+F)","duration_trimmed_ff", is_accumulating_value=True),
+	SequenceField("Trimmed Duration (Frames)","duration_trimmed_frames", is_accumulating_value=True),
+	SequenceField("Trimmed From Head (TC)", "head_trimmed_tc", is_accumulating_value=True),
+	SequenceField("Trimmed From Head (F+F)", "head_trimmed_ff", is_accumulating_value=True),
+	SequenceField("Trimmed From Head (Frames)", "head_trimmed_frames", is_accumulating_value=True),
+	SequenceField("Trimmed From Tail (TC)", "tail_trimmed_tc", is_accumulating_value=True),
+	SequenceField("Trimmed From Tail (F+F)", "tail_trimmed_ff", is_accumulating_value=True),
+	SequenceField("Trimmed From Tail (Frames)", "tail_trimmed_frames", is_accumulating_value=True),
+	SequenceField("Sequence Start", "sequence_start_tc"),
+	SequenceField("FFOA (F+F)", "ffoa_ff"),
+	SequenceField("FFOA (TC)", "ffoa_tc"),
+	SequenceField("LFOA (F+F)", "lfoa_ff"),
+	SequenceField("LFOA (TC)", "lfoa_tc"),
+	SequenceField("Date Created","date_created"),
+	SequenceField("Date Modified","date_modified"),
+	SequenceField("From Bin","bin_path"),
+	SequenceField("Bin Lock","bin_lock"),
+]
+"""All per-sequence fields, in their default order"""
+
+SORT_COLUMNS = ["Name", "Start Timecode", "Creation Date", "Modified Date"]
+"""Ways to sort sequences when picking one per bin"""
+
+#
+# Formatting
+#
+
+def format_feet_frames(frames:int) -> str:
+	"""Frame count as 35mm feet+frames"""
+	return str(frames // LFOA_PERFS_PER_FOOT) + "+" + str(frames % LFOA_PERFS_PER_FOOT).zfill(len(str(LFOA_PERFS_PER_FOOT)))
+
+def format_duration(duration:Timecode) -> str:
+	"""Timecode as a duration, without the leading zeroes"""
+
+	tc_str = str(duration)
+	is_neg =tc_str.startswith("-")
+
+	# Get the index of the last separator
+	leading_chars = 1
+	sep = ":"
+	idx_last_sep = tc_str.rfind(sep) - leading_chars
+	pre, post = tc_str[:idx_last_sep], tc_str[idx_last_sep:]
+	pre = pre.lstrip("-00" + sep)
+
+	return f"{'-' if is_neg else ''}{pre}{post}"
+
+def parse_duration(duration:str|int|Timecode, rate:int) -> Timecode:
+	"""Timecode from a frame count or a timecode string (`"8:00"`, `"00:00:08:00"`), at a given rate"""
+
+	if isinstance(duration, Timecode):
+		return Timecode(duration.frame_number, rate=rate)
+
+	if isinstance(duration, str) and duration.strip().lstrip("-").isdigit():
+		duration = int(duration)
+
+	return Timecode(duration, rate=rate)
+
+#
+# Marker matching & selection
+#
+
+def find_marker_from_preset(marker_preset:LBMarkerPreset, marker_list:typing.Iterable[avbutils.MarkerInfo]) -> avbutils.MarkerInfo|None:
+	"""Match a marker to the given preset criteria"""
+
+	for marker_info in marker_list:
+
+		if marker_preset.color is not None and marker_info.color.value != marker_preset.color:
+			continue
+		if marker_preset.comment is not None and marker_preset.comment not in marker_info.comment:
+			continue
+		if marker_preset.author is not None and marker_preset.author not in marker_info.user:
+			continue
+		return marker_info
+
+	return None
+
+def select_single_timeline(timelines:list[logic_trt.TimelineInfo], sort_column:str="Name", sort_descending:bool=False, filters:typing.Iterable=()) -> logic_trt.TimelineInfo|None:
+	"""
+	Pick one timeline: sort them, then take the first one that passes all the filters.
+	Filters are anything with a `validate(timeline_info) -> bool` method.
+	"""
+
+	if sort_column == "Name":
+		timelines_sorted = sorted(timelines, reverse=sort_descending, key=lambda t: avbutils.human_sort(t.timeline_name))
+	elif sort_column == "Start Timecode":
+		timelines_sorted = sorted(timelines, reverse=sort_descending, key=lambda t: t.timeline_tc_range.start)
+	elif sort_column == "Creation Date":
+		timelines_sorted = sorted(timelines, reverse=sort_descending, key=lambda t: t.date_created)
+	elif sort_column == "Modified Date":
+		timelines_sorted = sorted(timelines, reverse=sort_descending, key=lambda t: t.date_modified)
+	else:
+		raise KeyError(f"No sort method defined for {sort_column}")
+
+	filters = list(filters)
+
+	for t in timelines_sorted:
+		if all(f.validate(t) for f in filters):
+			return t
+
+	return None
+
+class NameContainsFilter:
+	"""Sequence name contains..."""
+
+	def __init__(self, name:str):
+		self._name = str(name)
+
+	def name(self) -> str:
+		return self._name
+
+	def validate(self, timeline_info:logic_trt.TimelineInfo) -> bool:
+		return self._name.lower() in timeline_info.timeline_name.lower()
+
+#
+# Trims
+#
+
+class TrimmedTimeline:
+	"""A timeline with its FFOA/LFOA trims worked out"""
+
+	def __init__(self, timeline_info:logic_trt.TimelineInfo):
+
+		self._timeline_info = timeline_info
+
+		# User settings
+		self._global_ffoa = Timecode(0, rate=self._timeline_info.timeline_tc_range.rate)
+		self._global_lfoa = Timecode(0, rate=self._timeline_info.timeline_tc_range.rate)
+
+		self._marker_ffoa = None
+		self._marker_lfoa = None
+
+		# Calculated from user settings
+		self._active_ffoa_offset = self._global_ffoa
+		self._active_lfoa_offset = self._global_lfoa
+
+		self._timecode_trimmed = self._timeline_info.timeline_tc_range
+
+	def timelineInfo(self) -> logic_trt.TimelineInfo:
+		"""The timeline info as it came from the bin"""
+		return self._timeline_info
+
+	def timelineName(self) -> str:
+		"""Timeline name"""
+		return self._timeline_info.timeline_name
+
+	def binLockInfo(self) -> avbutils.LockInfo|None:
+		"""Bin lock info if available"""
+		return self._timeline_info.bin_lock
+
+	def setBinLockInfo(self, bin_lock:avbutils.LockInfo|None):
+		"""Update the bin lock, which changes far more often than the rest"""
+		self._timeline_info = dataclasses.replace(self._timeline_info, bin_lock=bin_lock)
+
+	def timelineTimecodeExtents(self) -> TimecodeRange:
+		"""Full timecode extents of the timeline (without trims)"""
+		return self._timeline_info.timeline_tc_range
+
+	def timelineTimecodeTrimmed(self) -> TimecodeRange:
+		"""Trimmed timecode range (FFOA -> LFOA)"""
+		return self._timecode_trimmed
+
+	def markerFFOA(self) -> avbutils.MarkerInfo|None:
+		"""Matched marker currently in use for FFOA (or `None`)"""
+		return self._marker_ffoa
+
+	def markerLFOA(self) -> avbutils.MarkerInfo|None:
+		"""Matched marker currently in use for LFOA (or `None`)"""
+		return self._marker_lfoa
+
+	def ffoaOffset(self) -> Timecode:
+		"""Duration from head to FFOA"""
+		return self._active_ffoa_offset
+
+	def lfoaOffset(self) -> Timecode:
+		"""Duration from LFOA to tail"""
+		return self._active_lfoa_offset
+
+	# Setters & Dynamic stuff
+	def setGlobalFFOA(self, ffoa:Timecode):
+		"""Default FFOA offset used "globally" for each timeline unless a marker match overrides this"""
+
+		if ffoa.rate != self._timecode_trimmed.rate:
+			raise ValueError("FFOA duration rate must match the timeline's timecode rate")
+
+		self._global_ffoa = ffoa
+		self._updateFFOAOffset()
+
+	def setGlobalLFOA(self, lfoa:Timecode):
+		"""Default LFOA offset used "globally" for each timeline unless a marker match overrides this"""
+
+		if lfoa.rate != self._timecode_trimmed.rate:
+			raise ValueError("LFOA duration rate must match the timeline's timecode rate")
+
+		self._global_lfoa = lfoa
+		self._updateLFOAOffset()
+
+	def findMarkerFFOAFromPreset(self, marker_preset:LBMarkerPreset|None):
+		"""See if we can match us some of them marker for FFOA"""
+
+		if marker_preset is None:
+			self._marker_ffoa = None
+
+		else:
+			self._marker_ffoa = find_marker_from_preset(
+				marker_preset,
+				sorted(self._timeline_info.markers, key=lambda m: m.frm_offset)
+			)
+
+		self._updateFFOAOffset()
+
+		return self.markerFFOA()
+
+	def findMarkerLFOAFromPreset(self, marker_preset:LBMarkerPreset|None):
+		"""See if we can match us some of them marker for LFOA"""
+
+		if marker_preset is None:
+			self._marker_lfoa = None
+
+		else:
+			self._marker_lfoa = find_marker_from_preset(
+				marker_preset,
+				sorted(self._timeline_info.markers, key=lambda m: m.frm_offset, reverse=True)
+			)
+
+		self._updateLFOAOffset()
+
+		return self.markerLFOA()
+
+	# Helpers
+	def _updateFFOAOffset(self):
+		"""Set the frame offset to the FFOA"""
+		# Call this after any potential changes to FFOA criteria
+
+		frame_offset = self.markerFFOA().frm_offset if self.markerFFOA() else self._global_ffoa.frame_number
+
+		self._active_ffoa_offset = Timecode(frame_offset, rate=self._timecode_trimmed.rate)
+
+		self._timecode_trimmed = TimecodeRange(
+			start = self.timelineTimecodeExtents().start + frame_offset,
+			end   = max(self._timecode_trimmed.end,self.timelineTimecodeExtents().start + frame_offset)
+		)
+
+	def _updateLFOAOffset(self):
+		"""Set the frame offset to the FFOA"""
+		# Call this after any potential changes to LFOA criteria
+
+		frame_offset = (self.timelineTimecodeExtents().duration - self.markerLFOA().frm_offset - 1) if self.markerLFOA() else self._global_lfoa.frame_number
+
+		self._active_lfoa_offset = Timecode(frame_offset, rate=self._timecode_trimmed.rate)
+
+		self._timecode_trimmed = TimecodeRange(
+			start = self._timecode_trimmed.start,
+			end   = max(self.timelineTimecodeExtents().end - frame_offset, self._timecode_trimmed.start)
+		)
+
+@dataclasses.dataclass
+class TRTCalculationSettings:
+	"""Everything that goes into a TRT besides the bins themselves"""
+
+	rate:int = 24
+	"""Rate for the totals"""
+
+	trim_head:str|int = 0
+	"""Default FFOA offset from head (frames or timecode)"""
+
+	trim_tail:str|int = 0
+	"""Default LFOA offset from tail (frames or timecode)"""
+
+	trim_total:str|int = 0
+	"""Final adjustment to the TRT (frames or timecode)"""
+
+	head_marker_preset:LBMarkerPreset|None = None
+	tail_marker_preset:LBMarkerPreset|None = None
+
+	selection_mode:SequenceSelectionMode = SequenceSelectionMode.ONE_SEQUENCE_PER_BIN
+	sort_column:str = "Name"
+	sort_descending:bool = False
+	filters:list = dataclasses.field(default_factory=list)
+	"""Filters for picking one sequence per bin"""
+
+	def trimTotal(self) -> Timecode:
+		return parse_duration(self.trim_total, self.rate)
+
+	def selectTimelines(self, bin_timelines:list[logic_trt.TimelineInfo]) -> list[logic_trt.TimelineInfo]:
+		"""Pick the timelines from a bin that count towards the TRT"""
+
+		if self.selection_mode is SequenceSelectionMode.ALL_SEQUENCES_PER_BIN:
+			return list(bin_timelines)
+
+		selected = select_single_timeline(bin_timelines, self.sort_column, self.sort_descending, self.filters) if bin_timelines else None
+		return [selected] if selected else []
+
+	def trimTimeline(self, timeline_info:logic_trt.TimelineInfo) -> TrimmedTimeline:
+		"""Apply trims and marker presets to a timeline"""
+
+		timeline_rate = timeline_info.timeline_tc_range.rate
+
+		trimmed = TrimmedTimeline(timeline_info)
+		trimmed.setGlobalFFOA(parse_duration(self.trim_head, timeline_rate))
+		trimmed.setGlobalLFOA(parse_duration(self.trim_tail, timeline_rate))
+		trimmed.findMarkerFFOAFromPreset(self.head_marker_preset)
+		trimmed.findMarkerLFOAFromPreset(self.tail_marker_preset)
+
+		return trimmed
+
+def total_runtime(trimmed_timelines:typing.Iterable[TrimmedTimeline], trim_total:Timecode, rate:int) -> Timecode:
+	"""Total running time, with the final adjustment (but never less than zero)"""
+
+	trt = Timecode(0, rate=rate)
+
+	for timeline_info in trimmed_timelines:
+		trt += timeline_info.timelineTimecodeTrimmed().duration
+
+	return max(Timecode(0, rate=rate), trt + trim_total)
@@ -0,0 +1,266 @@
+"""
+Lil' Headless Boy: calculate TRTs from the command line, no display required.
+
+    lilbinboy-trt "/Volumes/Reels/Reel *.avb" --head 8:00 --tail 4:00 --format json
+"""
+
+import argparse, glob, json, logging, os, sys, typing
+import avbutils
+from ...lbb_features.trt import calc_trt, executors_trt, identity_trt, index_trt, logic_trt, scan_trt, schema_trt
+
+EXIT_OK          = 0
+"""Everything was read and calculated"""
+EXIT_BIN_ERRORS  = 1
+"""One or more bins couldn't be read"""
+EXIT_USAGE       = 2
+"""Bad arguments, or no bins to be found"""
+EXIT_LOCKED_BINS = 3
+"""Everything was read, but some bins were locked (and may be mid-edit)"""
+
+def expand_bin_paths(patterns:typing.Iterable[str], scan_options:scan_trt.BinScanOptions|None=None) -> list[str]:
+	"""
+	Resolve bin paths, globs and folders (of bins) to a list of bin paths, in order, without duplicates
+	(even by way of symlinks, other mounts or other capitalizations).
+	Folders are searched all the way down if given `scan_options`, otherwise just the top level.
+	"""
+
+	bin_paths:list[str] = []
+
+	for pattern in patterns:
+
+		if os.path.isdir(pattern) and scan_options:
+			matches = list(scan_trt.iter_bin_paths([pattern], scan_options))
+		elif os.path.isdir(pattern):
+			matches = glob.glob(os.path.join(glob.escape(pattern), "*.avb"))
+		elif glob.has_magic(pattern):
+			matches = glob.glob(pattern, recursive=True)
+		else:
+			matches = [pattern]
+
+		bin_paths.extend(os.path.abspath(bin_path) for bin_path in sorted(matches, key=avbutils.human_sort))
+
+	return list(identity_trt.iter_unique_bin_paths(bin_paths))
+
+def parse_marker_preset(spec:str, named_presets:dict[str, calc_trt.LBMarkerPreset]) -> calc_trt.LBMarkerPreset:
+	"""Marker preset from `color=Red,comment=FFOA,author=mj`, or the name of a preset from `--marker-presets`"""
+
+	if "=" not in spec:
+		if spec not in named_presets:
+			raise ValueError(f"No marker preset named \"{spec}\"")
+		return named_presets[spec]
+
+	criteria = {"color": None, "comment": None, "author": None}
+
+	for criterion in spec.split(","):
+		key, _, value = criterion.partition("=")
+		key = key.strip().lower()
+
+		if key not in criteria:
+			raise ValueError(f"Unknown marker criteria \"{key}\" (use color, comment or author)")
+
+		criteria[key] = value.strip() or None
+
+	return calc_trt.LBMarkerPreset(**criteria)
+
+def load_marker_presets(path:str) -> dict[str, calc_trt.LBMarkerPreset]:
+	"""Named marker presets from a JSON file of `{"name": {"color": ..., "comment": ..., "author": ...}}`"""
+
+	with open(path, encoding="utf-8") as presets_file:
+		presets_data = json.load(presets_file)
+
+	return {
+		str(name): calc_trt.LBMarkerPreset(color=preset.get("color"), comment=preset.get("comment"), author=preset.get("author"))
+		for name, preset in presets_data.items()
+	}
+
+def build_parser() -> argparse.ArgumentParser:
+
+	parser = argparse.ArgumentParser(
+		prog="lilbinboy-trt",
+		description="Calculate the total running time of sequences in Avid bins.",
+		epilog=f"Exit codes: {EXIT_OK} OK, {EXIT_BIN_ERRORS} some bins couldn't be read, {EXIT_USAGE} bad arguments or no bins, {EXIT_LOCKED_BINS} some bins were locked.",
+	)
+
+	parser.add_argument("bins", nargs="+", help="Bin paths, globs (quote them), or folders of bins")
+	parser.add_argument("-r", "--recursive", action="store_true", help="Look for bins in folders within folders, too")
+	parser.add_argument("--max-depth", type=int, default=scan_trt.DEFAULT_SCAN_OPTIONS.max_depth, help="How many folders deep to look with --recursive (default: %(default)s)")
+	parser.add_argument("--exclude", metavar="PATTERN", action="append", help=f"Also skip files and folders matching this with --recursive (repeatable; always skipped: {', '.join(scan_trt.DEFAULT_SCAN_OPTIONS.exclude)})")
+
+	trims = parser.add_argument_group("trims", "Durations as timecode (8:00, 00:00:08:00) or frames (192)")
+	trims.add_argument("--head", default="0", help="Trim from the head of each sequence (FFOA), unless a head marker matches")
+	trims.add_argument("--tail", default="0", help="Trim from the tail of each sequence (LFOA), unless a tail marker matches")
+	trims.add_argument("--adjust", default="0", help="Final adjustment to the TRT")
+	trims.add_argument("--rate", type=int, default=24, help="Timecode rate for totals (default: %(default)s)")
+
+	markers = parser.add_argument_group("markers", "Marker criteria as color=Red,comment=FFOA,author=mj or the name of a preset")
+	markers.add_argument("--head-marker", metavar="CRITERIA", help="Use the first matching marker as the FFOA")
+	markers.add_argument("--tail-marker", metavar="CRITERIA", help="Use the last matching marker as the LFOA")
+	markers.add_argument("--marker-presets", metavar="JSON", help="JSON file of named marker presets")
+
+	selection = parser.add_argument_group("sequence selection")
+	selection.add_argument("--selection", choices=["single", "all"], default="single", help="Use one sequence per bin, or all of them (default: %(default)s)")
+	selection.add_argument("--sort-by", choices=calc_trt.SORT_COLUMNS, default="Name", help="How to sort sequences when choosing one per bin (default: %(default)s)")
+	selection.add_argument("--sort-descending", action="store_true", help="Sort descending when choosing one per bin")
+	selection.add_argument("--name-contains", metavar="TEXT", help="Only choose sequences with names containing this")
+
+	index = parser.add_argument_group("bin reading", "Sidecar .lbbidx indexes save re-parsing bins that haven't changed")
+	index.add_argument("--no-index", action="store_true", help="Always parse bins, even if they have a matching index")
+	index.add_argument("--write-index", action="store_true", help="Write an index for each bin that gets parsed")
+	index.add_argument("--retries", type=int, default=executors_trt.DEFAULT_RETRY_POLICY.max_retries, help="Times to try again with bins caught mid-save, backing off each time (default: %(default)s)")
+	index.add_argument("--read-mode", choices=[m.value for m in logic_trt.BinReadMode], default=logic_trt.BinReadMode.AUTO.value, help="Read bins as they're parsed (stream), all at once (buffer), or memory-mapped (mmap) (default: %(default)s)")
+	index.add_argument("--index-dir", metavar="PATH", help="Keep indexes in this (shared) folder instead of next to the bins")
+
+	output = parser.add_argument_group("output")
+	output.add_argument("--format", choices=["json", "csv", "tsv"], default="tsv", help="Output format (default: %(default)s)")
+	output.add_argument("--fields", metavar="FIELD,...", help="Fields to include, in order (default: all).  Choose from: " + ", ".join(f.field for f in calc_trt.SEQUENCE_FIELDS))
+	output.add_argument("-o", "--output", metavar="PATH", help="Write to a file instead of stdout")
+	output.add_argument("--workers", type=int, default=0, help="Bins to parse at once (default: whatever suits the backend)")
+	output.add_argument("--memory-budget", metavar="MB", type=int, help="Memory bins may need at once while parsing, 0 for no limit (default: half of what's free)")
+	output.add_argument("--recycle-mb", metavar="MB", type=int, default=executors_trt.DEFAULT_RECYCLE_RSS // (1024 * 1024), help="Replace worker processes that grow past this, 0 to never (default: %(default)s)")
+	output.add_argument("--backend", choices=[b.value for b in executors_trt.ParseBackend], default=executors_trt.ParseBackend.AUTO.value, help="Parse bins in worker processes, threads, or one at a time for debugging (default: %(default)s)")
+	output.add_argument("--ignore-locks", action="store_true", help=f"Don't exit with {EXIT_LOCKED_BINS} when bins are locked")
+	output.add_argument("-q", "--quiet", action="store_true", help="Don't print the TRT summary to stderr")
+	output.add_argument("-v", "--verbose", action="count", default=0, help="More logging (repeat for even more)")
+
+	return parser
+
+def settings_from_args(args:argparse.Namespace) -> calc_trt.TRTCalculationSettings:
+
+	named_presets = load_marker_presets(args.marker_presets) if args.marker_presets else {}
+
+	return calc_trt.TRTCalculationSettings(
+		rate               = args.rate,
+		trim_head          = args.head,
+		trim_tail          = args.tail,
+		trim_total         = args.adjust,
+		head_marker_preset = parse_marker_preset(args.head_marker, named_presets) if args.head_marker else None,
+		tail_marker_preset = parse_marker_preset(args.tail_marker, named_presets) if args.tail_marker else None,
+		selection_mode     = calc_trt.SequenceSelectionMode.ALL_SEQUENCES_PER_BIN if args.selection == "all" else calc_trt.SequenceSelectionMode.ONE_SEQUENCE_PER_BIN,
+		sort_column        = args.sort_by,
+		sort_descending    = args.sort_descending,
+		filters            = [calc_trt.NameContainsFilter(args.name_contains)] if args.name_contains else [],
+	)
+
+def index_options_from_args(args:argparse.Namespace) -> index_trt.BinIndexOptions:
+
+	return index_trt.BinIndexOptions(
+		read      = not args.no_index,
+		write     = args.write_index,
+		cache_dir = args.index_dir,
+	)
+
+def fields_from_args(args:argparse.Namespace) -> list[calc_trt.SequenceField]:
+
+	if not args.fields:
+		return list(calc_trt.SEQUENCE_FIELDS)
+
+	fields_by_key = {f.field: f for f in calc_trt.SEQUENCE_FIELDS}
+	fields = []
+
+	for field_key in args.fields.split(","):
+		field_key = field_key.strip()
+		if field_key not in fields_by_key:
+			raise ValueError(f"Unknown field \"{field_key}\"")
+		fields.append(fields_by_key[field_key])
+
+	return fields
+
+def main(argv:list[str]|None=None) -> int:
+
+	parser = build_parser()
+	args = parser.parse_args(argv)
+
+	logging.basicConfig(
+		level = logging.WARNING - 10 * min(args.verbose, 2),
+		format = "%(levelname)s: %(message)s",
+		stream = sys.stderr,
+	)
+
+	try:
+		calc_settings = settings_from_args(args)
+		fields = fields_from_args(args)
+		calc_settings.trimTotal()
+	except (ValueError, OSError) as e:
+		parser.error(str(e))
+
+	scan_options = scan_trt.BinScanOptions(
+		exclude   = scan_trt.DEFAULT_SCAN_OPTIONS.exclude + tuple(args.exclude or ()),
+		max_depth = args.max_depth if args.max_depth >= 0 else None,
+	) if args.recursive else None
+
+	bin_paths = expand_bin_paths(args.bins, scan_options)
+	missing_bins = [p for p in bin_paths if not os.path.isfile(p)]
+
+	for bin_path in missing_bins:
+		logging.getLogger(__name__).error("No bin at %s", bin_path)
+
+	bin_paths = [p for p in bin_paths if p not in missing_bins]
+
+	if not bin_paths:
+		logging.getLogger(__name__).error("No bins to calculate")
+		return EXIT_USAGE
+
+	# Parse 'em all in parallel, then put 'em back in the order they were asked for
+	parsed_bins:dict[str, list[logic_trt.TimelineInfo]] = {}
+	failed_bins = list(missing_bins)
+
+	parse_stats = executors_trt.ParseRunStats(executors_trt.ParseBackend(args.backend), args.workers)
+
+	for bin_path, timelines, error in logic_trt.iter_timelines_from_bins(bin_paths, max_workers=max(0, args.workers) or None, index_options=index_options_from_args(args), read_mode=logic_trt.BinReadMode(args.read_mode), backend=executors_trt.ParseBackend(args.backend), stats=parse_stats, retry_policy=executors_trt.RetryPolicy(max_retries=max(0, args.retries)), memory_budget=max(0, args.memory_budget) * 1024 * 1024 if args.memory_budget is not None else None, recycle_rss=max(0, args.recycle_mb) * 1024 * 1024 or None):
+		if error is None:
+			logging.getLogger(__name__).info("Read %i sequence(s) from %s", len(timelines), bin_path)
+			parsed_bins[bin_path] = timelines
+		else:
+			logging.getLogger(__name__).error("Couldn't read %s: %s", bin_path, error)
+			failed_bins.append(bin_path)
+
+	logging.getLogger(__name__).info("Parsed %i bin(s) in %.2f s with %s x%i (%.1f bins/s)", parse_stats.bin_count, parse_stats.elapsed(), parse_stats.backend.value, parse_stats.max_workers, parse_stats.binsPerSecond())
+
+	trimmed_timelines:list[calc_trt.TrimmedTimeline] = []
+	locked_bins:list[str] = []
+
+	for bin_path in bin_paths:
+
+		if bin_path not in parsed_bins:
+			continue
+
+		bin_timelines = parsed_bins[bin_path]
+
+		if any(t.bin_lock for t in bin_timelines):
+			locked_bins.append(bin_path)
+			logging.getLogger(__name__).warning("Bin is locked by %s: %s", next(t.bin_lock for t in bin_timelines if t.bin_lock).name, bin_path)
+
+		selected_timelines = calc_settings.selectTimelines(bin_timelines)
+		if not selected_timelines:
+			logging.getLogger(__name__).warning("No sequences chosen from %s", bin_path)
+
+		trimmed_timelines.extend(calc_settings.trimTimeline(t) for t in selected_timelines)
+
+	# Output
+	output_handle = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+
+	try:
+		if args.format == "json":
+			json.dump(schema_trt.format_json(trimmed_timelines, calc_settings.trimTotal(), calc_settings.rate, fields), output_handle, indent='\t')
+			output_handle.write("\n")
+		else:
+			schema_trt.write_delimited(trimmed_timelines, output_handle, args.format, fields)
+	finally:
+		if args.output:
+			output_handle.close()
+
+	if not args.quiet:
+		total_runtime = calc_trt.total_runtime(trimmed_timelines, calc_settings.trimTotal(), calc_settings.rate)
+		print(f"TRT {total_runtime} ({calc_trt.format_feet_frames(total_runtime.frame_number)}) from {len(trimmed_timelines)} sequence(s) in {len(parsed_bins)} bin(s)", file=sys.stderr)
+
+	if failed_bins:
+		return EXIT_BIN_ERRORS
+	elif locked_bins and not args.ignore_locks:
+		return EXIT_LOCKED_BINS
+
+	return EXIT_OK
+
+if __name__ == "__main__":
+	import multiprocessing
+	multiprocessing.freeze_support()
+	sys.exit(main())
@@ -8,7 +8,6 @@ class LBBRuntimeMetricsController(QtCore.QObject):
 	def __init__(self, runtime_panel:LBBRuntimeMetricsPanel|None=None, *args, **kwargs):
 		super().__init__(*args, **kwargs)
 
-		logging.basicConfig(level=logging.DEBUG)
 		self.logger = logging.getLogger(__name__)
 
 		self.panel = runtime_panel or LBBRuntimeMetricsPanel()
@@ -1,7 +1,17 @@
-import logging
+import logging, dataclasses, datetime, hashlib, json
 import timecode
 from PySide6 import QtCore, QtSql, QtGui
 
+@dataclasses.dataclass(frozen=True)
+class SnapshotRetentionPolicy:
+	"""How long automatic snapshots are kept around before being thinned out"""
+
+	keep_all_days:int = 1
+	"""Keep every automatic snapshot from the last N days (1 = just today)"""
+
+	keep_daily_days:int = 30
+	"""After that, keep the latest automatic snapshot per day up to N days old.  Weekly after that."""
+
 class SnapshotDatabaseManager(QtCore.QObject):
 
 	def __init__(self, database:QtSql.QSqlDatabase):
@@ -16,6 +26,10 @@ class SnapshotDatabaseManager(QtCore.QObject):
 		if not QtSql.QSqlQuery(self._db).exec("PRAGMA foreign_keys = ON;"):
 			logging.getLogger(__name__).error("Error enabling foregin keys: %s", self._db.lastError().text())
 
+		# NOTE: Only takes effect on a new database; existing ones are converted on the next full VACUUM (see incrementalVacuum())
+		if not QtSql.QSqlQuery(self._db).exec("PRAGMA auto_vacuum = INCREMENTAL;"):
+			logging.getLogger(__name__).error("Error setting auto vacuum mode: %s", self._db.lastError().text())
+
 		if not QtSql.QSqlQuery(self._db).exec(
 			"""
 			CREATE TABLE IF NOT EXISTS "trt_snapshot_labels" (
@@ -29,6 +43,8 @@ class SnapshotDatabaseManager(QtCore.QObject):
 				"duration_trimmed_ff"	TEXT NOT NULL DEFAULT '0+00',
 				"duration_offset_frames"	INTEGER NOT NULL DEFAULT 0,
 				"is_current"	INTEGER NOT NULL DEFAULT 0,
+				"is_auto"	INTEGER NOT NULL DEFAULT 0,
+				"content_hash"	TEXT,
 				PRIMARY KEY("id_snapshot" AUTOINCREMENT)
 			)
 			"""
@@ -52,6 +68,60 @@ class SnapshotDatabaseManager(QtCore.QObject):
 			"""
 		):
 			logging.getLogger(__name__).error("Error setting up snapshot sequences: %s", self._db.lastError().text())
+
+		# Databases from before automatic snapshots need the new columns
+		query = QtSql.QSqlQuery(self._db)
+		query.exec("PRAGMA table_info(trt_snapshot_labels)")
+		existing_columns = set()
+		while query.next():
+			existing_columns.add(query.value(1))
+		
+		for column_name, column_definition in {
+			"is_auto":      "INTEGER NOT NULL DEFAULT 0",
+			"content_hash": "TEXT",
+		}.items():
+			if column_name in existing_columns:
+				continue
+			if not QtSql.QSqlQuery(self._db).exec(f'ALTER TABLE trt_snapshot_labels ADD COLUMN "{column_name}" {column_definition}'):
+				logging.getLogger(__name__).error("Error adding column %s to snapshot labels: %s", column_name, self._db.lastError().text())
+		
+		if not QtSql.QSqlQuery(self._db).exec('CREATE INDEX IF NOT EXISTS "idx_snapshot_sequences_id_snapshot" ON trt_snapshot_sequences("id_snapshot")'):
+			logging.getLogger(__name__).error("Error indexing snapshot sequences: %s", self._db.lastError().text())
+	
+	@staticmethod
+	def contentHash(rate:int, adjust_frames:int, duration_frames:int, timeline_info_list:list) -> str:
+		"""Fingerprint the contents of a snapshot, so identical states can be skipped"""
+
+		contents = [
+			int(rate),
+			int(adjust_frames),
+			int(duration_frames),
+			[dataclasses.astuple(timeline_info) for timeline_info in timeline_info_list]
+		]
+
+		return hashlib.sha1(json.dumps(contents, default=str).encode("utf-8")).hexdigest()
+	
+	def latestContentHash(self) -> str|None:
+		"""Content hash of the most recently saved snapshot, if any"""
+
+		query = QtSql.QSqlQuery(self._db)
+
+		if not query.exec(
+			"""
+			SELECT "content_hash"
+			FROM trt_snapshot_labels
+			WHERE is_current = 0
+			ORDER BY datetime_created DESC, id_snapshot DESC
+			LIMIT 1
+			"""
+		):
+			logging.getLogger(__name__).error("Error getting latest snapshot hash: %s", query.lastError().text())
+			return None
+		
+		if not query.next() or query.isNull(0):
+			return None
+		
+		return str(query.value(0))
 	
 	def getSnapshotRecords(self, records:list[QtSql.QSqlRecord]):
 
@@ -103,7 +173,8 @@ class SnapshotDatabaseManager(QtCore.QObject):
 		rate:int,
 		adjust_frames:int,
 		duration_frames:int, 
-		timeline_info_list:list
+		timeline_info_list:list,
+		is_auto:bool=False
 	) -> int:
 
 		query = QtSql.QSqlQuery(self._db)
@@ -128,7 +199,9 @@ class SnapshotDatabaseManager(QtCore.QObject):
 				"duration_trimmed_tc",
 				"duration_trimmed_ff",
 				"duration_offset_frames",
-				"is_current"
+				"is_current",
+				"is_auto",
+				"content_hash"
 			)
 
 			VALUES (
@@ -139,7 +212,9 @@ class SnapshotDatabaseManager(QtCore.QObject):
 				?,
 				?,
 				?,
-				0
+				0,
+				?,
+				?
 			)
 			"""
 		)
@@ -150,6 +225,8 @@ class SnapshotDatabaseManager(QtCore.QObject):
 		query.addBindValue(str(timecode.Timecode(duration_frames, rate=rate)))
 		query.addBindValue(str(duration_frames)) # TODO: F+F
 		query.addBindValue(adjust_frames)
+		query.addBindValue(int(bool(is_auto)))
+		query.addBindValue(self.contentHash(rate, adjust_frames, duration_frames, timeline_info_list))
 		if not query.exec():
 			logging.getLogger(__name__).error("Error creating snapshot group: %s", query.lastError().text())
 		
@@ -200,4 +277,81 @@ class SnapshotDatabaseManager(QtCore.QObject):
 			query.addBindValue(id_snapshot)
 		
 		if not query.exec():
-			logging.getLogger(__name__).error("Error deleting snapshot group: %s", query.lastError().text())
\ No newline at end of file
+			logging.getLogger(__name__).error("Error deleting snapshot group: %s", query.lastError().text())
+	
+	def compactAutoSnapshots(self, policy:SnapshotRetentionPolicy, now:datetime.datetime|None=None) -> int:
+		"""Thin out old automatic snapshots according to a retention policy.  Returns the number of snapshots removed."""
+
+		# NOTE: Manually-saved snapshots are never touched here
+		today = (now or datetime.datetime.now()).date()
+
+		query = QtSql.QSqlQuery(self._db)
+		if not query.exec(
+			"""
+			SELECT
+				"id_snapshot",
+				date(datetime_created, "localtime") as "date_created_local"
+			FROM trt_snapshot_labels
+			WHERE is_auto = 1 AND is_current = 0
+			ORDER BY datetime_created DESC, id_snapshot DESC
+			"""
+		):
+			logging.getLogger(__name__).error("Error reading automatic snapshots: %s", query.lastError().text())
+			return 0
+		
+		# Newest first, so the first snapshot to land in a bucket is the one we keep
+		kept_buckets = set()
+		expired_ids:list[int] = []
+
+		while query.next():
+			id_snapshot = query.value(0)
+			date_created = datetime.date.fromisoformat(query.value(1))
+			age_days = (today - date_created).days
+
+			if age_days < policy.keep_all_days:
+				bucket = ("all", id_snapshot)
+			elif age_days < policy.keep_daily_days:
+				bucket = ("day", date_created)
+			else:
+				bucket = ("week",) + tuple(date_created.isocalendar()[:2])
+			
+			if bucket in kept_buckets:
+				expired_ids.append(id_snapshot)
+			else:
+				kept_buckets.add(bucket)
+		
+		if not expired_ids:
+			return 0
+		
+		placeholders = ",".join(["?"] * len(expired_ids))
+		query.prepare(
+			f"""
+			DELETE FROM trt_snapshot_labels
+			WHERE id_snapshot IN ({placeholders})
+			"""
+		)
+		for id_snapshot in expired_ids:
+			query.addBindValue(id_snapshot)
+		
+		if not query.exec():
+			logging.getLogger(__name__).error("Error compacting automatic snapshots: %s", query.lastError().text())
+			return 0
+		
+		logging.getLogger(__name__).debug("Compacted %i automatic snapshot(s)", len(expired_ids))
+		return len(expired_ids)
+	
+	def incrementalVacuum(self):
+		"""Give free pages back to the filesystem"""
+
+		query = QtSql.QSqlQuery(self._db)
+		query.exec("PRAGMA auto_vacuum")
+		
+		# Databases created before incremental vacuuming need one full VACUUM to switch over (2 = INCREMENTAL)
+		if query.next() and query.value(0) != 2:
+			logging.getLogger(__name__).debug("Converting snapshot database to incremental vacuum")
+			if not QtSql.QSqlQuery(self._db).exec("PRAGMA auto_vacuum = INCREMENTAL;") or not QtSql.QSqlQuery(self._db).exec("VACUUM;"):
+				logging.getLogger(__name__).error("Error converting database to incremental vacuum: %s", self._db.lastError().text())
+			return
+		
+		if not QtSql.QSqlQuery(self._db).exec("PRAGMA incremental_vacuum;"):
+			logging.getLogger(__name__).error("Error running incremental vacuum: %s", self._db.lastError().text())
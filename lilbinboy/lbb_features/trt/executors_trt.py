@@ -0,0 +1,398 @@
+"""
+Where bins get parsed: a pool of processes, a pool of threads, or right here and now.
+
+Processes sidestep the GIL, but cost a startup and a pickle each way.  Threads are the way
+to go on free-threaded (3.13t+) Pythons, or when it's the file server doing all the work.
+Serial is for debugging, where you'd like your breakpoints to actually break.
+
+Also in here: how many workers to start, which bins to hand them first, and how much memory
+they're eating while they're at it.
+"""
+
+import contextlib, dataclasses, enum, heapq, itertools, logging, math, multiprocessing, os, queue, sys, time, typing
+from concurrent import futures
+
+class ParseBackend(enum.Enum):
+	"""Executor to parse bins with"""
+
+	AUTO    = "auto"
+	PROCESS = "process"
+	THREAD  = "thread"
+	SERIAL  = "serial"
+
+MAX_GIL_THREAD_WORKERS:int = 16
+"""Most threads to start when they have to share a GIL (they're only waiting on I/O, then)"""
+
+MEMORY_PER_BIN_BYTE:int = 8
+"""Rough memory needed to parse a bin, as a multiple of its size on disk"""
+
+MIN_MEMORY_PER_WORKER:int = 64 * 1024 * 1024
+"""Memory to count on per worker, no matter how small the bins"""
+
+MEMORY_BUDGET_FRACTION:float = 0.5
+"""Share of available memory the workers may count on.  Media Composer needs the rest."""
+
+MIN_SECONDS_PER_PROCESS:float = 0.5
+"""Parse time each worker process should have ahead of it to be worth starting"""
+
+DEFAULT_RECYCLE_RSS:int = 1024 * 1024 * 1024
+"""Worker processes bigger than this after a bin get replaced with fresh ones"""
+
+def is_free_threaded() -> bool:
+	"""Is this a Python without a GIL (or with it turned off)?"""
+	return not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+def default_backend() -> ParseBackend:
+	"""Best guess for this interpreter and machine"""
+
+	if is_free_threaded():
+		return ParseBackend.THREAD
+
+	# No point paying for processes that'll just take turns
+	if (os.cpu_count() or 1) < 2:
+		return ParseBackend.SERIAL
+
+	return ParseBackend.PROCESS
+
+def resolve_backend(backend:ParseBackend|str|None) -> ParseBackend:
+	"""An actual backend, given a maybe-`AUTO` (or maybe-string) one"""
+
+	backend = ParseBackend(backend) if backend else ParseBackend.AUTO
+	return default_backend() if backend is ParseBackend.AUTO else backend
+
+def available_memory() -> int|None:
+	"""Bytes of memory free for the taking, or `None` if we can't tell on this platform"""
+
+	try:
+		if sys.platform == "win32":
+			import ctypes
+
+			class MemoryStatus(ctypes.Structure):
+				_fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong)] + [(name, ctypes.c_ulonglong) for name in ("ullTotalPhys", "ullAvailPhys", "ullTotalPageFile", "ullAvailPageFile", "ullTotalVirtual", "ullAvailVirtual", "ullAvailExtendedVirtual")]
+
+			memory_status = MemoryStatus(dwLength=ctypes.sizeof(MemoryStatus))
+			ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(memory_status))
+			return int(memory_status.ullAvailPhys)
+
+		if os.path.exists("/proc/meminfo"):
+			with open("/proc/meminfo") as meminfo:
+				for line in meminfo:
+					if line.startswith("MemAvailable:"):
+						return int(line.split()[1]) * 1024
+
+		# macOS doesn't say what's available, so go with half of what's there
+		return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2
+
+	except (OSError, ValueError, AttributeError) as e:
+		logging.getLogger(__name__).debug("Couldn't tell how much memory is available: %s", e)
+		return None
+
+def _windows_process_memory() -> typing.Any:
+	"""`PROCESS_MEMORY_COUNTERS` for this process"""
+
+	import ctypes
+	from ctypes import wintypes
+
+	class ProcessMemoryCounters(ctypes.Structure):
+		_fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [(name, ctypes.c_size_t) for name in ("PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+	counters = ProcessMemoryCounters(cb=ctypes.sizeof(ProcessMemoryCounters))
+	ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+	return counters
+
+def _proc_status_bytes(field:str) -> int|None:
+	"""A `kB` field from `/proc/self/status`, in bytes"""
+
+	with open("/proc/self/status") as proc_status:
+		for line in proc_status:
+			if line.startswith(field + ":"):
+				return int(line.split()[1]) * 1024
+	return None
+
+def current_rss() -> int|None:
+	"""Bytes of memory this process is holding right now, if we can tell"""
+
+	try:
+		if sys.platform == "win32":
+			return int(_windows_process_memory().WorkingSetSize)
+		if os.path.exists("/proc/self/status"):
+			return _proc_status_bytes("VmRSS")
+	except (OSError, ValueError, AttributeError):
+		pass
+
+	return None
+
+def reset_peak_rss() -> bool:
+	"""Start counting peak memory over from here, if the platform allows it (just Linux)"""
+
+	try:
+		with open("/proc/self/clear_refs", "w") as clear_refs:
+			clear_refs.write("5")
+		return True
+	except OSError:
+		return False
+
+def peak_rss() -> int|None:
+	"""
+	Most memory this process has held: since the last `reset_peak_rss()` where that works,
+	or else over its whole life
+	"""
+
+	try:
+		if sys.platform == "win32":
+			return int(_windows_process_memory().PeakWorkingSetSize)
+		if os.path.exists("/proc/self/status"):
+			return _proc_status_bytes("VmHWM")
+
+		import resource
+		# Bytes on macOS, where there's no /proc
+		return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+	except (OSError, ValueError, AttributeError, ImportError):
+		return None
+
+
+@dataclasses.dataclass(frozen=True)
+class JobMetrics:
+	"""How a bin went in the worker that parsed it"""
+
+	seconds:float
+	"""Time spent parsing (not waiting for a worker)"""
+
+	pid:int
+	"""The worker process"""
+
+	rss_before:int|None = None
+	"""Worker memory before the bin"""
+
+	rss_after:int|None = None
+	"""Worker memory after the bin"""
+
+	peak_rss:int|None = None
+	"""Most worker memory during the bin (or during the worker's life, if the platform can't reset it)"""
+
+	def peakIncrease(self) -> int|None:
+		"""How much more memory the worker needed for this bin, at most"""
+
+		if self.peak_rss is None or self.rss_before is None:
+			return None
+
+		return max(0, self.peak_rss - self.rss_before)
+
+
+def recommended_worker_count(backend:ParseBackend, bin_count:int|None=None, largest_bin_size:int|None=None, estimated_seconds:float|None=None) -> int:
+	"""
+	Workers to use for a (resolved) backend, given what's known about the batch: the cores to go around,
+	the memory the biggest bin is likely to need, and whether there's enough work to keep them all busy.
+	"""
+
+	if backend is ParseBackend.SERIAL:
+		return 1
+
+	cpu_count = os.cpu_count() or 1
+
+	if backend is ParseBackend.THREAD:
+		worker_count = cpu_count if is_free_threaded() else min(cpu_count * 2, MAX_GIL_THREAD_WORKERS)
+	else:
+		# Leave a core for Media Composer, or whoever else
+		worker_count = max(1, cpu_count - 1)
+
+	memory_free = available_memory()
+	if memory_free:
+		memory_per_worker = max(MIN_MEMORY_PER_WORKER, (largest_bin_size or 0) * MEMORY_PER_BIN_BYTE)
+		worker_count = min(worker_count, int(memory_free * MEMORY_BUDGET_FRACTION // memory_per_worker))
+
+	# Processes take a while to get going; no sense starting one for a tenth of a second of work
+	if estimated_seconds is not None and backend is ParseBackend.PROCESS:
+		worker_count = min(worker_count, math.ceil(estimated_seconds / MIN_SECONDS_PER_PROCESS))
+
+	if bin_count is not None:
+		worker_count = min(worker_count, bin_count)
+
+	return max(1, worker_count)
+
+
+class SerialExecutor(futures.Executor):
+	"""Does the work the moment it's handed over, on the calling thread"""
+
+	def submit(self, fn, /, *args, **kwargs) -> futures.Future:
+
+		future = futures.Future()
+
+		try:
+			future.set_result(fn(*args, **kwargs))
+		except Exception as e:
+			future.set_exception(e)
+
+		return future
+
+class BinCostEstimator:
+	"""Guesses how long a bin will take to parse: as long as it did last time, or else going by its size"""
+
+	DEFAULT_BYTES_PER_SECOND:float = 20_000_000
+
+	def __init__(self, parse_seconds:typing.Mapping[str, float]|None=None, bytes_per_second:float|None=None):
+		"""`parse_seconds` is how long bins took before; `bytes_per_second` is how quick parsing usually goes"""
+
+		self._parse_seconds = dict(parse_seconds or {})
+		self._bytes_per_second = bytes_per_second or self.DEFAULT_BYTES_PER_SECOND
+		self._bin_sizes:dict[str, int] = {}
+
+	def binSize(self, bin_path:str) -> int:
+		"""Size of a bin on disk (0 if it's gone)"""
+
+		if bin_path not in self._bin_sizes:
+			try:
+				self._bin_sizes[bin_path] = os.stat(bin_path).st_size
+			except OSError:
+				self._bin_sizes[bin_path] = 0
+
+		return self._bin_sizes[bin_path]
+
+	def estimate(self, bin_path:str) -> float:
+		"""Estimated seconds to parse a bin"""
+
+		if bin_path in self._parse_seconds:
+			return self._parse_seconds[bin_path]
+
+		return self.binSize(bin_path) / self._bytes_per_second
+
+
+class LargestFirstQueue:
+	"""
+	Hands out the costliest item it's seen so far, so the big reel bin isn't the one everybody waits on at the end.
+
+	With a `lookahead`, only that many items are pulled from a lazy iterable at a time, so things can
+	get going before it's done; without one, it's all pulled in and sorted up front.  Starting from an
+	`initial_lookahead`, the lookahead grows by one with each item handed out, so the first ones go out
+	as soon as they turn up rather than once a full lookahead's worth has.
+	"""
+
+	def __init__(self, items:typing.Iterable[typing.Any], cost:typing.Callable[[typing.Any], float], lookahead:int|None=None, initial_lookahead:int|None=None):
+
+		self._items = iter(items)
+		self._cost = cost
+		self._lookahead = lookahead
+		self._current_lookahead = min(initial_lookahead, lookahead) if initial_lookahead and lookahead else lookahead
+		self._queued:list[tuple[float, int, typing.Any]] = []
+		self._counter = itertools.count()
+		self._is_exhausted = False
+
+	def fill(self):
+		"""Pull in items until the lookahead's full (or there are no more)"""
+
+		while not self._is_exhausted and (self._current_lookahead is None or len(self._queued) < self._current_lookahead):
+			try:
+				item = next(self._items)
+			except StopIteration:
+				self._is_exhausted = True
+				break
+			# Counter breaks ties in the order they came in
+			heapq.heappush(self._queued, (-self._cost(item), next(self._counter), item))
+
+	def isExhausted(self) -> bool:
+		"""Every item has been pulled in (though maybe not handed out yet)"""
+		return self._is_exhausted
+
+	def queued(self) -> list[typing.Any]:
+		"""Items pulled in and not yet handed out"""
+		return [item for _, _, item in self._queued]
+
+	def __iter__(self):
+		return self
+
+	def __next__(self):
+
+		self.fill()
+
+		if not self._queued:
+			raise StopIteration
+
+		if self._current_lookahead is not None:
+			self._current_lookahead = min(self._lookahead, self._current_lookahead + 1)
+
+		return heapq.heappop(self._queued)[2]
+
+
+def create_executor(backend:ParseBackend, max_workers:int) -> futures.Executor:
+	"""A fresh executor for a (resolved) backend"""
+
+	if backend is ParseBackend.PROCESS:
+		return futures.ProcessPoolExecutor(max_workers=max_workers)
+	elif backend is ParseBackend.THREAD:
+		return futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lbb_parse")
+	elif backend is ParseBackend.SERIAL:
+		return SerialExecutor()
+
+	raise ValueError(f"No executor for {backend}")
+
+
+@dataclasses.dataclass(frozen=True)
+class RetryPolicy:
+	"""How hard to try again with bins that were caught mid-save"""
+
+	max_retries:int = 4
+	"""Tries after the first one, before giving up"""
+
+	initial_delay:float = 0.5
+	"""Seconds before the first retry"""
+
+	backoff:float = 2.0
+	"""Each retry waits this much longer than the last"""
+
+	max_delay:float = 8.0
+	"""Longest to wait between any two tries"""
+
+	def delay(self, retry_count:int) -> float:
+		"""Seconds to wait, after this many retries already"""
+		return min(self.max_delay, self.initial_delay * self.backoff ** retry_count)
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+"""About 7.5 seconds of trying, all told: plenty for Media Composer to finish a save"""
+
+@contextlib.contextmanager
+def progress_queue(backend:ParseBackend) -> typing.Iterator[typing.Any]:
+	"""A queue that workers of a (resolved) backend can report progress on, for as long as it's needed"""
+
+	if backend is ParseBackend.PROCESS:
+		# Has to be a managed one to be handed to a worker process along with the job
+		with multiprocessing.Manager() as manager:
+			yield manager.Queue()
+	else:
+		yield queue.SimpleQueue()
+
+
+@dataclasses.dataclass
+class ParseRunStats:
+	"""How a batch of bins went, for comparing backends"""
+
+	backend:ParseBackend
+	max_workers:int
+	bin_count:int = 0
+	error_count:int = 0
+	byte_count:int = 0
+	"""Size of the bins parsed, if whoever's running things keeps track"""
+	retry_count:int = 0
+	"""Times bins were caught mid-save and had to be tried again"""
+	recycle_count:int = 0
+	"""Times the worker processes got too big and were replaced"""
+	peak_rss:int = 0
+	"""Most memory any worker held for a bin"""
+	bin_seconds:dict[str, float] = dataclasses.field(default_factory=dict)
+	"""Seconds each bin took to parse, in the worker"""
+	time_started:float = dataclasses.field(default_factory=time.perf_counter)
+	time_finished:float|None = None
+
+	def elapsed(self) -> float:
+		"""Seconds from the first bin submitted to the last one back (or now, if still going)"""
+		return (self.time_finished or time.perf_counter()) - self.time_started
+
+	def binsPerSecond(self) -> float:
+		return self.bin_count / self.elapsed() if self.elapsed() > 0 else 0.0
+
+	def bytesPerSecond(self) -> float:
+		return self.byte_count / self.elapsed() if self.elapsed() > 0 else 0.0
+
+	def finish(self):
+		self.time_finished = time.perf_counter()
+		logging.getLogger(__name__).debug("Parsed %i bin(s) (%i error(s)) in %.2f s with %s x%i: %.1f bins/s", self.bin_count, self.error_count, self.elapsed(), self.backend.value, self.max_workers, self.binsPerSecond())
@@ -0,0 +1,192 @@
+"""Automatic snapshots of the current TRT, skipping anything we've already seen"""
+
+import logging, typing
+from PySide6 import QtCore, QtGui, QtSql
+from .db_hist_sqlite import SnapshotDatabaseManager, SnapshotRetentionPolicy
+
+class TRTSnapshotCompactionJob(QtCore.QRunnable):
+	"""Compact old automatic snapshots and vacuum the database on a worker thread"""
+
+	class TRTSnapshotCompactionSignals(QtCore.QObject):
+		sig_compaction_complete = QtCore.Signal(int)
+		"""Compaction finished, with the number of snapshots removed"""
+
+	def __init__(self, database_path:str, policy:SnapshotRetentionPolicy):
+		super().__init__()
+		self._database_path = database_path
+		self._policy = policy
+		self._signals = self.TRTSnapshotCompactionSignals()
+
+	def signals(self) -> TRTSnapshotCompactionSignals:
+		return self._signals
+
+	def run(self):
+
+		# QSqlDatabase connections can't cross threads, so this one gets its own
+		connection_name = f"trt_compaction_{id(self)}"
+		removed_count = self._compact(connection_name)
+		QtSql.QSqlDatabase.removeDatabase(connection_name)
+
+		self.signals().sig_compaction_complete.emit(removed_count)
+
+	def _compact(self, connection_name:str) -> int:
+
+		db = QtSql.QSqlDatabase.addDatabase("QSQLITE", connection_name)
+		db.setDatabaseName(self._database_path)
+		db.setConnectOptions("QSQLITE_BUSY_TIMEOUT=5000")
+
+		if not db.open():
+			logging.getLogger(__name__).error("Couldn't open database for compaction at %s: %s", self._database_path, db.lastError().text())
+			return 0
+
+		db_manager = SnapshotDatabaseManager(db)
+		removed_count = db_manager.compactAutoSnapshots(self._policy)
+		db_manager.incrementalVacuum()
+
+		db.close()
+		return removed_count
+
+
+class TRTAutoSnapshotManager(QtCore.QObject):
+	"""Save snapshots on a timer or when the TRT settles, but only when something actually changed"""
+
+	DEFAULT_INTERVAL:int = 15 * 60 * 1000
+	"""Default interval (in msec) between timed snapshots"""
+
+	DEFAULT_SETTLE_DELAY:int = 60 * 1000
+	"""Default delay (in msec) after the last TRT change before snapshotting it"""
+
+	sig_snapshot_saved = QtCore.Signal(int)
+	"""A new automatic snapshot was saved, with its `id_snapshot`"""
+
+	sig_snapshots_compacted = QtCore.Signal(int)
+	"""Old automatic snapshots were compacted, with the number removed"""
+
+	def __init__(self, database_source:typing.Callable[[], QtSql.QSqlDatabase], snapshot_source:typing.Callable[[], dict|None], *args, **kwargs):
+		"""
+		`database_source` is called for the snapshot database the first time it's needed, not before.
+
+		`snapshot_source` is called when it's time for a snapshot, and returns keyword arguments
+		for `SnapshotDatabaseManager.saveLiveToSnapshot()` (less the name), or `None` to skip it
+		"""
+
+		super().__init__(*args, **kwargs)
+
+		self._database_source = database_source
+		self._database:QtSql.QSqlDatabase|None = None
+		self._db_manager:SnapshotDatabaseManager|None = None
+		self._snapshot_source = snapshot_source
+
+		self._retention_policy = SnapshotRetentionPolicy()
+		self._is_enabled = False
+
+		self._pool = QtCore.QThreadPool.globalInstance()
+
+		# Regular old snapshot every so often
+		self._timer_interval = QtCore.QTimer(interval=self.DEFAULT_INTERVAL)
+		self._timer_interval.timeout.connect(self.takeSnapshot)
+
+		# Snapshot once the TRT stops changing for a bit
+		self._timer_settle = QtCore.QTimer(singleShot=True, interval=self.DEFAULT_SETTLE_DELAY)
+		self._timer_settle.timeout.connect(self.takeSnapshot)
+
+	def database(self) -> QtSql.QSqlDatabase:
+		"""The snapshot database, opened on first use"""
+
+		if self._database is None:
+			self._database = self._database_source()
+
+		return self._database
+
+	def databaseManager(self) -> SnapshotDatabaseManager:
+		"""The snapshot database, set up on first use"""
+
+		if self._db_manager is None:
+			self._db_manager = SnapshotDatabaseManager(self.database())
+
+		return self._db_manager
+
+	def isEnabled(self) -> bool:
+		return self._is_enabled
+
+	@QtCore.Slot(bool)
+	def setEnabled(self, is_enabled:bool):
+		"""Enable or disable automatic snapshots"""
+
+		self._is_enabled = bool(is_enabled)
+
+		if self._is_enabled:
+			self._timer_interval.start()
+		else:
+			self._timer_interval.stop()
+			self._timer_settle.stop()
+
+	def interval(self) -> int:
+		"""Interval (in msec) between timed snapshots"""
+		return self._timer_interval.interval()
+
+	def setInterval(self, interval_msec:int):
+		self._timer_interval.setInterval(max(int(interval_msec), 1000))
+
+	def settleDelay(self) -> int:
+		"""Delay (in msec) after the last TRT change before it's snapshotted"""
+		return self._timer_settle.interval()
+
+	def setSettleDelay(self, delay_msec:int):
+		self._timer_settle.setInterval(max(int(delay_msec), 0))
+
+	def retentionPolicy(self) -> SnapshotRetentionPolicy:
+		return self._retention_policy
+
+	def setRetentionPolicy(self, policy:SnapshotRetentionPolicy):
+		self._retention_policy = policy
+
+	@QtCore.Slot()
+	def scheduleSnapshot(self):
+		"""Something changed; snapshot it once things calm down"""
+
+		if self.isEnabled():
+			self._timer_settle.start()
+
+	@QtCore.Slot()
+	def takeSnapshot(self) -> int|None:
+		"""Save a snapshot now if the contents differ from the latest one.  Returns the new `id_snapshot`, or `None` if skipped"""
+
+		self._timer_settle.stop()
+
+		snapshot_info = self._snapshot_source()
+		if not snapshot_info:
+			return None
+
+		content_hash = SnapshotDatabaseManager.contentHash(
+			snapshot_info["rate"],
+			snapshot_info["adjust_frames"],
+			snapshot_info["duration_frames"],
+			snapshot_info["timeline_info_list"]
+		)
+
+		if content_hash == self.databaseManager().latestContentHash():
+			logging.getLogger(__name__).debug("Skipping automatic snapshot; nothing changed since the last one")
+			return None
+
+		id_snapshot = self.databaseManager().saveLiveToSnapshot(
+			snapshot_name = "Auto " + QtCore.QDateTime.currentDateTime().toString("dd MMM hh:mm AP"),
+			clip_color    = QtGui.QColor(),
+			is_auto       = True,
+			**snapshot_info
+		)
+
+		logging.getLogger(__name__).info("Saved automatic snapshot %s", id_snapshot)
+		self.sig_snapshot_saved.emit(id_snapshot)
+
+		self.compactSnapshots()
+
+		return id_snapshot
+
+	@QtCore.Slot()
+	def compactSnapshots(self):
+		"""Apply the retention policy and vacuum in the background"""
+
+		job = TRTSnapshotCompactionJob(self.database().databaseName(), self.retentionPolicy())
+		job.signals().sig_compaction_complete.connect(self.sig_snapshots_compacted)
+		self._pool.start(job)
@@ -1,7 +1,7 @@
 import timecode
 from .db_hist_sqlite import SnapshotDatabaseManager
 from ...lbb_features.trt.model_trt import TRTViewModel
-from ...lbb_features.trt.hist_snapshot_panel import TRTHistorySnapshotPanel
+from ...lbb_features.trt.hist_snapshot_panel import TRTHistorySnapshotPanel, TRTHistorySnapshotPanelPool, TRTHistorySnapshotSlot
 from ...lbb_features.trt.hist_snapshot_list  import TRTHistorySnapshotLabelDelegate
 from PySide6 import QtCore, QtGui, QtWidgets, QtSql
 
@@ -128,6 +128,20 @@ class SnapshotListProxyModel(QtCore.QIdentityProxyModel):
 		self._live_record.setValue("duration_trimmed_frames", duration.frame_number)
 
 		self.liveRecordUpdated()
+	
+	def setLiveRecordValues(self, duration:timecode.Timecode, rate:int):
+		"""Set the duration and rate of the live record together, updating views once (and only if something changed)"""
+
+		if self._live_record.value("rate") == rate \
+		 and self._live_record.value("duration_trimmed_frames") == duration.frame_number \
+		 and self._live_record.value("duration_trimmed_tc") == str(duration):
+			return
+
+		self._live_record.setValue("rate", rate)
+		self._live_record.setValue("duration_trimmed_tc", str(duration))
+		self._live_record.setValue("duration_trimmed_frames", duration.frame_number)
+
+		self.liveRecordUpdated()
 
 	@QtCore.Slot()
 	def _setLiveRecordDefaults(self):
@@ -157,10 +171,19 @@ class TRTHistoryViewer(QtWidgets.QWidget):
 	sig_is_closing = QtCore.Signal()
 	"""Window is about to close"""
 
+	sig_snapshots_changed = QtCore.Signal()
+	"""Snapshots were saved or deleted from in here"""
+
 	sig_live_trt_changed = QtCore.Signal(timecode.Timecode)
 	sig_live_total_adjust_changed = QtCore.Signal(timecode.Timecode)
 	sig_live_rate_changed = QtCore.Signal(int)
 
+	LIVE_REFRESH_INTERVAL:int = 100
+	"""Minimum time (in msec) between refreshes of the live record and card"""
+
+	DEFAULT_CARD_HEIGHT:int = 240
+	"""Placeholder height for snapshot cards that haven't been built yet"""
+
 
 	def __init__(self, database:QtSql.QSqlDatabase,  *args, **kwargs):
 
@@ -188,13 +211,25 @@ class TRTHistoryViewer(QtWidgets.QWidget):
 		self._snapshot_query_proxy_model = SnapshotListProxyModel()
 		self._snapshot_query_proxy_model.setSourceModel(self._snapshot_query_model)
 
-		self.sig_live_rate_changed.connect(self._snapshot_query_proxy_model.setRate)
-		self.sig_live_trt_changed.connect(self._snapshot_query_proxy_model.setDuration)
+		# Live values can change on every tick of a trim spinner; refresh with the latest ones at most every so often
+		self._timer_live_refresh = QtCore.QTimer(singleShot=True, interval=self.LIVE_REFRESH_INTERVAL)
+		self._timer_live_refresh.timeout.connect(self.refreshLiveRecord)
+		self._pending_live_updates:set[str] = set()
 
 		self._sequence_query_model = QtSql.QSqlQueryModel()
 		self._live_model = TRTViewModel()
 		"""The "Current View" model from the main program"""
 
+		self._live_trt    = timecode.Timecode(0)
+		self._live_adjust = timecode.Timecode(0)
+		self._live_rate   = 24
+
+		self._live_card:TRTHistorySnapshotPanel|None = None
+		"""The one and only card for the "Current" record, built on first use"""
+
+		self._card_slots:list[TRTHistorySnapshotSlot] = []
+		self._card_height = self.DEFAULT_CARD_HEIGHT
+
 		self._status_bar = QtWidgets.QStatusBar()
 		self._status_bar.setSizeGripEnabled(True)
 		self._status_bar.setSizePolicy(self._status_bar.sizePolicy().horizontalPolicy(), QtWidgets.QSizePolicy.Policy.Maximum)
@@ -232,6 +267,11 @@ class TRTHistoryViewer(QtWidgets.QWidget):
 
 		self._snapshots_scroll.setWidget(self._snapshots_parent)
 
+		# Cards are recycled, and only built once they scroll into view
+		self._card_pool = TRTHistorySnapshotPanelPool(self._snapshots_parent, parent=self)
+		self._snapshots_scroll.verticalScrollBar().valueChanged.connect(self.bindVisibleSnapshotCards)
+		self._snapshots_scroll.viewport().installEventFilter(self)
+
 		self._splt_pane.addWidget(self._snapshots_scroll)
 		self._splt_pane.setSizes([185, 200])
 		self._splt_pane.setStretchFactor(0, 0)
@@ -299,48 +339,158 @@ class TRTHistoryViewer(QtWidgets.QWidget):
 
 		self._sequence_query_model.setQuery(query)
 
-		# Clear old panels
-		while self._snapshots_parent.layout().count():
-			self._snapshots_parent.layout().itemAt(0).widget().deleteLater()
-			self._snapshots_parent.layout().itemAt(0).widget().setParent(None)
+		# Return old cards to the pool
+		self._clearSnapshotCards()
 
-		# Load in new panels
+		# Lay out new cards (or room for them)
 		for snapshot in records:
-			history_panel = TRTHistorySnapshotPanel()
-			history_panel.setSnapshotRecord(snapshot)
 
 			if snapshot.field("is_current").value() == 1:
-				history_panel.setModel(self._live_model)
-				
-				history_panel.setTrtFrames(self._live_trt)
-				history_panel.setFinalAdjustmentFrames(self._live_adjust)
-				history_panel.setRate(self._live_rate)
-				
-				history_panel.sig_save_current_requested.connect(self.saveLiveToSnapshot)
-				
-				self.sig_live_trt_changed.connect(history_panel.setTrtFrames)
-				self.sig_live_total_adjust_changed.connect(history_panel.setFinalAdjustmentFrames)
-				self.sig_live_rate_changed.connect(history_panel.setRate)
+				live_card = self.liveSnapshotCard(snapshot)
+				self._snapshots_parent.layout().addWidget(live_card)
+				live_card.show()
+			
 			else:
-				history_panel.setModel(self._sequence_query_model)
-				
-			self._snapshots_parent.layout().addWidget(history_panel)
+				card_slot = TRTHistorySnapshotSlot(snapshot, self._card_height)
+				self._snapshots_parent.layout().addWidget(card_slot)
+				self._card_slots.append(card_slot)
+		
+		# Bind whatever's visible once the layout settles
+		QtCore.QTimer.singleShot(0, self.bindVisibleSnapshotCards)
+	
+	def _clearSnapshotCards(self):
+		"""Release all snapshot cards and remove their slots"""
+
+		for card_slot in self._card_slots:
+
+			card = card_slot.takePanel()
+			if card is not None:
+				self._card_pool.release(card)
+
+			self._snapshots_parent.layout().removeWidget(card_slot)
+			card_slot.deleteLater()
+		
+		self._card_slots = []
+
+		if self._live_card is not None:
+			self._snapshots_parent.layout().removeWidget(self._live_card)
+			self._live_card.hide()
+	
+	@QtCore.Slot()
+	def bindVisibleSnapshotCards(self):
+		"""Bind cards to any slots in (or near) the visible area of the scroll area"""
+
+		viewport = self._snapshots_scroll.viewport()
+
+		# New slots need real geometry before anything can be considered visible
+		# (the scroll area would otherwise catch up to the new layout size later on)
+		self._snapshots_parent.resize(
+			self._snapshots_parent.width(),
+			max(self._snapshots_parent.height(), self._snapshots_parent.layout().minimumSize().height())
+		)
+		self._snapshots_parent.layout().activate()
+
+		# Visible area in the coordinates of the card parent, plus a page either side
+		rect_visible = QtCore.QRect(-self._snapshots_parent.pos(), viewport.size())
+		rect_visible.adjust(0, -viewport.height(), 0, viewport.height())
+
+		did_bind = False
+
+		for card_slot in self._card_slots:
+
+			if card_slot.panel() is not None or not card_slot.geometry().intersects(rect_visible):
+				continue
+
+			card = self._card_pool.acquire()
+			card.setSnapshotRecord(card_slot.snapshotRecord())
+			card.setModel(self._sequence_query_model)
+			card_slot.setPanel(card)
+
+			# Better guess for the slots still waiting
+			self._card_height = max(card.sizeHint().height(), 1)
+			did_bind = True
+		
+		# Binding changes the layout, so check again once it settles
+		if did_bind:
+			QtCore.QTimer.singleShot(0, self.bindVisibleSnapshotCards)
 	
+	def liveSnapshotCard(self, snapshot_record:QtSql.QSqlRecord) -> TRTHistorySnapshotPanel:
+		"""The card for the "Current" record, connected to the live signals once"""
+
+		if self._live_card is None:
+
+			self._live_card = TRTHistorySnapshotPanel(self._snapshots_parent)
+			self._live_card.setSnapshotRecord(snapshot_record)
+			self._live_card.setModel(self._live_model)
+			
+			self._live_card.setTrtFrames(self._live_trt)
+			self._live_card.setFinalAdjustmentFrames(self._live_adjust)
+			self._live_card.setRate(self._live_rate)
+
+			self._live_card.sig_save_current_requested.connect(self.saveLiveToSnapshot)
+
+			self.sig_live_trt_changed.connect(self._live_card.setTrtFrames)
+			self.sig_live_total_adjust_changed.connect(self._live_card.setFinalAdjustmentFrames)
+			self.sig_live_rate_changed.connect(self._live_card.setRate)
+		
+		else:
+			self._live_card.setSnapshotRecord(snapshot_record)
+		
+		return self._live_card
+	
+	def eventFilter(self, watched:QtCore.QObject, event:QtCore.QEvent) -> bool:
+		"""Bind newly-visible cards when the scroll area is resized"""
+
+		if watched is self._snapshots_scroll.viewport() and event.type() == QtCore.QEvent.Type.Resize:
+			QtCore.QTimer.singleShot(0, self.bindVisibleSnapshotCards)
+		
+		return super().eventFilter(watched, event)
+		
 	def setLiveModel(self, datamodel:TRTViewModel):
 		"""Set the "Current sequences" model from the main program"""
 		self._live_model = datamodel
+
+		if self._live_card is not None:
+			self._live_card.setModel(self._live_model)
 	
+	@QtCore.Slot(int)
 	def setLiveRate(self, rate:int):
 		self._live_rate = rate
-		self.sig_live_rate_changed.emit(self._live_rate)
+		self._scheduleLiveRefresh("rate")
 
+	@QtCore.Slot(timecode.Timecode)
 	def setLiveTotalAdjustment(self, adjustment:timecode.Timecode):
 		self._live_adjust = adjustment
-		self.sig_live_total_adjust_changed.emit(self._live_adjust)
+		self._scheduleLiveRefresh("adjust")
 	
+	@QtCore.Slot(timecode.Timecode)
 	def setLiveRuntime(self, trt:timecode.Timecode):
 		self._live_trt = trt
-		self.sig_live_trt_changed.emit(self._live_trt)
+		self._scheduleLiveRefresh("trt")
+	
+	def _scheduleLiveRefresh(self, live_value:str):
+		"""Note a changed live value, and refresh once the current interval is up"""
+
+		self._pending_live_updates.add(live_value)
+
+		if not self._timer_live_refresh.isActive():
+			self._timer_live_refresh.start()
+	
+	@QtCore.Slot()
+	def refreshLiveRecord(self):
+		"""Push the latest live values out to the live record and card"""
+
+		pending, self._pending_live_updates = self._pending_live_updates, set()
+
+		if "rate" in pending or "trt" in pending:
+			self._snapshot_query_proxy_model.setLiveRecordValues(self._live_trt, self._live_rate)
+		
+		if "rate" in pending:
+			self.sig_live_rate_changed.emit(self._live_rate)
+		if "trt" in pending:
+			self.sig_live_trt_changed.emit(self._live_trt)
+		if "adjust" in pending:
+			self.sig_live_total_adjust_changed.emit(self._live_adjust)
 
 	def saveLiveToSnapshot(self, snapshot_name:str, clip_color:QtGui.QColor, rate:int, adjust_frames:int, duration_frames:int, timeline_info_list:list):
 
@@ -353,6 +503,7 @@ class TRTHistoryViewer(QtWidgets.QWidget):
 		)
 
 		self.updateModelQueries()
+		self.sig_snapshots_changed.emit()
 
 		for row in range(self._lst_saved.model().rowCount()):
 			if self._lst_saved.model().record(row).field("id_snapshot").value() == id_snapsphot_new:
@@ -395,4 +546,5 @@ class TRTHistoryViewer(QtWidgets.QWidget):
 		self._db.deleteSnapshotRecords(records)
 
 		self.updateModelQueries()
+		self.sig_snapshots_changed.emit()
 		self.updateSnapshotCard([])
@@ -1,5 +1,5 @@
 from PySide6 import QtCore, QtGui, QtWidgets
-from ...lbb_common.paint_delegates import LBClipColorPainter
+from ...lbb_common.paint_delegates import LBCachedClipColorPainter
 
 class TRTHistorySnapshotLabelDelegate(QtWidgets.QStyledItemDelegate):
 
@@ -34,7 +34,7 @@ class TRTHistorySnapshotLabelDelegate(QtWidgets.QStyledItemDelegate):
 
 		rect_clip_color = QtCore.QRectF(0,0, 16, 16)
 		rect_clip_color.moveCenter(QtCore.QPointF(12, rect.center().y()))
-		LBClipColorPainter(rect=rect_clip_color, painter=painter, clip_color=clip_color)
+		LBCachedClipColorPainter(rect=rect_clip_color, painter=painter, clip_color=clip_color)
 		#self.drawClipColor()
 
 		font = painter.font()
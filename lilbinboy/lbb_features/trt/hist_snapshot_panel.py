@@ -1,7 +1,7 @@
 import abc
 import timecode
 from ...lbb_common import LBClipColorPicker
-from ...lbb_common.paint_delegates import LBClipColorPainter
+from ...lbb_common.paint_delegates import LBCachedClipColorPainter, LBClipColorPixmap
 from ...lbb_features.trt import wdg_stats
 from PySide6 import QtSql, QtCore, QtGui, QtWidgets
 
@@ -25,7 +25,7 @@ class SnapshotClipColorDelegate(QtWidgets.QStyledItemDelegate):
 		else:
 			clip_color = QtGui.QColor()
 		
-		LBClipColorPainter(rect_clip_color, painter, clip_color=clip_color)
+		LBCachedClipColorPainter(rect_clip_color, painter, clip_color=clip_color)
 	
 	def sizeHint(self, option:QtWidgets.QStyleOption, index:QtCore.QModelIndex) -> QtCore.QSize:
 		min_size = min_size = min(option.rect.width(), option.rect.height())
@@ -201,11 +201,19 @@ class TRTHistorySnapshotPanel(QtWidgets.QFrame):
 		self._stack_header.addWidget(wdg_header_editor)
 
 
+		# Proxy models for either kind of snapshot, swapped in by setSnapshotRecord()
+		self._proxy_live     = TRTHistorySnapshotLiveProxyModel(self)
+		self._proxy_database = TRTHistorySnapshotDatabaseProxyModel(self)
+
+		# Listen for updates to the live view
+		self._proxy_live.rowsInserted.connect(self.updateTreeSizes)
+
 		self._tree_sequences    = QtWidgets.QTreeView()
-		self._tree_sequences.setModel(TRTHistorySnapshotDatabaseProxyModel())
+		self._tree_sequences.setModel(self._proxy_database)
 		self._tree_sequences.setUniformRowHeights(True)
 		self._tree_sequences.setAlternatingRowColors(True)
 		self._tree_sequences.setIndentation(0)
+		self._tree_sequences.setItemDelegateForColumn(0, SnapshotClipColorDelegate(self))
 
 		
 		self._clip_color_picker = LBClipColorPicker()
@@ -246,13 +254,11 @@ class TRTHistorySnapshotPanel(QtWidgets.QFrame):
 
 	def setModel(self, model:QtCore.QAbstractItemModel):
 
-		self._tree_sequences.model().setSourceModel(model)
+		# Re-bound panels are often handed the same source model again
+		if self._tree_sequences.model().sourceModel() is not model:
+			self._tree_sequences.model().setSourceModel(model)
 		
 		self.updateTreeSizes()
-		
-		# Listen for updates if this is a live view
-		if isinstance(self._tree_sequences.model(), TRTHistorySnapshotLiveProxyModel):
-			self._tree_sequences.model().rowsInserted.connect(self.updateTreeSizes)
 	
 	@QtCore.Slot()
 	def updateTreeSizes(self):
@@ -273,13 +279,9 @@ class TRTHistorySnapshotPanel(QtWidgets.QFrame):
 
 		icon_color = QtGui.QIcon()
 
-		# Draw for std/hi dpi
-		for s in [16, 32]:
-			pix_color = QtGui.QPixmap(QtCore.QSize(s,s))
-			pix_color.fill(QtCore.Qt.GlobalColor.transparent)
-			scale_factor = s/16
-			LBClipColorPainter(pix_color.rect(), QtGui.QPainter(pix_color), clip_color=self._color_clip, padding=QtCore.QSize(scale_factor * 3, scale_factor * 3), pen_width=scale_factor*1, shadow_offset=QtCore.QPoint(1*scale_factor, 1*scale_factor))
-			icon_color.addPixmap(pix_color)
+		# Draw for std/hi dpi (cached, since hovering the picker calls this a lot)
+		for device_pixel_ratio in [1.0, 2.0]:
+			icon_color.addPixmap(LBClipColorPixmap(QtCore.QSize(16,16), device_pixel_ratio, clip_color=self._color_clip))
 
 		self._btn_clip_color.setIcon(icon_color)
 		self._lbl_clip_color.setPixmap(icon_color.pixmap(16,16))
@@ -323,10 +325,17 @@ class TRTHistorySnapshotPanel(QtWidgets.QFrame):
 		if snapshot_record.field("is_current").value() == 1:
 			self._stack_header.setCurrentIndex(1)
 			self._txt_snapshot_name.setPlaceholderText("Current")
-			self._tree_sequences.setModel(TRTHistorySnapshotLiveProxyModel())
+			
+			if self._tree_sequences.model() is not self._proxy_live:
+				self._tree_sequences.setModel(self._proxy_live)
 		
 		else:
 
+			self._stack_header.setCurrentIndex(0)
+
+			if self._tree_sequences.model() is not self._proxy_database:
+				self._tree_sequences.setModel(self._proxy_database)
+
 			self._lbl_snapshot_name.setText(
 				snapshot_record.field("label_name").value()
 			)
@@ -355,8 +364,6 @@ class TRTHistorySnapshotPanel(QtWidgets.QFrame):
 				snapshot_record.field("rate").value()
 			)
 
-		self._tree_sequences.setItemDelegateForColumn(0, SnapshotClipColorDelegate())
-
 		if snapshot_record.field("label_color").isNull():
 			clip_color = QtGui.QColor(None)
 		else:
@@ -372,4 +379,80 @@ class TRTHistorySnapshotPanel(QtWidgets.QFrame):
 		label_color = self._color_clip
 		sequences = exporters_trt.exportToSnapshot(self._tree_sequences.model())
 		
-		self.sig_save_current_requested.emit(label_text, label_color, self._rate, self._final_adjust_frames, self._trt_frames, sequences)
\ No newline at end of file
+		self.sig_save_current_requested.emit(label_text, label_color, self._rate, self._final_adjust_frames, self._trt_frames, sequences)
+
+
+class TRTHistorySnapshotPanelPool(QtCore.QObject):
+	"""Keeps idle snapshot panels around to be re-bound to other snapshot records"""
+
+	MAX_IDLE_PANELS:int = 16
+	"""Idle panels beyond this are deleted rather than kept"""
+
+	def __init__(self, parent_widget:QtWidgets.QWidget, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+
+		self._parent_widget = parent_widget
+		self._idle_panels:list[TRTHistorySnapshotPanel] = []
+
+	def acquire(self) -> TRTHistorySnapshotPanel:
+		"""Get an idle panel, or make a new one"""
+
+		if self._idle_panels:
+			return self._idle_panels.pop()
+
+		return TRTHistorySnapshotPanel(self._parent_widget)
+
+	def release(self, panel:TRTHistorySnapshotPanel):
+		"""Return a panel to the pool once it's out of use"""
+
+		panel.hide()
+
+		if len(self._idle_panels) >= self.MAX_IDLE_PANELS:
+			panel.deleteLater()
+			return
+
+		# Take it back from whatever layout was using it
+		panel.setParent(self._parent_widget)
+		self._idle_panels.append(panel)
+
+	def idleCount(self) -> int:
+		return len(self._idle_panels)
+
+
+class TRTHistorySnapshotSlot(QtWidgets.QWidget):
+	"""Reserves space for a snapshot panel until it scrolls into view"""
+
+	def __init__(self, snapshot_record:QtSql.QSqlRecord, placeholder_height:int, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+
+		self._snapshot_record = snapshot_record
+		self._panel:TRTHistorySnapshotPanel|None = None
+
+		self.setLayout(QtWidgets.QVBoxLayout())
+		self.layout().setContentsMargins(0,0,0,0)
+		self.setMinimumHeight(placeholder_height)
+
+	def snapshotRecord(self) -> QtSql.QSqlRecord:
+		return self._snapshot_record
+
+	def panel(self) -> TRTHistorySnapshotPanel|None:
+		"""The panel in this slot, if it's been bound yet"""
+		return self._panel
+
+	def setPanel(self, panel:TRTHistorySnapshotPanel):
+		"""Put a bound panel in this slot"""
+
+		self._panel = panel
+		self.layout().addWidget(panel)
+		self.setMinimumHeight(0)
+		panel.show()
+
+	def takePanel(self) -> TRTHistorySnapshotPanel|None:
+		"""Remove the panel from this slot, if there is one"""
+
+		panel, self._panel = self._panel, None
+
+		if panel is not None:
+			self.layout().removeWidget(panel)
+
+		return panel
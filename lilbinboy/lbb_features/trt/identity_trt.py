@@ -0,0 +1,211 @@
+"""
+One bin, many paths: a symlinked project folder, the same share mounted as `/Volumes/X` here
+and `/mnt/x` there, `Reel 1.avb` versus `REEL 1.AVB` on a case-insensitive share.  Bins are
+known by who they are rather than how they were found, so each is only read (and counted) once.
+
+The first path a bin turns up under is its canonical path, and the one everything else goes by.
+Avid saves a bin by writing a new file over the old one, and inodes get reused, so what's known
+about a path only holds for as long as it's still the same file.
+"""
+
+import hashlib, logging, os, threading, typing
+
+FINGERPRINT_CHUNK_SIZE:int = 64 * 1024
+"""Bytes from each end of a bin to fingerprint it by"""
+
+FileId = tuple[int, int]
+"""Device and inode of a file"""
+
+def normalized_path(bin_path:str) -> str:
+	"""Absolute path with symlinks resolved (and case folded, where the OS doesn't care about case)"""
+	return os.path.normcase(os.path.realpath(bin_path))
+
+def bin_file_id(bin_stat:os.stat_result) -> FileId|None:
+	"""Device and inode, if the filesystem has any to give"""
+	return (bin_stat.st_dev, bin_stat.st_ino) if bin_stat.st_ino else None
+
+def bin_fingerprint(bin_path:str, bin_size:int) -> str:
+	"""Content fingerprint from the size and both ends of a bin, which is plenty to tell bins apart"""
+
+	fingerprint = hashlib.sha1(str(bin_size).encode("utf-8"))
+
+	with open(bin_path, "rb") as bin_file:
+		fingerprint.update(bin_file.read(FINGERPRINT_CHUNK_SIZE))
+		if bin_size > FINGERPRINT_CHUNK_SIZE:
+			bin_file.seek(max(FINGERPRINT_CHUNK_SIZE, bin_size - FINGERPRINT_CHUNK_SIZE))
+			fingerprint.update(bin_file.read(FINGERPRINT_CHUNK_SIZE))
+
+	return fingerprint.hexdigest()
+
+
+class BinIdentityRegistry:
+	"""
+	Works out which paths are the same bin.  Device and inode settle it where they can; otherwise
+	(no inodes, or another mount of the same share) a bin with the same name and size is compared
+	by content fingerprint.  Safe to share between threads.
+	"""
+
+	def __init__(self):
+
+		self._lock = threading.Lock()
+
+		self._canonical_by_path:dict[str, tuple[str, FileId|None]] = {}
+		"""Canonical path, and the device and inode the path had then, by normalized path"""
+
+		self._canonical_by_file_id:dict[FileId, tuple[str, str]] = {}
+		"""Canonical path, and the path the file was seen at, by device and inode"""
+
+		self._file_ids:dict[str, FileId|None] = {}
+		"""Device and inode each canonical path had when it was identified"""
+
+		self._candidates_by_name:dict[tuple[str, int], list[tuple[str, FileId|None]]] = {}
+		"""Canonical paths and file IDs of bins, by casefolded name and size, for spotting them on other mounts"""
+
+		self._fingerprints:dict[str, str] = {}
+		"""Content fingerprints worked out so far, by canonical path"""
+
+	def canonicalPath(self, bin_path:str) -> str:
+		"""The path this bin is known by: the first one it was seen at"""
+
+		bin_key = normalized_path(bin_path)
+
+		with self._lock:
+
+			if bin_key in self._canonical_by_path:
+
+				canonical_path, file_id = self._canonical_by_path[bin_key]
+
+				if self._isUnchanged(bin_path, file_id) and self._isCurrent(canonical_path):
+					return canonical_path
+
+				self._refresh(canonical_path)
+
+			if bin_key in self._canonical_by_path:
+				canonical_path = self._canonical_by_path[bin_key][0]
+			else:
+				canonical_path = self._remember(bin_path)
+
+		if canonical_path != bin_path:
+			logging.getLogger(__name__).debug("%s is the same bin as %s", bin_path, canonical_path)
+
+		return canonical_path
+
+	@staticmethod
+	def _isUnchanged(bin_path:str, file_id:FileId|None) -> bool:
+		"""Whether a path is still the file it was (as far as can be told without inodes)"""
+
+		try:
+			return bin_file_id(os.stat(bin_path)) == file_id
+		except OSError:
+			return False
+
+	def _isCurrent(self, canonical_path:str) -> bool:
+		"""Whether a canonical path is still the bin it was identified as"""
+		return canonical_path in self._file_ids and self._isUnchanged(canonical_path, self._file_ids[canonical_path])
+
+	def _remember(self, bin_path:str) -> str:
+		"""Identify a path and keep it for next time"""
+
+		canonical_path, file_id = self._identify(bin_path)
+		self._canonical_by_path[normalized_path(bin_path)] = (canonical_path, file_id)
+
+		return canonical_path
+
+	def _refresh(self, canonical_path:str):
+		"""
+		Something about a bin isn't what it was: forget everything about it and take a fresh look,
+		starting with its canonical path so that it keeps going by that if it can
+		"""
+
+		logging.getLogger(__name__).debug("%s has changed since it was identified; taking another look", canonical_path)
+
+		self._canonical_by_path    = {k: v for k, v in self._canonical_by_path.items() if v[0] != canonical_path}
+		self._canonical_by_file_id = {k: v for k, v in self._canonical_by_file_id.items() if v[0] != canonical_path}
+
+		for candidates in self._candidates_by_name.values():
+			candidates[:] = [c for c in candidates if c[0] != canonical_path]
+
+		self._fingerprints.pop(canonical_path, None)
+		self._file_ids.pop(canonical_path, None)
+
+		self._remember(canonical_path)
+
+	def _identify(self, bin_path:str) -> tuple[str, FileId|None]:
+		"""Match a newly-seen path to a known bin, or make it a new one, along with the path's device and inode"""
+
+		try:
+			bin_stat = os.stat(bin_path)
+		except OSError:
+			# Not there (yet); it'll just have to be itself
+			return bin_path, None
+
+		file_id  = bin_file_id(bin_stat)
+		name_key = (os.path.basename(bin_path).casefold(), bin_stat.st_size)
+
+		if file_id in self._canonical_by_file_id:
+
+			canonical_path, seen_path = self._canonical_by_file_id[file_id]
+
+			# The inode may since have gone to another file altogether
+			if self._isUnchanged(seen_path, file_id) and self._isCurrent(canonical_path):
+				return canonical_path, file_id
+
+			self._refresh(canonical_path)
+
+			if file_id in self._canonical_by_file_id:
+				return self._canonical_by_file_id[file_id][0], file_id
+
+		canonical_path = self._matchByFingerprint(bin_path, file_id, name_key) or bin_path
+
+		if file_id is not None:
+			self._canonical_by_file_id[file_id] = (canonical_path, bin_path)
+
+		if canonical_path == bin_path:
+			self._candidates_by_name.setdefault(name_key, []).append((bin_path, file_id))
+			self._file_ids[bin_path] = file_id
+
+		return canonical_path, file_id
+
+	def _matchByFingerprint(self, bin_path:str, file_id:FileId|None, name_key:tuple[str, int]) -> str|None:
+		"""Known bin with the same name, size and content, that could be this one from another mount"""
+
+		fingerprint = None
+
+		# Fingerprints of bins that have since been saved over are no good to anybody
+		for candidate_path in [c[0] for c in self._candidates_by_name.get(name_key, []) if not self._isCurrent(c[0])]:
+			self._refresh(candidate_path)
+
+		for candidate_path, candidate_file_id in self._candidates_by_name.get(name_key, []):
+
+			# Two inodes on the same device are two files, however alike
+			if file_id and candidate_file_id and file_id[0] == candidate_file_id[0]:
+				continue
+
+			try:
+				if candidate_path not in self._fingerprints:
+					self._fingerprints[candidate_path] = bin_fingerprint(candidate_path, name_key[1])
+				fingerprint = fingerprint or bin_fingerprint(bin_path, name_key[1])
+				if fingerprint == self._fingerprints[candidate_path]:
+					return candidate_path
+			except OSError as e:
+				logging.getLogger(__name__).debug("Couldn't fingerprint %s against %s: %s", bin_path, candidate_path, e)
+
+		return None
+
+
+def iter_unique_bin_paths(bin_paths:typing.Iterable[str], registry:BinIdentityRegistry|None=None, known_bin_paths:typing.Iterable[str]=()) -> typing.Iterator[str]:
+	"""Canonical paths of the given bins, each bin only the once, and skipping any that are already `known_bin_paths`"""
+
+	registry = registry or BinIdentityRegistry()
+	seen_bin_paths = set(registry.canonicalPath(p) for p in known_bin_paths)
+
+	for bin_path in bin_paths:
+
+		canonical_path = registry.canonicalPath(bin_path)
+
+		if canonical_path in seen_bin_paths:
+			logging.getLogger(__name__).debug("Skipping %s; already have it as %s", bin_path, canonical_path)
+			continue
+
+		seen_bin_paths.add(canonical_path)
+		yield canonical_path
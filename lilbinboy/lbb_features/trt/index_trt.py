@@ -0,0 +1,190 @@
+"""
+Sidecar `.lbbidx` index files: a bin's parsed sequences, saved next to the bin (or in a
+shared cache folder) so the next person to open it doesn't have to parse it all over again.
+
+An index is only trusted when its stamp still matches the bin: same size and modified time,
+or failing that (say, the bin was copied), the same size and content hash.
+"""
+
+import dataclasses, datetime, functools, hashlib, io, logging, os, pathlib, pickle, socket, threading, typing
+import avbutils, timecode
+from . import identity_trt
+
+if typing.TYPE_CHECKING:
+	from .logic_trt import TimelineInfo
+
+INDEX_SUFFIX = ".lbbidx"
+
+INDEX_VERSION:int = 1
+"""Bump this when `TimelineInfo` changes shape, to toss out old indexes"""
+
+HASH_CHUNK_SIZE:int = 1024 * 1024
+
+BinStamp = tuple[int, int]
+"""File size and modified time (ns) of a bin, to tell if it's changed"""
+
+def bin_stamp(bin_path:str) -> BinStamp|None:
+	"""Get the current stamp for a bin, or `None` if it's gone missing"""
+
+	try:
+		stat = os.stat(bin_path)
+	except OSError:
+		return None
+
+	return (stat.st_size, stat.st_mtime_ns)
+
+def bin_hash(bin_path:str) -> str:
+	"""Content hash of a bin"""
+
+	content_hash = hashlib.sha1()
+
+	with open(bin_path, "rb") as bin_file:
+		while chunk := bin_file.read(HASH_CHUNK_SIZE):
+			content_hash.update(chunk)
+
+	return content_hash.hexdigest()
+
+
+@dataclasses.dataclass(frozen=True)
+class BinIndexOptions:
+	"""Whether (and where) to use sidecar indexes.  Picklable, so it can ride along to worker processes."""
+
+	read:bool = True
+	"""Use an index instead of parsing the bin, if it's still good"""
+
+	write:bool = False
+	"""Write an index after parsing a bin"""
+
+	cache_dir:str|None = None
+	"""Shared folder for indexes, or `None` to keep them next to the bins"""
+
+	def indexPath(self, bin_path:str) -> pathlib.Path:
+		"""Where the index for a given bin lives"""
+
+		if not self.cache_dir:
+			return pathlib.Path(bin_path).with_suffix(INDEX_SUFFIX)
+
+		# Flattened into one folder, so keyed by the full path (symlinks resolved; inodes don't travel between machines)
+		path_key = hashlib.sha1(identity_trt.normalized_path(bin_path).encode("utf-8")).hexdigest()[:16]
+		return pathlib.Path(self.cache_dir, f"{pathlib.Path(bin_path).stem}.{path_key}{INDEX_SUFFIX}")
+
+DEFAULT_INDEX_OPTIONS = BinIndexOptions()
+"""Read indexes next to bins, but don't write any"""
+
+
+@functools.cache
+def _index_globals() -> frozenset[tuple[str, str]]:
+	"""The classes a `TimelineInfo` is made of, as `(module, qualname)` the way pickle names them"""
+
+	from .logic_trt import TimelineInfo
+
+	index_classes = (
+		TimelineInfo,
+		timecode.Timecode, timecode.TimecodeRange,
+		avbutils.ClipColor, avbutils.MarkerInfo, avbutils.MarkerColors,
+		datetime.datetime, datetime.timezone, datetime.timedelta,
+		set, frozenset, object,
+	)
+
+	return frozenset((c.__module__, c.__qualname__) for c in index_classes) | {("copyreg", "_reconstructor")}
+
+class BinIndexUnpickler(pickle.Unpickler):
+	"""
+	Indexes come from shared storage, so only let them make the things a `TimelineInfo` is made of:
+	those exact classes, and nothing reached through them (`logic_trt.os.system`, say)
+	"""
+
+	def find_class(self, module:str, name:str):
+
+		if "." not in name and (module, name) in _index_globals():
+			return super().find_class(module, name)
+
+		raise pickle.UnpicklingError(f"{module}.{name} isn't allowed in a bin index")
+
+
+def read_index(bin_path:str, options:BinIndexOptions=DEFAULT_INDEX_OPTIONS) -> list["TimelineInfo"]|None:
+	"""
+	Timelines from a bin's index, if there is one and it still matches the bin.
+	They come back without `bin_path` or `bin_lock` set; that's on the caller.
+	"""
+
+	index_path = options.indexPath(bin_path)
+
+	try:
+		with open(index_path, "rb") as index_file:
+			index_data = BinIndexUnpickler(io.BytesIO(index_file.read())).load()
+	except FileNotFoundError:
+		return None
+	except Exception as e:
+		logging.getLogger(__name__).debug("Ignoring unreadable index %s: %s", index_path, e)
+		return None
+
+	if not isinstance(index_data, dict) or index_data.get("version") != INDEX_VERSION:
+		logging.getLogger(__name__).debug("Ignoring index %s from a different version", index_path)
+		return None
+
+	current_stamp = bin_stamp(bin_path)
+
+	if current_stamp is None or current_stamp[0] != index_data.get("bin_size"):
+		return None
+
+	# Modified times don't always survive copies (or different file servers), so fall back to the hash
+	if current_stamp[1] != index_data.get("bin_mtime_ns"):
+		try:
+			if bin_hash(bin_path) != index_data.get("bin_hash"):
+				return None
+		except OSError:
+			return None
+
+	logging.getLogger(__name__).debug("Using index %s for %s", index_path, bin_path)
+	return list(index_data.get("timelines", []))
+
+def write_index(bin_path:str, timelines:typing.Iterable["TimelineInfo"], stamp:BinStamp|None, options:BinIndexOptions=DEFAULT_INDEX_OPTIONS, content_hash:str|None=None) -> bool:
+	"""
+	Write an index for a bin, given the stamp it had before it was parsed (and its hash, if that's
+	handy).  Nothing is written if the bin has changed since (it'd be wrong) or the location isn't
+	writable (that's fine).
+	"""
+
+	if stamp is None:
+		return False
+
+	try:
+		content_hash = content_hash or bin_hash(bin_path)
+	except OSError as e:
+		logging.getLogger(__name__).debug("Not indexing %s: %s", bin_path, e)
+		return False
+
+	# Changed during the parse or the hash; the next reader gets to do it themselves
+	if bin_stamp(bin_path) != stamp:
+		logging.getLogger(__name__).debug("Not indexing %s; it changed while being read", bin_path)
+		return False
+
+	index_data = {
+		"version":      INDEX_VERSION,
+		"bin_name":     pathlib.Path(bin_path).name,
+		"bin_size":     stamp[0],
+		"bin_mtime_ns": stamp[1],
+		"bin_hash":     content_hash,
+		"indexed_by":   socket.gethostname(),
+		"timelines":    [dataclasses.replace(t, bin_path="", bin_lock=None) for t in timelines],
+	}
+
+	index_path = options.indexPath(bin_path)
+	temp_path  = index_path.with_name(f".{index_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+	try:
+		index_path.parent.mkdir(parents=True, exist_ok=True)
+		with open(temp_path, "wb") as index_file:
+			pickle.dump(index_data, index_file, protocol=pickle.HIGHEST_PROTOCOL)
+		os.replace(temp_path, index_path)
+
+	except (OSError, pickle.PicklingError) as e:
+		logging.getLogger(__name__).debug("Couldn't write index %s: %s", index_path, e)
+		try:
+			os.unlink(temp_path)
+		except OSError:
+			pass
+		return False
+
+	return True
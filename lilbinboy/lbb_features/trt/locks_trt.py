@@ -0,0 +1,111 @@
+"""
+Bin locks (`.lck` files) come and go far more often than bins change, so they're looked
+up on their own: a folder at a time, and only re-read when the lock file itself changes.
+"""
+
+import collections, logging, os, pathlib, typing
+import avbutils
+
+LOCK_SUFFIX = ".lck"
+
+LockStamp = tuple[int, int]
+"""File size and modified time (ns) of a lock file"""
+
+def lock_path_for_bin(bin_path:str) -> str:
+	"""Where a bin's lock file would be"""
+	return str(pathlib.Path(bin_path).with_suffix(LOCK_SUFFIX))
+
+def read_bin_lock(bin_path:str) -> avbutils.LockInfo|None:
+	"""Lock info for a single bin, or `None` if it isn't locked"""
+
+	try:
+		return avbutils.LockInfo.from_lockfile(lock_path_for_bin(bin_path))
+	except FileNotFoundError:
+		return None
+	except Exception as e:
+		logging.getLogger(__name__).debug("Couldn't read lock for %s: %s", bin_path, e)
+		return None
+
+
+class BinLockScanner:
+	"""
+	Looks up the locks on lots of bins at once: one `scandir` per folder, and lock files
+	are only parsed again once their stamp changes.
+	"""
+
+	def __init__(self):
+		self._lock_cache:dict[str, tuple[LockStamp, avbutils.LockInfo|None]] = {}
+		"""Parsed lock files by path, along with the stamp they had at the time"""
+
+	def scan(self, bin_paths:typing.Iterable[str]) -> dict[str, avbutils.LockInfo|None]:
+		"""Current lock info for each bin (`None` for the unlocked ones)"""
+
+		bins_by_dir:dict[str, list[str]] = collections.defaultdict(list)
+		for bin_path in bin_paths:
+			bins_by_dir[os.path.dirname(bin_path)].append(bin_path)
+
+		bin_locks:dict[str, avbutils.LockInfo|None] = {}
+		lock_paths_seen:set[str] = set()
+
+		for dir_path, dir_bin_paths in bins_by_dir.items():
+
+			lock_entries = self._lockEntries(dir_path)
+
+			for bin_path in dir_bin_paths:
+
+				lock_name = pathlib.Path(bin_path).with_suffix(LOCK_SUFFIX).name
+				lock_entry = lock_entries.get(lock_name) or lock_entries.get(lock_name.casefold())
+
+				if lock_entry is None:
+					bin_locks[bin_path] = None
+					continue
+
+				lock_paths_seen.add(lock_entry.path)
+				bin_locks[bin_path] = self._lockInfo(lock_entry)
+
+		# Forget about locks that have since been released
+		self._lock_cache = {p: cached for p, cached in self._lock_cache.items() if p in lock_paths_seen}
+
+		return bin_locks
+
+	def _lockEntries(self, dir_path:str) -> dict[str, os.DirEntry]:
+		"""Lock files in a folder, by name (and by casefolded name, for case-insensitive shares)"""
+
+		lock_entries = {}
+
+		try:
+			with os.scandir(dir_path or ".") as dir_entries:
+				for dir_entry in dir_entries:
+					if dir_entry.name.casefold().endswith(LOCK_SUFFIX):
+						lock_entries[dir_entry.name] = dir_entry
+						lock_entries.setdefault(dir_entry.name.casefold(), dir_entry)
+		except OSError as e:
+			logging.getLogger(__name__).debug("Couldn't look for locks in %s: %s", dir_path, e)
+
+		return lock_entries
+
+	def _lockInfo(self, lock_entry:os.DirEntry) -> avbutils.LockInfo|None:
+		"""Lock info from a lock file, from the cache if it hasn't changed"""
+
+		try:
+			lock_stat = lock_entry.stat()
+		except OSError:
+			# Released between the scandir and now
+			return None
+
+		lock_stamp = (lock_stat.st_size, lock_stat.st_mtime_ns)
+
+		cached = self._lock_cache.get(lock_entry.path)
+		if cached is not None and cached[0] == lock_stamp:
+			return cached[1]
+
+		try:
+			lock_info = avbutils.LockInfo.from_lockfile(lock_entry.path)
+		except FileNotFoundError:
+			return None
+		except Exception as e:
+			logging.getLogger(__name__).debug("Couldn't read lock %s: %s", lock_entry.path, e)
+			return None
+
+		self._lock_cache[lock_entry.path] = (lock_stamp, lock_info)
+		return lock_info
@@ -1,6 +1,8 @@
-import pathlib, datetime, dataclasses
+import pathlib, contextlib, datetime, dataclasses, enum, hashlib, heapq, io, logging, mmap, os, queue, struct, time, typing
+from concurrent import futures
 import avb, avbutils
 from timecode import TimecodeRange
+from . import executors_trt, index_trt, locks_trt, progress_trt
 
 @dataclasses.dataclass(frozen=True)
 class TimelineInfo:
@@ -30,36 +32,491 @@ class TimelineInfo:
 	bin_lock:avbutils.LockInfo|None
 	"""Bin lock info if available"""
 
-def get_timelines_from_bin(bin_path:str) -> list[TimelineInfo]:
-	"""Given a Avid bin's file path, parse the bin and get sequence info"""
+class BinBusyError(Exception):
+	"""A bin looks to have been caught mid-save: it changed while it was being read, or was only just written and wouldn't parse"""
+
+	def __init__(self, bin_path:str, reason:str):
+		# Both in `args`, so it makes it back from a worker process in one piece
+		super().__init__(bin_path, reason)
+		self.bin_path = bin_path
+		self.reason = reason
+
+	def __str__(self) -> str:
+		return f"{self.reason}: {self.bin_path}"
+
+TRANSIENT_PARSE_ERRORS:tuple[type[Exception],...] = (AssertionError, ValueError, EOFError, IndexError, struct.error, OSError)
+"""Errors from reading a half-written bin (or one Windows won't share just now)"""
+
+RECENT_SAVE_WINDOW:float = 10.0
+"""Seconds since a bin was modified for a failed parse to be blamed on a save in progress"""
+
+class BinReadMode(enum.Enum):
+	"""How bin files are read for parsing"""
+
+	AUTO   = "auto"
+	"""Buffer it, unless it's huge"""
+
+	STREAM = "stream"
+	"""Let `avb` seek and read as it goes: lots of little reads, each one a round trip on a file server"""
+
+	BUFFER = "buffer"
+	"""Read the whole file in one go, and parse it from memory"""
+
+	MMAP   = "mmap"
+	"""Memory-map the file.  Best kept to local disks."""
+
+BUFFER_MAX_SIZE:int = 512 * 1024 * 1024
+"""Bins bigger than this are streamed in `BinReadMode.AUTO`"""
+
+class MappedBinFile(io.RawIOBase):
+	"""Just enough of a file for `avb` to read from, over an `mmap`"""
+
+	def __init__(self, bin_path:str):
+		super().__init__()
+		with open(bin_path, "rb") as bin_file:
+			self._mapped = mmap.mmap(bin_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+	def mapped(self) -> mmap.mmap:
+		return self._mapped
+
+	def readable(self) -> bool:
+		return True
+
+	def seekable(self) -> bool:
+		return True
+
+	def readinto(self, buffer) -> int:
+		data = self._mapped.read(len(buffer))
+		buffer[:len(data)] = data
+		return len(data)
+
+	def read(self, size:int=-1) -> bytes:
+		return self._mapped.read(None if size is None or size < 0 else size)
+
+	def seek(self, offset:int, whence:int=io.SEEK_SET) -> int:
+		self._mapped.seek(offset, whence)
+		return self._mapped.tell()
+
+	def tell(self) -> int:
+		return self._mapped.tell()
+
+	def close(self):
+		if not self.closed:
+			self._mapped.close()
+		super().close()
+
+def open_bin_source(bin_path:str, read_mode:BinReadMode=BinReadMode.AUTO, progress:progress_trt.BinProgressReporter|None=None) -> str|typing.BinaryIO:
+	"""
+	Something for `avb.open()` to read a bin from: its path, or its contents already in memory.
+	If buffering, `progress` hears about it as it goes.
+	"""
+
+	if read_mode is BinReadMode.AUTO:
+		try:
+			read_mode = BinReadMode.BUFFER if pathlib.Path(bin_path).stat().st_size <= BUFFER_MAX_SIZE else BinReadMode.STREAM
+		except OSError:
+			read_mode = BinReadMode.STREAM
+
+	if read_mode is BinReadMode.BUFFER:
+		# One big sequential read instead of thousands of little ones
+		with open(bin_path, "rb", buffering=0) as bin_file:
+
+			if progress is None:
+				return io.BytesIO(bin_file.readall())
+
+			bin_buffer = io.BytesIO()
+			while chunk := bin_file.read(progress_trt.PROGRESS_STEP_BYTES * 4):
+				bin_buffer.write(chunk)
+				progress.bytesRead(bin_buffer.tell())
+			bin_buffer.seek(0)
+			return bin_buffer
+
+	if read_mode is BinReadMode.MMAP:
+		try:
+			return MappedBinFile(bin_path)
+		except ValueError:
+			# Empty files can't be mapped; let avb complain about it properly
+			pass
+
+	return bin_path
+
+def bin_source_hash(bin_source:str|typing.BinaryIO) -> str|None:
+	"""Content hash of a bin already in memory (to save reading it again), if it is"""
+
+	if isinstance(bin_source, io.BytesIO):
+		return hashlib.sha1(bin_source.getbuffer()).hexdigest()
+	elif isinstance(bin_source, MappedBinFile):
+		return hashlib.sha1(bin_source.mapped()).hexdigest()
+
+	return None
+
+def get_timelines_from_bin(bin_path:str, index_options:index_trt.BinIndexOptions|None=index_trt.DEFAULT_INDEX_OPTIONS, read_mode:BinReadMode=BinReadMode.AUTO, progress_queue=None) -> list[TimelineInfo]:
+	"""
+	Given a Avid bin's file path, parse the bin and get sequence info.
+	A sidecar index is used instead if there's one that still matches the bin (see `index_trt`).
+
+	With a `progress_queue`, `progress_trt.BinProgress` reports are put on it as the bin is read and decoded.
+	"""
 
 	timeline_info = []
 
+	# Stamp before parsing, so a save mid-parse gets noticed (and doesn't get indexed)
+	stamp = index_trt.bin_stamp(bin_path)
+
+	if progress_queue is not None:
+		progress = progress_trt.BinProgressReporter(bin_path, (stamp or (0,0))[0], progress_queue)
+	else:
+		progress = None
+
 	# Check for  lock first, why not
-	bin_lock = avbutils.LockInfo.from_lockfile(pathlib.Path(bin_path).with_suffix(".lck")) if pathlib.Path(bin_path).with_suffix(".lck").is_file() else None
+	# NOTE: Locks come and go, so they're never indexed
+	bin_lock = locks_trt.read_bin_lock(bin_path)
+
+	if index_options and index_options.read:
+		indexed_timelines = index_trt.read_index(bin_path, index_options)
+		if indexed_timelines is not None:
+			return [dataclasses.replace(t, bin_path=bin_path, bin_lock=bin_lock) for t in indexed_timelines]
+		# NOTE: No progress for indexed bins; they're done before anybody'd notice
+
+	try:
+		timeline_info, content_hash = _parse_timelines_from_bin(bin_path, bin_lock, read_mode, progress, hash_source=bool(index_options and index_options.write))
+
+	except TRANSIENT_PARSE_ERRORS as e:
+		if index_trt.bin_stamp(bin_path) != stamp:
+			raise BinBusyError(bin_path, "Bin changed while it was being read") from e
+		elif stamp is not None and time.time() - stamp[1] / 1e9 < RECENT_SAVE_WINDOW:
+			raise BinBusyError(bin_path, f"Bin was only just saved, and wouldn't read ({e})") from e
+		raise
+
+	# Parsed fine, but maybe not what's there now
+	if index_trt.bin_stamp(bin_path) != stamp:
+		raise BinBusyError(bin_path, "Bin changed while it was being read")
+
+	if index_options and index_options.write:
+		index_trt.write_index(bin_path, timeline_info, stamp, index_options, content_hash=content_hash)
+	
+	return timeline_info
+
+def _parse_timelines_from_bin(bin_path:str, bin_lock:avbutils.LockInfo|None, read_mode:BinReadMode, progress:progress_trt.BinProgressReporter|None, hash_source:bool) -> tuple[list[TimelineInfo], str|None]:
+	"""The actual parsing part of `get_timelines_from_bin`, plus the content hash of what was parsed (if asked for and handy)"""
+
+	timeline_info = []
+
+	# avb won't close what it was handed (or even what it opened) if it can't make sense of it, and
+	# half-saved bins get retried, so whatever happens, it's closed here
+	with contextlib.ExitStack() as bin_sources:
 
-	with avb.open(bin_path) as bin_handle:
+		bin_source = open_bin_source(bin_path, read_mode, progress)
+		if isinstance(bin_source, str):
+			bin_source = open(bin_source, "rb")
+		bin_sources.enter_context(bin_source)
 
+		# Hash what was parsed, not what might be there now
+		content_hash = bin_source_hash(bin_source) if hash_source else None
 
-		# avb.file.AVBFile -> avb.bin.Bin
-		bin_contents = bin_handle.content
+		# Already-buffered bins have nothing left to read
+		if progress is not None and not isinstance(bin_source, io.BytesIO):
+			bin_source = progress_trt.ProgressReportingFile(bin_source, progress)
+
+		with avb.open(bin_source) as bin_handle:
+
+			if progress is not None:
+				_report_objects_decoded(bin_handle, progress)
+
+			# avb.file.AVBFile -> avb.bin.Bin
+			bin_contents = bin_handle.content
 		
-		# Get all sequences in bin
-		timeline_compositions = avbutils.get_timelines_from_bin(bin_contents)
-
-		# Sorting by sequence name with human sorting for version numbers
-		for timeline in timeline_compositions:
-			timeline_info.append(
-				TimelineInfo(
-					timeline_name     = timeline.name,
-					timeline_color    = avbutils.composition_clip_color(timeline),
-					date_created      = timeline.creation_time,
-					date_modified     = timeline.last_modified,
-					timeline_tc_range =	avbutils.get_timecode_range_for_composition(timeline),
-					markers           = avbutils.get_markers_from_timeline(timeline),
-					bin_path          = bin_path,
-					bin_lock          = bin_lock
+			# Get all sequences in bin
+			timeline_compositions = avbutils.get_timelines_from_bin(bin_contents)
+
+			# Sorting by sequence name with human sorting for version numbers
+			for timeline in timeline_compositions:
+				timeline_info.append(
+					TimelineInfo(
+						timeline_name     = timeline.name,
+						timeline_color    = avbutils.composition_clip_color(timeline),
+						date_created      = timeline.creation_time,
+						date_modified     = timeline.last_modified,
+						timeline_tc_range =	avbutils.get_timecode_range_for_composition(timeline),
+						markers           = avbutils.get_markers_from_timeline(timeline),
+						bin_path          = bin_path,
+						bin_lock          = bin_lock
+					)
 				)
-			)
 	
-	return timeline_info
\ No newline at end of file
+	if progress is not None:
+		progress.flush()
+	
+	return timeline_info, content_hash
+
+def _report_objects_decoded(bin_handle:avb.file.AVBFile, progress:progress_trt.BinProgressReporter):
+	"""Have `avb` tell `progress` about every object it decodes (from here on)"""
+
+	# The first position is a placeholder, not an object
+	progress.setObjectCount(len(bin_handle.object_positions) - 1)
+
+	read_object = bin_handle.read_object
+
+	def read_object_reported(index:int):
+		# Ones already in the cache don't count
+		if index and index not in bin_handle.object_cache:
+			progress.objectDecoded()
+		return read_object(index)
+
+	bin_handle.read_object = read_object_reported
+
+SCHEDULE_LOOKAHEAD:int = 64
+"""Bins to gather from a lazy iterable before picking the biggest to start on"""
+
+PROGRESS_INTERVAL:float = 0.2
+"""Seconds between checks for progress reports, while waiting on bins"""
+
+MEMORY_SAMPLE_MIN_SIZE:int = 1024 * 1024
+"""Bins smaller than this don't say much about memory per byte, so they're not counted"""
+
+def _measured_timelines_from_bin(measure_memory:bool, *args) -> tuple[list[TimelineInfo], executors_trt.JobMetrics]:
+	"""
+	`get_timelines_from_bin`, and how long it took and how much memory it needed (in the worker).
+
+	Memory is only worth `measure_memory` in a worker process of its own: anywhere else it's
+	the whole app's, shared with whatever else is parsing, and not ours to go resetting.
+	"""
+
+	if not measure_memory:
+		time_started = time.perf_counter()
+		timelines = get_timelines_from_bin(*args)
+		return timelines, executors_trt.JobMetrics(seconds=time.perf_counter() - time_started, pid=os.getpid())
+
+	rss_before = executors_trt.current_rss()
+	executors_trt.reset_peak_rss()
+
+	time_started = time.perf_counter()
+	timelines = get_timelines_from_bin(*args)
+	parse_seconds = time.perf_counter() - time_started
+
+	return timelines, executors_trt.JobMetrics(
+		seconds    = parse_seconds,
+		pid        = os.getpid(),
+		rss_before = rss_before,
+		rss_after  = executors_trt.current_rss(),
+		peak_rss   = executors_trt.peak_rss(),
+	)
+
+def iter_timelines_from_bins(bin_paths:typing.Iterable[str], max_workers:int|None=None, max_pending:int|None=None, index_options:index_trt.BinIndexOptions|None=index_trt.DEFAULT_INDEX_OPTIONS, read_mode:BinReadMode=BinReadMode.AUTO, backend:executors_trt.ParseBackend=executors_trt.ParseBackend.AUTO, stats:executors_trt.ParseRunStats|None=None, largest_first:bool=True, cost_estimator:executors_trt.BinCostEstimator|None=None, on_progress:typing.Callable[[progress_trt.BinProgress], None]|None=None, retry_policy:executors_trt.RetryPolicy|None=executors_trt.DEFAULT_RETRY_POLICY, memory_budget:int|None=None, recycle_rss:int|None=executors_trt.DEFAULT_RECYCLE_RSS) -> typing.Iterator[tuple[str, list[TimelineInfo]|None, Exception|None]]:
+	"""
+	Parse bins in parallel, yielding `(bin_path, timelines, error)` for each bin as it finishes.
+	
+	Only `max_pending` bins (twice the workers, by default) are in the works at a time, so `bin_paths`
+	can be a lazy iterable and results don't pile up if they're consumed slowly.
+
+	`backend` picks processes, threads or neither (see `executors_trt`), and `max_workers` defaults to
+	what suits it and the bins.  Pass a `stats` to have it filled in as things go.
+
+	With `largest_first`, the bins expected to take longest (per `cost_estimator`: by past parse
+	times, or size) are started first.  Lazy iterables are only looked ahead of so far.
+
+	`on_progress` is called (on this thread, between results) with `progress_trt.BinProgress` reports
+	from the workers as they read and decode.
+
+	Bins caught mid-save (`BinBusyError`) are tried again later, per `retry_policy`, and only
+	yielded as errors once it gives up on them.
+
+	No more bins are started than are expected to fit in `memory_budget` bytes at once (by default,
+	a share of what's available; `0` for no limit), going by their size and what similar bins have
+	needed so far (where that can be measured: in worker processes).  Worker processes that end up
+	bigger than `recycle_rss` are replaced, once they've finished what they were given.
+	"""
+
+	backend = executors_trt.resolve_backend(backend)
+
+	if largest_first:
+		cost_estimator = cost_estimator or executors_trt.BinCostEstimator()
+		# Bins still turning up (from a folder walk, say) start going as soon as the first one does
+		bin_queue = executors_trt.LargestFirstQueue(bin_paths, cost_estimator.estimate, lookahead=None if isinstance(bin_paths, typing.Sequence) else SCHEDULE_LOOKAHEAD, initial_lookahead=1)
+		bin_queue.fill()
+	else:
+		bin_queue = None
+
+	if not max_workers:
+		if bin_queue is not None:
+			# Size things up from what's been gathered so far
+			queued_bins = bin_queue.queued()
+			max_workers = executors_trt.recommended_worker_count(backend,
+				bin_count         = len(queued_bins) if bin_queue.isExhausted() else None,
+				largest_bin_size  = max((cost_estimator.binSize(p) for p in queued_bins), default=None),
+				estimated_seconds = sum(cost_estimator.estimate(p) for p in queued_bins) if bin_queue.isExhausted() else None,
+			)
+		else:
+			max_workers = executors_trt.recommended_worker_count(backend)
+
+	max_workers = max(1, max_workers)
+	max_pending = max(1, max_pending or max_workers * 2)
+	bin_paths = bin_queue if bin_queue is not None else iter(bin_paths)
+
+	if memory_budget is None:
+		memory_free = executors_trt.available_memory()
+		memory_budget = int(memory_free * executors_trt.MEMORY_BUDGET_FRACTION) if memory_free else 0
+
+	if stats is not None:
+		stats.backend = backend
+		stats.max_workers = max_workers
+
+	exit_stack = contextlib.ExitStack()
+	progress_queue = exit_stack.enter_context(executors_trt.progress_queue(backend)) if on_progress else None
+
+	executor:futures.Executor|None = executors_trt.create_executor(backend, max_workers)
+	"""Where new bins go; `None` while retired workers are still finishing up"""
+	retired_executors:list[futures.Executor] = []
+	pending:dict[futures.Future, str] = {}
+
+	retries_due:list[tuple[float, str]] = []
+	"""When bins that were caught mid-save get another go"""
+	retry_counts:dict[str, int] = {}
+
+	memory_per_bin_byte = float(executors_trt.MEMORY_PER_BIN_BYTE)
+	pending_memory:dict[futures.Future, int] = {}
+	"""Memory each bin in the works is expected to need"""
+	pending_executors:dict[futures.Future, futures.Executor] = {}
+	"""Which executor each bin was handed to, since they may be swapped out along the way"""
+	held_bin_path:str|None = None
+	"""Next bin up, waiting on memory to free up"""
+
+	def bin_size(bin_path:str) -> int:
+		if cost_estimator is not None:
+			return cost_estimator.binSize(bin_path)
+		return (index_trt.bin_stamp(bin_path) or (0,0))[0]
+
+	def expected_memory(bin_path:str) -> int:
+		return max(executors_trt.MIN_MEMORY_PER_WORKER, int(bin_size(bin_path) * memory_per_bin_byte))
+
+	def submit_more():
+		nonlocal held_bin_path, executor
+
+		if executor is None:
+
+			# Fresh workers only once the retired ones are gone, so there's never more of them than `max_workers`
+			if any(bin_executor in retired_executors for bin_executor in pending_executors.values()):
+				return
+
+			for retired_executor in retired_executors:
+				retired_executor.shutdown(wait=True)
+			retired_executors.clear()
+
+			executor = executors_trt.create_executor(backend, max_workers)
+
+		while len(pending) < max_pending:
+
+			if held_bin_path is not None:
+				bin_path, held_bin_path = held_bin_path, None
+			# Bins due another try go first, since they were here first
+			elif retries_due and retries_due[0][0] <= time.monotonic():
+				bin_path = heapq.heappop(retries_due)[1]
+			else:
+				bin_path = next(bin_paths, None)
+				if bin_path is None:
+					return
+
+			# Always at least one going, even if it's a monster
+			bin_memory = expected_memory(bin_path)
+			if memory_budget and pending and sum(pending_memory.values()) + bin_memory > memory_budget:
+				held_bin_path = bin_path
+				return
+
+			bin_future = executor.submit(_measured_timelines_from_bin, backend is executors_trt.ParseBackend.PROCESS, bin_path, index_options, read_mode, progress_queue)
+			pending[bin_future] = bin_path
+			pending_memory[bin_future] = bin_memory
+			pending_executors[bin_future] = executor
+
+	def recycle_workers(metrics:executors_trt.JobMetrics):
+		nonlocal executor
+
+		logging.getLogger(__name__).info("Worker %i is holding %.0f MB; starting fresh workers", metrics.pid, (metrics.rss_after or 0) / 1_000_000)
+
+		# The old ones finish what they've got, then go, and then it's the new ones' turn
+		retired_executors.append(executor)
+		executor.shutdown(wait=False)
+		executor = None
+
+		if stats is not None:
+			stats.recycle_count += 1
+
+	def report_progress():
+		while True:
+			try:
+				on_progress(progress_queue.get_nowait())
+			except queue.Empty:
+				return
+
+	try:
+		submit_more()
+
+		while pending or retries_due or held_bin_path is not None:
+
+			timeout = PROGRESS_INTERVAL if on_progress else None
+			if retries_due:
+				timeout = max(0.0, min(timeout or float("inf"), retries_due[0][0] - time.monotonic()))
+
+			if pending:
+				done, _ = futures.wait(pending, timeout=timeout, return_when=futures.FIRST_COMPLETED)
+			else:
+				# Nothing to do but wait for the next retry
+				time.sleep(timeout)
+				done = set()
+
+			if on_progress:
+				report_progress()
+
+			for bin_future in done:
+				bin_path = pending.pop(bin_future)
+				pending_memory.pop(bin_future, None)
+				bin_executor = pending_executors.pop(bin_future, None)
+				try:
+					timelines, metrics = bin_future.result()
+				except Exception as e:
+
+					retry_count = retry_counts.get(bin_path, 0)
+
+					if isinstance(e, BinBusyError) and retry_policy is not None and retry_count < retry_policy.max_retries:
+						retry_delay = retry_policy.delay(retry_count)
+						retry_counts[bin_path] = retry_count + 1
+						heapq.heappush(retries_due, (time.monotonic() + retry_delay, bin_path))
+						logging.getLogger(__name__).warning("%s; trying again in %.1f s (retry %i of %i)", e, retry_delay, retry_count + 1, retry_policy.max_retries)
+						if stats is not None:
+							stats.retry_count += 1
+						continue
+
+					if stats is not None:
+						stats.error_count += 1
+					yield bin_path, None, e
+				else:
+					peak_increase = metrics.peakIncrease()
+
+					logging.getLogger(__name__).info("Parsed %s in %.2f s (worker %i, peak %s MB)", bin_path, metrics.seconds, metrics.pid, f"{metrics.peak_rss / 1_000_000:.0f}" if metrics.peak_rss else "?")
+
+					# Learn from the big ones how much memory bins really need
+					if peak_increase and bin_size(bin_path) >= MEMORY_SAMPLE_MIN_SIZE:
+						memory_per_bin_byte = max(memory_per_bin_byte, peak_increase / bin_size(bin_path))
+
+					if stats is not None:
+						stats.bin_count += 1
+						stats.bin_seconds[bin_path] = metrics.seconds
+						stats.peak_rss = max(stats.peak_rss, metrics.peak_rss or 0)
+
+					# Threads can't be swapped out for thinner ones
+					if backend is executors_trt.ParseBackend.PROCESS and recycle_rss and (metrics.rss_after or 0) > recycle_rss and executor is not None and bin_executor is executor:
+						recycle_workers(metrics)
+
+					yield bin_path, timelines, None
+
+			submit_more()
+
+	finally:
+		# Bail on anything that hasn't started if we're abandoned early
+		for retired_executor in retired_executors:
+			retired_executor.shutdown(wait=True, cancel_futures=True)
+		if executor is not None:
+			executor.shutdown(wait=True, cancel_futures=True)
+		exit_stack.close()
+
+		if stats is not None:
+			stats.finish()
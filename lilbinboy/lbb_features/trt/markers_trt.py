@@ -1,6 +1,7 @@
-import dataclasses, re
+import re
 import avbutils
 from PySide6 import QtCore, QtGui, QtWidgets
+from .calc_trt import LBMarkerPreset
 
 class LBMarkerIcons:
 
@@ -22,14 +23,6 @@ class LBMarkerIcons:
 	def __iter__(self):
 		return iter(self.ICONS.values())
 
-@dataclasses.dataclass()
-class LBMarkerPreset:
-	"""Marker criteria presets"""
-
-	color: "LBMarkerIcon | None"
-	comment: str | None
-	author:  str | None
-
 class LBMarkerPresetNameValidator(QtGui.QValidator):
 	"""Validate marker preset names"""
 
@@ -1,19 +1,11 @@
 
-import enum, logging
+import logging
 import avbutils
 from datetime import timezone
-from PySide6 import QtCore, QtGui
-from timecode import Timecode, TimecodeRange
-from ...lbb_features.trt import logic_trt, markers_trt, wdg_sequence_treeview
-
-class SequenceSelectionMode(enum.Enum):
-	"""Modes for choosing sequences from a bin"""
-
-	ONE_SEQUENCE_PER_BIN  = "Single"
-	"""Select only one sequence from a given bin"""
-
-	ALL_SEQUENCES_PER_BIN = "All"
-	"""Select all sequences from a given bin"""
+from PySide6 import QtCore, QtGui, QtWidgets
+from timecode import Timecode
+from ...lbb_features.trt import logic_trt, markers_trt, wdg_sequence_treeview, calc_trt
+from ...lbb_features.trt.calc_trt import SequenceSelectionMode
 
 
 class SingleSequenceSelectionProcess:
@@ -24,17 +16,7 @@ class SingleSequenceSelectionProcess:
 			"""Test the timeline against the filter"""
 			pass
 
-	class NameContainsFilter(AbstractSequenceFilter):
-		"""Sequence name contains..."""
-		def __init__(self, name:str):
-			# TODO: Maybe list of names, and AND or OR
-			self._name = str(name)
-		
-		def name(self) -> str:
-			return self._name
-		
-		def validate(self, timeline_info:logic_trt.TimelineInfo) -> bool:
-			return self._name.lower() in timeline_info.timeline_name.lower()
+	NameContainsFilter = calc_trt.NameContainsFilter
 	
 	class ClipColorFilter(AbstractSequenceFilter):
 		"""Clip color is set to..."""
@@ -48,7 +30,7 @@ class SingleSequenceSelectionProcess:
 			return QtGui.QColor.fromRgba64(*timeline_info.timeline_color.as_rgba16()) in self._colors if timeline_info.timeline_color else False
 		
 
-	SORT_COLUMNS = ["Name", "Start Timecode", "Creation Date", "Modified Date"]
+	SORT_COLUMNS = calc_trt.SORT_COLUMNS
 
 	def __init__(self):
 		self._sort_column:str = "Name"
@@ -79,84 +61,51 @@ class SingleSequenceSelectionProcess:
 	def getSingleSequence(self, timelines:list[logic_trt.TimelineInfo]) -> logic_trt.TimelineInfo|None:
 		"""Get a seequence based on this process"""
 
-		# Sort first
-		sort_reversed = self.sortDirection() == QtCore.Qt.SortOrder.DescendingOrder
-		
-		if self.sortColumn() == "Name":
-			timelines_sorted = sorted(timelines, reverse=sort_reversed, key=lambda t: avbutils.human_sort(t.timeline_name))
-		elif self.sortColumn() == "Start Timecode":
-			timelines_sorted = sorted(timelines, reverse=sort_reversed, key=lambda t: t.timeline_tc_range.start)
-		elif self.sortColumn() == "Creation Date":
-			timelines_sorted = sorted(timelines, reverse=sort_reversed, key=lambda t: t.date_created)
-		elif self.sortColumn() == "Modified Date":
-			timelines_sorted = sorted(timelines, reverse=sort_reversed, key=lambda t: t.date_modified)
-		else:
-			raise KeyError(f"No sort method defined for ", self.sortColumn())
-		
-		#if not self.filters():
-		#	return timelines_sorted[0]
-		
-		# Do filters
-		for t in timelines_sorted:
-			if all(f.validate(t) for f in self.filters()):
-				return t
-		
-		return None
+		return calc_trt.select_single_timeline(
+			timelines,
+			sort_column     = self.sortColumn(),
+			sort_descending = self.sortDirection() == QtCore.Qt.SortOrder.DescendingOrder,
+			filters         = self.filters()
+		)
 		
 
 
 class TRTDataModel(QtCore.QObject):
 
-	class CalculatedTimelineInfo:
+	class CalculatedTimelineInfo(calc_trt.TrimmedTimeline):
 		"""Cached and calculated timeline info based on current trims, etc"""
 
-		def __init__(self, timeline_info:logic_trt.TimelineInfo):
-			
-			self._timeline_info = timeline_info
+		def __init__(self, timeline_info:logic_trt.TimelineInfo, is_cached:bool=False, bin_key:str|None=None):
+
+			super().__init__(timeline_info)
+			self._is_cached = bool(is_cached)
 
 			# Basic info interpreted to Qt objects
 			self._clip_color = QtGui.QColor.fromRgba64(*self._timeline_info.timeline_color.as_rgb16(), self._timeline_info.timeline_color.max_16b()) if self._timeline_info.timeline_color else QtGui.QColor()
 			self._date_modified = QtCore.QDateTime(self._timeline_info.date_modified.astimezone(timezone.utc))
 			self._date_created = QtCore.QDateTime(self._timeline_info.date_created.astimezone(timezone.utc))
 			self._bin_file_path = QtCore.QFileInfo(self._timeline_info.bin_path)
+			self._bin_key = bin_key or self._bin_file_path.absoluteFilePath()
 
-			# User settings
-			self._global_ffoa = Timecode(0, rate=self._timeline_info.timeline_tc_range.rate)
-			self._global_lfoa = Timecode(0, rate=self._timeline_info.timeline_tc_range.rate)
-
-			self._marker_ffoa = None
-			self._marker_lfoa = None
-
-			# Calculated from user settings
-			self._active_ffoa_offset = self._global_ffoa
-			self._active_lfoa_offset = self._global_lfoa
-
-			self._timecode_trimmed = self._timeline_info.timeline_tc_range
-
-		def timelineName(self) -> str:
-			"""Timeline name"""
-			return self._timeline_info.timeline_name
+		def isCached(self) -> bool:
+			"""Timeline info came from the session cache and hasn't been checked against the bin yet"""
+			return self._is_cached
+		
+		def setCached(self, is_cached:bool):
+			self._is_cached = bool(is_cached)
 		
 		def binFilePath(self) -> QtCore.QFileInfo:
 			"""Bin file path"""
 			return self._bin_file_path
 		
-		def binLockInfo(self) -> avbutils.LockInfo|None:
-			"""Bin lock info if available"""
-			return self._timeline_info.bin_lock
+		def binKey(self) -> str:
+			"""Canonical path of the bin, the same whichever path it was read from"""
+			return self._bin_key
 		
 		def timelineColor(self) -> QtGui.QColor:
 			"""Timeline clip color"""
 			return self._clip_color
 		
-		def timelineTimecodeExtents(self) -> TimecodeRange:
-			"""Full timecode extents of the timeline (without trims)"""
-			return self._timeline_info.timeline_tc_range
-		
-		def timelineTimecodeTrimmed(self) -> TimecodeRange:
-			"""Trimmed timecode range (FFOA -> LFOA)"""
-			return self._timecode_trimmed
-		
 		def timelineDateModified(self) -> QtCore.QDateTime:
 			"""Timeline date modified"""
 			return self._date_modified
@@ -165,117 +114,6 @@ class TRTDataModel(QtCore.QObject):
 			"""Timeline date created"""
 			return self._date_created
 
-		def markerFFOA(self) -> avbutils.MarkerInfo|None:
-			"""Matched marker currently in use for FFOA (or `None`)"""
-			return self._marker_ffoa
-		
-		def markerLFOA(self) -> avbutils.MarkerInfo|None:
-			"""Matched marker currently in use for LFOA (or `None`)"""
-			return self._marker_lfoa
-		
-		def ffoaOffset(self) -> Timecode:
-			"""Duration from head to FFOA"""
-			return self._active_ffoa_offset
-		
-		def lfoaOffset(self) -> Timecode:
-			"""Duration from LFOA to tail"""
-			return self._active_lfoa_offset
-		
-		# Setters & Dynamic stuff
-		def setGlobalFFOA(self, ffoa:Timecode):
-			"""Default FFOA offset used "globally" for each timeline unless a marker match overrides this"""
-			
-			if ffoa.rate != self._timecode_trimmed.rate:
-				raise ValueError("FFOA duration rate must match the timeline's timecode rate")
-			
-			self._global_ffoa = ffoa
-			self._updateFFOAOffset()
-
-		def setGlobalLFOA(self, lfoa:Timecode):
-			"""Default LFOA offset used "globally" for each timeline unless a marker match overrides this"""
-			
-			if lfoa.rate != self._timecode_trimmed.rate:
-				raise ValueError("LFOA duration rate must match the timeline's timecode rate")
-			
-			self._global_lfoa = lfoa
-			self._updateLFOAOffset()
-
-		def findMarkerFFOAFromPreset(self, marker_preset:markers_trt.LBMarkerPreset):
-			"""See if we can match us some of them marker for FFOA"""
-
-			if marker_preset is None:
-				self._marker_ffoa = None
-
-			else:
-				self._marker_ffoa = self._findMarkerFromPreset(
-					marker_preset,
-					sorted(self._timeline_info.markers, key=lambda m: m.frm_offset)
-				)
-
-			self._updateFFOAOffset()
-
-			return self.markerFFOA()
-
-		def findMarkerLFOAFromPreset(self, marker_preset:markers_trt.LBMarkerPreset):
-			"""See if we can match us some of them marker for LFOA"""
-
-			if marker_preset is None:
-				self._marker_lfoa = None
-
-			else:
-				self._marker_lfoa = self._findMarkerFromPreset(
-					marker_preset,
-					sorted(self._timeline_info.markers, key=lambda m: m.frm_offset, reverse=True)
-				)
-
-			self._updateLFOAOffset()
-
-			return self.markerLFOA()
-		
-		# Helpers
-		def _updateFFOAOffset(self):
-			"""Set the frame offset to the FFOA"""
-			# Call this after any potential changes to FFOA criteria
-
-			frame_offset = self.markerFFOA().frm_offset if self.markerFFOA() else self._global_ffoa.frame_number
-
-			self._active_ffoa_offset = Timecode(frame_offset, rate=self._timecode_trimmed.rate)
-
-			self._timecode_trimmed = TimecodeRange(
-				start = self.timelineTimecodeExtents().start + frame_offset,
-				end   = max(self._timecode_trimmed.end,self.timelineTimecodeExtents().start + frame_offset)
-			)
-
-		def _updateLFOAOffset(self):
-			"""Set the frame offset to the FFOA"""
-			# Call this after any potential changes to LFOA criteria
-
-			frame_offset = (self.timelineTimecodeExtents().duration - self.markerLFOA().frm_offset - 1) if self.markerLFOA() else self._global_lfoa.frame_number
-
-			self._active_lfoa_offset = Timecode(frame_offset, rate=self._timecode_trimmed.rate)
-
-			self._timecode_trimmed = TimecodeRange(
-				start = self._timecode_trimmed.start,
-				end   = max(self.timelineTimecodeExtents().end - frame_offset, self._timecode_trimmed.start)
-			)
-
-		@classmethod
-		def _findMarkerFromPreset(self, marker_preset:markers_trt.LBMarkerPreset, marker_list:list[avbutils.MarkerInfo]):
-			"""Match a marker to the given preset criteria"""
-
-			for marker_info in marker_list:
-
-				if marker_preset.color is not None and marker_info.color.value != marker_preset.color:
-					continue
-				if marker_preset.comment is not None and marker_preset.comment not in marker_info.comment:
-					continue
-				if marker_preset.author is not None and marker_preset.author not in marker_info.user:
-					continue
-				return marker_info
-			
-			return None
-
-
 			
 	sig_trt_changed = QtCore.Signal(Timecode)
 	"""Something happen that affects TRT calculation"""
@@ -295,6 +133,9 @@ class TRTDataModel(QtCore.QObject):
 
 	sig_data_changed  = QtCore.Signal()
 
+	sig_bin_locks_changed = QtCore.Signal(list)
+	"""Bins whose locks were updated (without being re-read)"""
+
 	sig_rate_changed = QtCore.Signal(int)
 	"""Timecode rate has changed"""
 
@@ -313,7 +154,7 @@ class TRTDataModel(QtCore.QObject):
 	"""User chose a tail marker preset"""
 
 	#LFOA_PERFS_PER_FOOT = 8 # 35.8
-	LFOA_PERFS_PER_FOOT = 16 # 35.4
+	LFOA_PERFS_PER_FOOT = calc_trt.LFOA_PERFS_PER_FOOT # 35.4
 	#LFOA_PERFS_PER_FOOT = 21 # 35.3
 	#LFOA_PERFS_PER_FOOT = 32 # 35.2
 	#LFOA_PERFS_PER_FOOT = 40 # 16.40
@@ -333,6 +174,10 @@ class TRTDataModel(QtCore.QObject):
 		self._data:list[Self.CalculatedTimelineInfo] = []
 		self._marker_presets:dict[str, markers_trt.LBMarkerPreset] = dict()
 
+		# Bins go by who they are, not the path they came in by
+		self._bin_keys:dict[str, str] = {}
+		"""Canonical paths of bins (as worked out by the parser), by the paths they were added under"""
+
 		# TODO: Deal with
 		self._fps = 24
 		self._trim_head    = Timecode("8:00", rate=self._fps)
@@ -357,16 +202,11 @@ class TRTDataModel(QtCore.QObject):
 	
 	def bin_count(self) -> int:
 		"""Number of individual bins involved in this"""
-		return len(set(b.binFilePath() for b in self._data))
+		return len(self.binsUsed())
 	
 	def total_runtime(self) -> Timecode:
 		"""Total running time"""
-		trt = Timecode(0, rate=self._fps)
-
-		for timeline_info in self._data:
-			trt += timeline_info.timelineTimecodeTrimmed().duration
-		
-		return max(Timecode(0, rate=self.rate()), trt + self.trimTotal())
+		return calc_trt.total_runtime(self._data, self.trimTotal(), self.rate())
 
 	def total_lfoa(self) -> str:
 		"""Total running length (F+F)"""
@@ -379,9 +219,9 @@ class TRTDataModel(QtCore.QObject):
 		unique_bins = set()
 
 		for timeline in self._data:
-			if timeline.binFilePath().absoluteFilePath() in unique_bins:
+			if timeline.binKey() in unique_bins:
 				continue
-			unique_bins.add(timeline.binFilePath().absoluteFilePath())
+			unique_bins.add(timeline.binKey())
 			if timeline.binLockInfo():
 				locked += 1
 
@@ -479,9 +319,7 @@ class TRTDataModel(QtCore.QObject):
 	
 	# Helper
 	def tc_to_lfoa(self, tc:Timecode) -> str:
-		zpadding = len(str(self.LFOA_PERFS_PER_FOOT))
-		#tc = max(tc, Timecode(0, rate=self.rate()))
-		return str(tc.frame_number // 16) + "+" + str(tc.frame_number % self.LFOA_PERFS_PER_FOOT).zfill(zpadding)
+		return calc_trt.format_feet_frames(tc.frame_number)
 	
 	#
 	#	Marker Match Criteria Presets
@@ -565,22 +403,95 @@ class TRTDataModel(QtCore.QObject):
 	#
 	# Actual bin/timeline data model stuff here
 	#
-	def add_timelines_from_bin(self, bin_info:list[logic_trt.TimelineInfo]):
-		"""Given all timelines in a bin, add it depending on the SequenceSelection mode"""
+	def binKey(self, bin_path:str) -> str:
+		"""
+		Which bin a path is, as far as `binsUsed()` and friends are concerned.  Only goes by what's
+		already known: stats can hang on a sleepy file server, and this is the GUI thread.
+		"""
+		bin_path = QtCore.QFileInfo(bin_path).absoluteFilePath()
+		return self._bin_keys.get(bin_path, bin_path)
+	
+	def add_timelines_from_bin(self, bin_info:list[logic_trt.TimelineInfo], is_cached:bool=False, bin_key:str|None=None):
+		"""
+		Given all timelines in a bin, add it depending on the SequenceSelection mode.
+		`bin_key` is the bin's canonical path, if the parser's worked it out.
+		"""
 
 		if not bin_info:
 			# TODO: Think about doing something with the interface or like... you know
 			return
+		
+		# Every timeline in here is from the same bin
+		if bin_key:
+			self._bin_keys[QtCore.QFileInfo(bin_info[0].bin_path).absoluteFilePath()] = QtCore.QFileInfo(bin_key).absoluteFilePath()
+		bin_key = self.binKey(bin_info[0].bin_path)
 
 		if self._sequence_selection_mode is SequenceSelectionMode.ALL_SEQUENCES_PER_BIN:
 			for timeline_info in bin_info:
-				self._add_sequence(self.CalculatedTimelineInfo(timeline_info))
+				self._add_sequence(self.CalculatedTimelineInfo(timeline_info, is_cached=is_cached, bin_key=bin_key))
 		
 		else:
 			filtered_sequence = self.sequenceSelectionProcess().getSingleSequence(bin_info)
 			if not filtered_sequence:
 				return
-			self._add_sequence(self.CalculatedTimelineInfo(filtered_sequence))
+			self._add_sequence(self.CalculatedTimelineInfo(filtered_sequence, is_cached=is_cached, bin_key=bin_key))
+	
+	def replace_timelines_from_bin(self, bin_path:str, bin_info:list[logic_trt.TimelineInfo]):
+		"""Swap out any sequences from a given bin with its latest timelines"""
+
+		self.remove_bin_sequences(bin_path)
+		self.add_timelines_from_bin(bin_info, bin_key=bin_path)
+	
+	def remove_bin_sequences(self, bin_path:str):
+		"""Remove all sequences that came from a given bin"""
+
+		bin_key = self.binKey(bin_path)
+
+		for index in reversed(range(len(self._data))):
+			if self._data[index].binKey() == bin_key:
+				self.remove_sequence(index)
+	
+	def remove_cached_bin_sequences(self, bin_path:str):
+		"""Cached sequences from a given bin didn't check out; lose 'em"""
+
+		bin_key = self.binKey(bin_path)
+
+		for index in reversed(range(len(self._data))):
+			if self._data[index].isCached() and self._data[index].binKey() == bin_key:
+				self.remove_sequence(index)
+	
+	def set_bin_revalidated(self, bin_path:str):
+		"""Cached sequences from a given bin checked out fine; they're the real deal now"""
+
+		bin_key = self.binKey(bin_path)
+
+		for sequence_info in self._data:
+			if sequence_info.binKey() == bin_key:
+				sequence_info.setCached(False)
+
+		self.sig_data_changed.emit()
+	
+	def set_bin_locks(self, bin_locks:dict[str, avbutils.LockInfo|None]):
+		"""Update the lock info of sequences from the given bins, without re-reading them"""
+
+		bin_locks = {self.binKey(bin_path): lock_info for bin_path, lock_info in bin_locks.items()}
+		changed_bin_paths = set()
+
+		for sequence_info in self._data:
+			bin_path = sequence_info.binKey()
+			if bin_path in bin_locks and sequence_info.binLockInfo() != bin_locks[bin_path]:
+				sequence_info.setBinLockInfo(bin_locks[bin_path])
+				changed_bin_paths.add(bin_path)
+
+		if not changed_bin_paths:
+			return
+
+		self.sig_bin_locks_changed.emit(sorted(changed_bin_paths))
+		self.sig_data_changed.emit()
+	
+	def cached_sequence_count(self) -> int:
+		"""Number of sequences still waiting to be checked against their bins"""
+		return sum(1 for sequence_info in self._data if sequence_info.isCached())
 			
 
 	def _add_sequence(self, sequence_info:CalculatedTimelineInfo):
@@ -602,8 +513,8 @@ class TRTDataModel(QtCore.QObject):
 		self.sig_trt_changed.emit(self.total_runtime())
 
 	def binsUsed(self) -> list[str]:
-		"""Get a list of bins currently in use"""
-		return list(set(sequence.binFilePath().absoluteFilePath() for sequence in self.data()))
+		"""Get a list of bins currently in use, each by its canonical path"""
+		return list(set(sequence.binKey() for sequence in self.data()))
 	
 	def remove_sequence(self, index:int):
 		"""Remove a sequence from the data model"""
@@ -695,7 +606,10 @@ class TRTDataModel(QtCore.QObject):
 			"date_modified":           wdg_sequence_treeview.TRTDateTimeItem(timeline_info.timelineDateModified()),
 			"date_created":            wdg_sequence_treeview.TRTDateTimeItem(timeline_info.timelineDateCreated()),
 			"bin_path":                wdg_sequence_treeview.TRTPathItem(timeline_info.binFilePath()),
-			"bin_lock":                wdg_sequence_treeview.TRTBinLockItem(timeline_info.binLockInfo())
+			"bin_lock":                wdg_sequence_treeview.TRTBinLockItem(timeline_info.binLockInfo()),
+
+			# Not a column; marks rows shown from the session cache
+			"is_cached":               timeline_info.isCached(),
 		}
 	
 
@@ -708,30 +622,15 @@ class TRTViewModel(QtCore.QAbstractItemModel):
 		self._data:list[dict[str, wdg_sequence_treeview.TRTAbstractItem]] = []
 		self._headers:list[wdg_sequence_treeview.TRTTreeViewHeaderItem] = []
 
+		# Special treatment for a couple of fields; the rest are plain columns
+		header_options = {
+			"sequence_color": {"show_label": False, "is_frozen_header": True, "display_delegate": wdg_sequence_treeview.TRTClipColorDisplayDelegate},
+			"sequence_name":  {"is_frozen_header": True},
+		}
+
 		self.setHeaderItems([
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Sequence Color","sequence_color", show_label=False, is_frozen_header=True, display_delegate=wdg_sequence_treeview.TRTClipColorDisplayDelegate),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Sequence Name","sequence_name", is_frozen_header=True),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Full Duration (TC)","duration_total_tc", is_accumulating_value=True),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Full Duration (F+F)","duration_total_ff", is_accumulating_value=True),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Full Duration (Frames)","duration_total_frames", is_accumulating_value=True),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Trimmed Duration (TC)","duration_trimmed_tc", is_accumulating_value=True),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Trimmed Duration (F+F)","duration_trimmed_ff", is_accumulating_value=True),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Trimmed Duration (Frames)","duration_trimmed_frames", is_accumulating_value=True),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Trimmed From Head (TC)", "head_trimmed_tc", is_accumulating_value=True),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Trimmed From Head (F+F)", "head_trimmed_ff", is_accumulating_value=True),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Trimmed From Head (Frames)", "head_trimmed_frames", is_accumulating_value=True),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Trimmed From Tail (TC)", "tail_trimmed_tc", is_accumulating_value=True),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Trimmed From Tail (F+F)", "tail_trimmed_ff", is_accumulating_value=True),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Trimmed From Tail (Frames)", "tail_trimmed_frames", is_accumulating_value=True),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Sequence Start", "sequence_start_tc"),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("FFOA (F+F)", "ffoa_ff"),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("FFOA (TC)", "ffoa_tc"),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("LFOA (F+F)", "lfoa_ff"),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("LFOA (TC)", "lfoa_tc"),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Date Created","date_created"),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Date Modified","date_modified"),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("From Bin","bin_path"),
-			wdg_sequence_treeview.TRTTreeViewHeaderItem("Bin Lock","bin_lock"),
+			wdg_sequence_treeview.TRTTreeViewHeaderItem(field.name, field.field, is_accumulating_value=field.is_accumulating_value, **header_options.get(field.field, {}))
+			for field in calc_trt.SEQUENCE_FIELDS
 		])
 	
 	def setSequenceInfoList(self, trt_data:list[dict[str,wdg_sequence_treeview.TRTAbstractItem]]):
@@ -745,7 +644,8 @@ class TRTViewModel(QtCore.QAbstractItemModel):
 		self.endInsertRows()
 
 	def updateSequenceInfo(self, idx:int, sequence_info:dict[str, wdg_sequence_treeview.TRTAbstractItem]):
-		idx_start = self.index(idx, 2) # Bout dat 2: Skipping sequence_color and sequence_name
+		# Bout dat 2: Skipping sequence_color and sequence_name (unless the whole row changes from cached to fresh)
+		idx_start = self.index(idx, 0 if self._data[idx].get("is_cached") != sequence_info.get("is_cached") else 2)
 		idx_end = self.index(idx, self.columnCount()-1)
 		self._data[idx] = sequence_info
 		self.dataChanged.emit(idx_start, idx_end)
@@ -789,6 +689,13 @@ class TRTViewModel(QtCore.QAbstractItemModel):
 		field = self._headers[index.column()].field()
 		item  = self._data[index.row()]
 
+		# Gray out rows from the session cache until they're checked
+		if item.get("is_cached"):
+			if role == QtCore.Qt.ItemDataRole.ForegroundRole:
+				return QtGui.QBrush(QtWidgets.QApplication.palette().color(QtGui.QPalette.ColorGroup.Disabled, QtGui.QPalette.ColorRole.Text))
+			elif role == QtCore.Qt.ItemDataRole.ToolTipRole and not item.get(field).data(role):
+				return "Cached from the last session; checking the bin for changes..."
+
 		return item.get(field).data(role)
 
 	def headerData(self, section:int, orientation:QtCore.Qt.Orientation=QtCore.Qt.Orientation.Horizontal, role:int=QtCore.Qt.ItemDataRole.DisplayRole) -> QtCore.QObject:
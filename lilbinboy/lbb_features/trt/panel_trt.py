@@ -1,19 +1,23 @@
-import logging
+import datetime, logging, typing
 from PySide6 import QtWidgets, QtGui, QtCore, QtSql
 from timecode import Timecode
-from concurrent import futures
-from ...lbb_common import LBUtilityTab, LBSpinBoxTC, LBTimelineView
-from ...lbb_features.trt import dlg_choose_columns, dlg_marker, logic_trt, model_trt, markers_trt, dlg_sequence_selection, dlg_choose_columns, exporters_trt, wdg_sequence_treeview, wdg_sequence_trims, wdg_stats, hist_main
+from ...lbb_common import LBUtilityTab, LBSpinBoxTC, LBTimelineView, LBBufferedSettings
+from ...lbb_features.trt import logic_trt, model_trt, markers_trt, exporters_trt, wdg_sequence_treeview, wdg_sequence_trims, wdg_stats, hist_autosnapshot, db_hist_sqlite, session_cache, service_trt, index_trt, watch_trt, scan_trt, executors_trt, progress_trt, identity_trt
+# NOTE: Dialogs and the history viewer (`dlg_*`, `hist_main`) are imported when they're first opened, to keep them out of startup
 from .settings_keys import TRTSettingsKeys
 
 
 class TRTBinLoadingProgressBar(QtWidgets.QProgressBar):
+	"""Bin loading progress, by the byte, with a guess at how much longer"""
 
 	sig_progress_started = QtCore.Signal()
 	sig_progress_completed = QtCore.Signal()
 
 	TIMEOUT_BEFORE_HIDE = 1000
 
+	PROGRESS_UNIT = 1024
+	"""Bytes per step of the bar (its range is only an `int`)"""
+
 	def __init__(self):
 		super().__init__()
 
@@ -26,30 +30,62 @@ class TRTBinLoadingProgressBar(QtWidgets.QProgressBar):
 		self._reset_timer = QtCore.QTimer()
 		self._reset_timer.timeout.connect(self.reset)
 		self._reset_timer.setSingleShot(True)
+
+		self._tracker = progress_trt.LoadProgressTracker()
 		
 		self.reset()
-
-		self.setFormat("Loading %v of %m bins...")
 	
-	@QtCore.Slot()
-	def step_added(self):
+	def tracker(self) -> progress_trt.LoadProgressTracker:
+		return self._tracker
+	
+	@QtCore.Slot(str, int)
+	def binAdded(self, bin_path:str, bin_size:int):
 		if self.isHidden():
 			self.setHidden(False)
 			self.sig_progress_started.emit()
 
 		self._reset_timer.stop()
-		self.setMaximum(self.maximum() + 1)
+		self._tracker.binAdded(bin_path, bin_size)
+		self.updateProgress()
 	
-	@QtCore.Slot()
-	def step_complete(self):
-		self.setValue(self.value() + 1)
-		if self.value() == self.maximum():
+	@QtCore.Slot(object)
+	def binProgress(self, progress:progress_trt.BinProgress):
+		self._tracker.binProgress(progress)
+		self.updateProgress()
+	
+	@QtCore.Slot(str)
+	def binComplete(self, bin_path:str):
+		self._tracker.binComplete(bin_path)
+		self.updateProgress()
+
+		if self._tracker.isComplete():
+			logging.getLogger(__name__).info("Loaded %s", self._tracker.summary())
 			self._reset_timer.start(self.TIMEOUT_BEFORE_HIDE)
 	
+	def updateProgress(self):
+		"""Bring the bar up to date with the tracker"""
+
+		# Never a zero range, or it's "busy" forever
+		self.setRange(0, max(self._tracker.bytesTotal() // self.PROGRESS_UNIT, 1))
+		self.setValue(self.maximum() if self._tracker.isComplete() else int(self._tracker.workDone()) // self.PROGRESS_UNIT)
+
+		progress_text = f"Loading {self._tracker.binsComplete()} of {self._tracker.binCount()} bins"
+
+		if self._tracker.elapsed() >= 1:
+			progress_text += f" ({self._tracker.bytesPerSecond() / 1_000_000:.1f} MB/s, {self._tracker.binsPerSecond():.1f} bins/s"
+			seconds_remaining = self._tracker.secondsRemaining()
+			if seconds_remaining is not None and not self._tracker.isComplete():
+				progress_text += f", about {datetime.timedelta(seconds=round(seconds_remaining))} left"
+			progress_text += ")"
+
+		self.setFormat(progress_text.replace("%", "%%") + "...")
+	
 	@QtCore.Slot()
 	def reset(self):
+		self._tracker.reset()
 		self.setRange(0,0)
 		self.setValue(0)
+		self.setFormat("Loading bins...")
 		self.setHidden(True)
 		self.sig_progress_completed.emit()
 
@@ -57,13 +93,34 @@ class TRTThreadedMulticoreAbomination(QtCore.QRunnable):
 	"""I don't like this"""
 
 	class TRTThreadedSignals(QtCore.QObject):
-		sig_got_bin_info = QtCore.Signal(list)
+		sig_bin_found    = QtCore.Signal(str, int)
+		"""A bin (and its size) is on its way to being parsed"""
+		sig_bin_progress = QtCore.Signal(object)
+		"""A `progress_trt.BinProgress` report from a worker"""
+		sig_got_bin_info = QtCore.Signal(list, str)
+		"""Timelines from a bin, and the bin's canonical path"""
+		sig_bin_loaded   = QtCore.Signal(str, object, list)
+		"""Bin path, its stamp from before it was read, and its timelines"""
 		sig_had_error    = QtCore.Signal(str, Exception)
+		sig_bin_failed   = QtCore.Signal(str, object)
+		"""Bin path and its stamp from before it was read, for a bin that couldn't be"""
 		sig_complete     = QtCore.Signal(bool)
+		sig_run_stats    = QtCore.Signal(object)
+		"""How the parsing went, as `executors_trt.ParseRunStats`"""
 	
-	def __init__(self, bin_paths:list[str]):
+	def __init__(self, bin_paths:typing.Iterable[str], index_options:index_trt.BinIndexOptions|None=index_trt.DEFAULT_INDEX_OPTIONS, read_mode:logic_trt.BinReadMode=logic_trt.BinReadMode.AUTO, backend:executors_trt.ParseBackend=executors_trt.ParseBackend.AUTO, max_workers:int|None=None, cost_estimator:executors_trt.BinCostEstimator|None=None, retry_policy:executors_trt.RetryPolicy|None=executors_trt.DEFAULT_RETRY_POLICY, memory_budget:int|None=None, recycle_rss:int|None=executors_trt.DEFAULT_RECYCLE_RSS, bin_identities:identity_trt.BinIdentityRegistry|None=None, known_bin_paths:typing.Iterable[str]=()):
 		super().__init__()
+		self._bin_identities = bin_identities or identity_trt.BinIdentityRegistry()
+		self._known_bin_paths = list(known_bin_paths)
+		self._cost_estimator = cost_estimator
+		self._retry_policy = retry_policy
+		self._memory_budget = memory_budget
+		self._recycle_rss = recycle_rss
 		self._bin_paths = bin_paths
+		self._index_options = index_options
+		self._read_mode = read_mode
+		self._backend = backend
+		self._max_workers = max_workers
 		self._signals = self.TRTThreadedSignals()
 	
 	def signals(self) -> TRTThreadedSignals:
@@ -71,16 +128,29 @@ class TRTThreadedMulticoreAbomination(QtCore.QRunnable):
 	
 	def run(self):
 		errors:list[Exception] = []
-		with futures.ProcessPoolExecutor(max_workers=6) as executor:
-			bin_futures = {executor.submit(logic_trt.get_timelines_from_bin, bin_path) : bin_path for bin_path in self._bin_paths}
-			for bin_future in futures.as_completed(bin_futures):
-				try:
-					timeline_info_list = bin_future.result()
-					self.signals().sig_got_bin_info.emit(timeline_info_list)
-				except Exception as e:
-					logging.getLogger(__name__).error("Didn't load %s: %s", bin_futures[bin_future], e)
-					errors.append(e)
-					self.signals().sig_had_error.emit(bin_futures[bin_future], e)
+
+		bin_stamps:dict[str, session_cache.BinStamp|None] = {}
+		stats = executors_trt.ParseRunStats(self._backend, self._max_workers or 0)
+
+		def found_bin_paths():
+			# Bin paths may still be turning up (from a folder scan), so this happens as they're handed to the parser
+			for bin_path in identity_trt.iter_unique_bin_paths(self._bin_paths, self._bin_identities, self._known_bin_paths):
+				# Stamp before reading, so a save sneaking in during the read looks like a change next time
+				bin_stamps[bin_path] = session_cache.bin_stamp(bin_path)
+				self.signals().sig_bin_found.emit(bin_path, bin_stamps[bin_path][0] if bin_stamps[bin_path] else 0)
+				yield bin_path
+
+		for bin_path, timeline_info_list, error in logic_trt.iter_timelines_from_bins(found_bin_paths(), max_workers=self._max_workers, index_options=self._index_options, read_mode=self._read_mode, backend=self._backend, stats=stats, cost_estimator=self._cost_estimator, on_progress=self.signals().sig_bin_progress.emit, retry_policy=self._retry_policy, memory_budget=self._memory_budget, recycle_rss=self._recycle_rss):
+			if error is None:
+				stats.byte_count += bin_stamps[bin_path][0] if bin_stamps[bin_path] else 0
+				self.signals().sig_bin_loaded.emit(bin_path, bin_stamps[bin_path], timeline_info_list)
+				self.signals().sig_got_bin_info.emit(timeline_info_list, bin_path)
+			else:
+				logging.getLogger(__name__).error("Didn't load %s: %s", bin_path, error)
+				errors.append(error)
+				self.signals().sig_had_error.emit(bin_path, error)
+				self.signals().sig_bin_failed.emit(bin_path, bin_stamps[bin_path])
+		self.signals().sig_run_stats.emit(stats)
 		self.signals().sig_complete.emit(bool(errors))
 
 
@@ -181,21 +251,24 @@ class LBTRTCalculator(LBUtilityTab):
 	sig_modelchanged = QtCore.Signal()
 	sig_export_requested = QtCore.Signal(str, str)
 
-	def __init__(self, settings:QtCore.QSettings, *args, **kwargs):
+	def __init__(self, settings:QtCore.QSettings|LBBufferedSettings, *args, **kwargs):
 		super().__init__(*args, **kwargs)
 
-
 		self.setLayout(QtWidgets.QVBoxLayout())
 
 		self._pool = QtCore.QThreadPool()
 		self._settings = settings
 
+		self._bin_parse_seconds:dict[str, float] = {}
+		"""How long bins took to parse this session, so the slow ones go first next time"""
+
 		# Declare models
 		self._data_model = model_trt.TRTDataModel()
 		self._treeview_model = model_trt.TRTViewModel()
 		
 		# Declare top controls
 		self.btn_add_bins = QtWidgets.QPushButton("Add From Bins...")
+		self.btn_add_folder = QtWidgets.QPushButton()
 		self.btn_refresh_bins = QtWidgets.QPushButton()
 		self.btn_clear_bins = QtWidgets.QPushButton()
 		
@@ -221,19 +294,40 @@ class LBTRTCalculator(LBUtilityTab):
 
 		self.btn_snapshots = QtWidgets.QPushButton()
 
+		# Automatic snapshots (the database is only opened once there's something to snapshot)
+		self._auto_snapshots = hist_autosnapshot.TRTAutoSnapshotManager(self.historyDatabase, self.currentSnapshotInfo, parent=self)
+
+		# The same bin by any other path
+		self._bin_identities = identity_trt.BinIdentityRegistry()
+
+		# Parsed bins from the last session, to show while the real ones are checked
+		self._session_cache = session_cache.TRTSessionCache()
+
+		# Reload bins as they change on disk
+		self._bin_watcher = watch_trt.TRTBinWatcher(self.loadedBinStamp, parent=self)
+
+		# Keep bin locks current without re-reading the bins
+		self._lock_monitor = watch_trt.TRTBinLockMonitor(parent=self)
+		self.btn_watch_bins = QtWidgets.QPushButton()
 
+		# Optional local API for other tools to poll
+		self._query_service = service_trt.TRTQueryService(self.serviceLiveDocuments, self.serviceSnapshotDocuments, parent=self)
+
+		if QtWidgets.QApplication.instance() is not None:
+			QtWidgets.QApplication.instance().aboutToQuit.connect(self.saveSessionCache)
+			QtWidgets.QApplication.instance().aboutToQuit.connect(self._query_service.stop)
 
 		self._setupSignals()
 		self._setupWidgets()
 		self._loadInitial()
 
 
-	def setSettingsManager(self, settings:QtCore.QSettings):
+	def setSettingsManager(self, settings:QtCore.QSettings|LBBufferedSettings):
 		# TODO: Never called?
 		self._settings = settings
 		logging.getLogger(__name__).debug("Settings manager set to %s", settings)
 	
-	def settingsManager(self) -> QtCore.QSettings:
+	def settingsManager(self) -> QtCore.QSettings|LBBufferedSettings:
 		return self._settings
 
 	def _loadInitial(self):
@@ -297,9 +391,264 @@ class LBTRTCalculator(LBUtilityTab):
 				logging.getLogger(__name__).error("Unknown filter: %s", filter)
 		sequenceSelectionSettings.setFilters(sequenceSelectionFilters)
 		self.model().setSequenceSelectionProcess(sequenceSelectionSettings)
+
+		self._auto_snapshots.setInterval(int(self.settingsManager().value(TRTSettingsKeys.AUTO_SNAPSHOT_INTERVAL, self._auto_snapshots.DEFAULT_INTERVAL)))
+		self._auto_snapshots.setSettleDelay(int(self.settingsManager().value(TRTSettingsKeys.AUTO_SNAPSHOT_SETTLE_DELAY, self._auto_snapshots.DEFAULT_SETTLE_DELAY)))
+		self._auto_snapshots.setRetentionPolicy(db_hist_sqlite.SnapshotRetentionPolicy(
+			keep_all_days   = int(self.settingsManager().value(TRTSettingsKeys.SNAPSHOT_RETENTION_KEEP_ALL_DAYS, db_hist_sqlite.SnapshotRetentionPolicy.keep_all_days)),
+			keep_daily_days = int(self.settingsManager().value(TRTSettingsKeys.SNAPSHOT_RETENTION_KEEP_DAILY_DAYS, db_hist_sqlite.SnapshotRetentionPolicy.keep_daily_days)),
+		))
+		self._auto_snapshots.setEnabled(bool(int(self.settingsManager().value(TRTSettingsKeys.AUTO_SNAPSHOT_ENABLED, 1))))
+
+		self._bin_watcher.setSettleDelay(int(self.settingsManager().value(TRTSettingsKeys.WATCH_SETTLE_DELAY, self._bin_watcher.DEFAULT_SETTLE_DELAY)))
+		self._bin_watcher.setPollInterval(int(self.settingsManager().value(TRTSettingsKeys.WATCH_POLL_INTERVAL, self._bin_watcher.DEFAULT_POLL_INTERVAL)))
+		self.btn_watch_bins.setChecked(bool(int(self.settingsManager().value(TRTSettingsKeys.WATCH_ENABLED, 0))))
+
+		self._lock_monitor.setScanInterval(int(self.settingsManager().value(TRTSettingsKeys.LOCK_SCAN_INTERVAL, self._lock_monitor.DEFAULT_SCAN_INTERVAL)))
+		self._lock_monitor.setEnabled(bool(int(self.settingsManager().value(TRTSettingsKeys.LOCK_SCAN_ENABLED, 1))))
+
+		if bool(int(self.settingsManager().value(TRTSettingsKeys.SERVICE_ENABLED, 0))):
+			self._query_service.start(str(self.settingsManager().value(TRTSettingsKeys.SERVICE_ADDRESS, service_trt.DEFAULT_ADDRESS)))
 			
+		# Bins can take a while on shared storage; get the window up first and restore them once the event loop is running
+		QtCore.QTimer.singleShot(0, self.restoreSavedBins)
+	
+	@QtCore.Slot()
+	def restoreSavedBins(self):
+		"""Reload the bins saved from the last session, showing cached results first if we have them"""
+
+		timer = QtCore.QElapsedTimer()
+		timer.start()
+
+		bin_paths = list(self.settingsManager().value(TRTSettingsKeys.BINS_LIST,[], type=list))
+		self._session_cache = session_cache.TRTSessionCache.load(self.sessionCachePath())
+
+		cached_bin_paths   = [p for p in bin_paths if self._session_cache.contains(p)]
+		uncached_bin_paths = [p for p in bin_paths if not self._session_cache.contains(p)]
+
+		# Stale: Show what we had last time right away
+		for bin_path in cached_bin_paths:
+			self.model().add_timelines_from_bin(self._session_cache.binInfo(bin_path).timelines, is_cached=True)
+
+		# While-revalidate: Check the cached bins for changes in the background
+		if cached_bin_paths:
+			revalidation_job = session_cache.TRTSessionRevalidationJob({p: self._session_cache.binInfo(p).stamp for p in cached_bin_paths})
+			revalidation_job.signals().sig_revalidation_complete.connect(self.sessionCacheRevalidated)
+			self._pool.start(revalidation_job)
+
+		self.add_bins_from_paths(uncached_bin_paths)
+
+		logging.getLogger(__name__).debug("Restored %i bins from the session cache and queued %i more in %i ms", len(cached_bin_paths), len(uncached_bin_paths), timer.elapsed())
+	
+	@QtCore.Slot(list, list)
+	def sessionCacheRevalidated(self, changed_bin_paths:list[str], unchanged_bin_paths:list[str]):
+		"""Cached bins have been checked against the real ones"""
+
+		logging.getLogger(__name__).debug("Session cache revalidated: %i bins changed, %i unchanged", len(changed_bin_paths), len(unchanged_bin_paths))
+
+		for bin_path in unchanged_bin_paths:
+			self.model().set_bin_revalidated(bin_path)
+		
+		if unchanged_bin_paths:
+			self.updateSequenceInfo()
+
+		# Only re-read the bins that changed; their cached rows stay put until the new ones arrive
+		self.add_bins_from_paths(changed_bin_paths, replace_existing=True)
+	
+	def binIndexOptions(self) -> index_trt.BinIndexOptions:
+		"""Whether to read and write `.lbbidx` sidecars for bins, and where"""
+
+		return index_trt.BinIndexOptions(
+			read      = bool(int(self.settingsManager().value(TRTSettingsKeys.BIN_INDEX_READ_ENABLED, 1))),
+			write     = bool(int(self.settingsManager().value(TRTSettingsKeys.BIN_INDEX_WRITE_ENABLED, 0))),
+			cache_dir = self.settingsManager().value(TRTSettingsKeys.BIN_INDEX_CACHE_DIR, "") or None,
+		)
+	
+	def binReadMode(self) -> logic_trt.BinReadMode:
+		"""How bin files get read for parsing"""
+
+		try:
+			return logic_trt.BinReadMode(self.settingsManager().value(TRTSettingsKeys.BIN_READ_MODE, logic_trt.BinReadMode.AUTO.value))
+		except ValueError:
+			return logic_trt.BinReadMode.AUTO
+	
+	def parseBackend(self) -> executors_trt.ParseBackend:
+		"""What to parse bins with (processes, threads, or one at a time)"""
+
+		try:
+			return executors_trt.ParseBackend(self.settingsManager().value(TRTSettingsKeys.PARSE_BACKEND, executors_trt.ParseBackend.AUTO.value))
+		except ValueError:
+			return executors_trt.ParseBackend.AUTO
+	
+	def parseWorkerCount(self) -> int|None:
+		"""How many bins to parse at once, or `None` to let the backend decide"""
+
+		try:
+			return int(self.settingsManager().value(TRTSettingsKeys.PARSE_WORKERS, 0)) or None
+		except (TypeError, ValueError):
+			return None
+	
+	@QtCore.Slot(object)
+	def recordParseStats(self, stats:executors_trt.ParseRunStats):
+		"""Add a parsing run to the running totals for its backend"""
+
+		if not stats.bin_count:
+			return
+
+		self._bin_parse_seconds.update(stats.bin_seconds)
+
+		stats_key = f"{TRTSettingsKeys.PARSE_STATS}/{stats.backend.value}"
+
+		totals = self.parseBackendStats().get(stats.backend.value, {"runs": 0, "bins": 0, "bytes": 0, "seconds": 0.0})
+		totals["runs"]    += 1
+		totals["bins"]    += stats.bin_count
+		totals["bytes"]   += stats.byte_count
+		totals["seconds"] += stats.elapsed()
+
+		for stat_name, stat_value in totals.items():
+			self.settingsManager().setValue(f"{stats_key}/{stat_name}", stat_value)
+
+		logging.getLogger(__name__).info("Parsed %i bin(s) in %.2f s with %s x%i (%.1f bins/s, %.1f MB/s, peak %.0f MB per worker, %i recycle(s); %.1f bins/s over %i run(s))", stats.bin_count, stats.elapsed(), stats.backend.value, stats.max_workers, stats.binsPerSecond(), stats.bytesPerSecond() / 1_000_000, stats.peak_rss / 1_000_000, stats.recycle_count, totals["bins"] / totals["seconds"] if totals["seconds"] else 0, totals["runs"])
+	
+	def binRetryPolicy(self) -> executors_trt.RetryPolicy:
+		"""How many times to try again with bins caught mid-save, and how long to wait first"""
+
+		return executors_trt.RetryPolicy(
+			max_retries   = max(0, int(self.settingsManager().value(TRTSettingsKeys.BIN_RETRY_MAX, executors_trt.DEFAULT_RETRY_POLICY.max_retries))),
+			initial_delay = max(0, int(self.settingsManager().value(TRTSettingsKeys.BIN_RETRY_DELAY, int(executors_trt.DEFAULT_RETRY_POLICY.initial_delay * 1000)))) / 1000,
+		)
+	
+	def parseMemoryBudget(self) -> int|None:
+		"""Bytes of memory bins may need at once while parsing (`None` to size it up from what's free, `0` for no limit)"""
+
+		try:
+			memory_budget_mb = self.settingsManager().value(TRTSettingsKeys.PARSE_MEMORY_BUDGET, None)
+			return int(memory_budget_mb) * 1024 * 1024 if memory_budget_mb not in (None, "") else None
+		except (TypeError, ValueError):
+			return None
+	
+	def parseRecycleRSS(self) -> int|None:
+		"""Size (bytes) a worker process can grow to before it's replaced, or `None` to never mind"""
+
+		try:
+			recycle_mb = int(self.settingsManager().value(TRTSettingsKeys.PARSE_RECYCLE_RSS, executors_trt.DEFAULT_RECYCLE_RSS // (1024 * 1024)))
+		except (TypeError, ValueError):
+			return executors_trt.DEFAULT_RECYCLE_RSS
+
+		return recycle_mb * 1024 * 1024 if recycle_mb > 0 else None
+	
+	def binCostEstimator(self) -> executors_trt.BinCostEstimator:
+		"""Best guesses at how long bins will take, from how they've gone before"""
+
+		# Per-worker parse rate, for bins we haven't timed yet
+		parsed_bytes = 0
+		parsed_seconds = 0.0
+		for bin_path, parse_seconds in self._bin_parse_seconds.items():
+			if stamp := self.loadedBinStamp(bin_path):
+				parsed_bytes += stamp[0]
+				parsed_seconds += parse_seconds
+		bytes_per_second = parsed_bytes / parsed_seconds if parsed_bytes and parsed_seconds else None
+
+		return executors_trt.BinCostEstimator(self._bin_parse_seconds, bytes_per_second)
+	
+	def parseBackendStats(self) -> dict[str, dict[str, int|float]]:
+		"""Running totals of runs, bins, bytes and seconds spent parsing, per backend"""
+
+		backend_stats = {}
+
+		for backend in executors_trt.ParseBackend:
+			stats_key = f"{TRTSettingsKeys.PARSE_STATS}/{backend.value}"
+			if not int(self.settingsManager().value(f"{stats_key}/runs", 0)):
+				continue
+			backend_stats[backend.value] = {
+				"runs":    int(self.settingsManager().value(f"{stats_key}/runs", 0)),
+				"bins":    int(self.settingsManager().value(f"{stats_key}/bins", 0)),
+				"bytes":   int(self.settingsManager().value(f"{stats_key}/bytes", 0)),
+				"seconds": float(self.settingsManager().value(f"{stats_key}/seconds", 0.0)),
+			}
 		
-		self.add_bins_from_paths(list(self.settingsManager().value(TRTSettingsKeys.BINS_LIST,[], type=list)))
+		return backend_stats
+	
+	def binScanOptions(self) -> scan_trt.BinScanOptions:
+		"""What to look for when adding bins from folders"""
+
+		max_depth = int(self.settingsManager().value(TRTSettingsKeys.FOLDER_SCAN_MAX_DEPTH, scan_trt.DEFAULT_SCAN_OPTIONS.max_depth))
+
+		return scan_trt.BinScanOptions(
+			include   = tuple(self.settingsManager().value(TRTSettingsKeys.FOLDER_SCAN_INCLUDE, list(scan_trt.DEFAULT_SCAN_OPTIONS.include), type=list)),
+			exclude   = tuple(self.settingsManager().value(TRTSettingsKeys.FOLDER_SCAN_EXCLUDE, list(scan_trt.DEFAULT_SCAN_OPTIONS.exclude), type=list)),
+			max_depth = max_depth if max_depth >= 0 else None,
+		)
+	
+	def sessionCachePath(self) -> str:
+		"""Path to the session cache file"""
+		return QtCore.QDir(QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.StandardLocation.AppDataLocation)).filePath("trt_session.cache")
+
+	@QtCore.Slot()
+	def saveSessionCache(self):
+		"""Save parsed bins currently in use for next time"""
+
+		self._session_cache.prune(self.model().binsUsed())
+
+		QtCore.QDir().mkpath(QtCore.QFileInfo(self.sessionCachePath()).absolutePath())
+		self._session_cache.save(self.sessionCachePath())
+	
+	@QtCore.Slot(str, object, list)
+	def binLoaded(self, bin_path:str, stamp:session_cache.BinStamp|None, timeline_info_list:list):
+		"""A bin was read; remember it for next session"""
+		self._session_cache.setBinInfo(bin_path, stamp, timeline_info_list)
+		self._bin_watcher.binReloaded(bin_path)
+		if timeline_info_list:
+			self._lock_monitor.binLockKnown(bin_path, timeline_info_list[0].bin_lock)
+		self._query_service.invalidateLive()
+	
+	@QtCore.Slot(list)
+	def binLocksChanged(self, bin_paths:list[str]):
+		"""Bins were locked or unlocked; show it"""
+		self.updateSequenceInfo()
+		self.update_summary()
+	
+	@QtCore.Slot(str, object)
+	def binLoadFailed(self, bin_path:str, stamp:session_cache.BinStamp|None):
+		"""A bin couldn't be read; let the watcher try it again next time it changes"""
+		self._bin_watcher.binReloadFailed(bin_path, stamp)
+	
+	def loadedBinStamp(self, bin_path:str) -> session_cache.BinStamp|None:
+		"""Stamp of a bin when it was last read"""
+
+		bin_info = self._session_cache.binInfo(bin_path)
+		return bin_info.stamp if bin_info else None
+	
+	@QtCore.Slot(bool)
+	def setBinWatchingEnabled(self, is_enabled:bool):
+		"""Reload bins automatically as they change"""
+
+		self._bin_watcher.setEnabled(is_enabled)
+		self.settingsManager().setValue(TRTSettingsKeys.WATCH_ENABLED, int(is_enabled))
+	
+	@QtCore.Slot(list)
+	def binsChangedOnDisk(self, bin_paths:list[str]):
+		"""Watched bins changed; swap in their new sequences"""
+
+		bins_used = set(self.model().binsUsed())
+		bin_paths = [p for p in bin_paths if self.model().binKey(p) in bins_used]
+		self.add_bins_from_paths(bin_paths, replace_existing=True)
+	
+	@QtCore.Slot(list, str)
+	def binAdded(self, timeline_info_list:list, bin_path:str):
+		"""A new bin was read; show its sequences, by the canonical path the parser found for it"""
+		self.model().add_timelines_from_bin(timeline_info_list, bin_key=bin_path)
+	
+	@QtCore.Slot(str, object, list)
+	def binReloaded(self, bin_path:str, stamp:session_cache.BinStamp|None, timeline_info_list:list):
+		"""A bin was re-read; swap out its old sequences"""
+		self.model().replace_timelines_from_bin(bin_path, timeline_info_list)
+	
+	@QtCore.Slot(str, Exception)
+	def binReloadFailed(self, bin_path:str, error:Exception):
+		"""A bin couldn't be re-read; any sequences still showing from the session cache can't be vouched for anymore"""
+		self.model().remove_cached_bin_sequences(bin_path)
+		self._session_cache.removeBin(bin_path)
 
 
 	def _setupWidgets(self):
@@ -325,6 +674,10 @@ class LBTRTCalculator(LBUtilityTab):
 		self.btn_add_bins.setToolTip("Add the latest sequence(s) from one or more bins")
 		self.btn_add_bins.setIcon(QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.ListAdd))
 		ctrl_layout.addWidget(self.btn_add_bins)
+
+		self.btn_add_folder.setToolTip("Add the latest sequence(s) from all the bins in a folder (and its folders)")
+		self.btn_add_folder.setIcon(QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.FolderOpen))
+		ctrl_layout.addWidget(self.btn_add_folder)
 		
 		#ctrl_layout.addWidget(self.prog_loading)
 		self.stack_bin_loading.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.MinimumExpanding, QtWidgets.QSizePolicy.Policy.Maximum))
@@ -338,6 +691,11 @@ class LBTRTCalculator(LBUtilityTab):
 		self.btn_refresh_bins.setIcon(QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.ViewRefresh))
 		ctrl_layout.addWidget(self.btn_refresh_bins)
 
+		self.btn_watch_bins.setToolTip("Reload bins automatically when they change")
+		self.btn_watch_bins.setIcon(QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.SyncSynchronizing))
+		self.btn_watch_bins.setCheckable(True)
+		ctrl_layout.addWidget(self.btn_watch_bins)
+
 		self.btn_clear_bins.setToolTip("Clear the existing sequences")
 		self.btn_clear_bins.setIcon(QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.EditClear))
 		ctrl_layout.addWidget(self.btn_clear_bins)
@@ -426,6 +784,24 @@ class LBTRTCalculator(LBUtilityTab):
 		# Data model bins have changed
 		self.model().sig_bins_changed.connect(self.saveBins)
 
+		# Snapshot the TRT automatically once it settles
+		self.model().sig_trt_changed.connect(self._auto_snapshots.scheduleSnapshot)
+
+		# Bin watching
+		self.model().sig_bins_changed.connect(self._bin_watcher.setBinPaths)
+		self._bin_watcher.sig_bins_changed.connect(self.binsChangedOnDisk)
+		self.btn_watch_bins.toggled.connect(self.setBinWatchingEnabled)
+
+		# Bin locks
+		self.model().sig_bins_changed.connect(self._lock_monitor.setBinPaths)
+		self._lock_monitor.sig_bin_locks_changed.connect(self.model().set_bin_locks)
+		self.model().sig_bin_locks_changed.connect(self.binLocksChanged)
+
+		# Query service
+		self.model().sig_data_changed.connect(self._query_service.invalidateLive)
+		self._auto_snapshots.sig_snapshot_saved.connect(self._query_service.invalidateSnapshots)
+		self._auto_snapshots.sig_snapshots_compacted.connect(self._query_service.invalidateSnapshots)
+
 		self.model().sig_rate_changed.connect(self.saveRate)
 		
 		# Trim timecode changed
@@ -463,6 +839,7 @@ class LBTRTCalculator(LBUtilityTab):
 		
 		# Top control buttons
 		self.btn_add_bins.clicked.connect(self.choose_folder)
+		self.btn_add_folder.clicked.connect(self.choose_folder_recursive)
 		self.btn_refresh_bins.clicked.connect(lambda: self.refresh_bins(self.list_trts.selectedRows()))
 		self.btn_clear_bins.clicked.connect(lambda: self.remove_bins(self.list_trts.selectedRows()))
 
@@ -491,6 +868,7 @@ class LBTRTCalculator(LBUtilityTab):
 	@QtCore.Slot()
 	def showSequenceSelectionSettings(self):
 
+		from ...lbb_features.trt import dlg_sequence_selection
 		wnd_sss = dlg_sequence_selection.TRTSequenceSelection(self)
 		wnd_sss.setInitialSortProcess(self.model().sequenceSelectionProcess())
 		wnd_sss.sig_process_chosen.connect(self.setSequenceSelectionProcess)
@@ -561,6 +939,7 @@ class LBTRTCalculator(LBUtilityTab):
 	
 	@QtCore.Slot()
 	def show_marker_maker_dialog(self) -> bool:
+		from ...lbb_features.trt import dlg_marker
 		wnd_marker = dlg_marker.TRTMarkerMaker(self)
 		
 		# Add valid marker colors
@@ -663,8 +1042,11 @@ class LBTRTCalculator(LBUtilityTab):
 		if not self.model().sequence_count():
 			self.list_trts.setStatus(self.list_trts.TRTTreeViewDisplayStatus.EMPTY)
 	
-	def add_bins_from_paths(self, paths:list[str]):
-		"""Load in sequences from a list of Avid bin file paths"""
+	def add_bins_from_paths(self, paths:list[str], replace_existing:bool=False):
+		"""
+		Load in sequences from a list of Avid bin file paths (optionally replacing any sequences already loaded from them).
+		Folders are searched for bins, which are loaded as they're found.
+		"""
 		if not paths:
 			return 
 		
@@ -673,15 +1055,24 @@ class LBTRTCalculator(LBUtilityTab):
 		
 		last_bin = paths[-1] if paths else []
 
-		thread = TRTThreadedMulticoreAbomination(paths)
-		thread.signals().sig_got_bin_info.connect(self.model().add_timelines_from_bin)
-		thread.signals().sig_got_bin_info.connect(self.prog_loading.step_complete)
-		thread.signals().sig_had_error.connect(self.prog_loading.step_complete)
+		# Bins already showing are left be, under any name, unless they're being replaced
+		known_bin_paths = [] if replace_existing else self.model().binsUsed()
+
+		thread = TRTThreadedMulticoreAbomination(scan_trt.iter_bin_paths(paths, self.binScanOptions()), self.binIndexOptions(), self.binReadMode(), self.parseBackend(), self.parseWorkerCount(), self.binCostEstimator(), self.binRetryPolicy(), self.parseMemoryBudget(), self.parseRecycleRSS(), self._bin_identities, known_bin_paths)
+		thread.signals().sig_bin_found.connect(self.prog_loading.binAdded)
+		thread.signals().sig_bin_progress.connect(self.prog_loading.binProgress)
+		thread.signals().sig_bin_loaded.connect(self.binLoaded)
+		if replace_existing:
+			thread.signals().sig_bin_loaded.connect(self.binReloaded)
+			thread.signals().sig_had_error.connect(self.binReloadFailed)
+		else:
+			thread.signals().sig_got_bin_info.connect(self.binAdded)
+		thread.signals().sig_bin_loaded.connect(self.prog_loading.binComplete)
+		thread.signals().sig_had_error.connect(self.prog_loading.binComplete)
+		thread.signals().sig_bin_failed.connect(self.binLoadFailed)
+		thread.signals().sig_run_stats.connect(self.recordParseStats)
 		thread.signals().sig_complete.connect(self.bin_loading_complete)
 
-		for _ in range(len(paths)):
-			self.prog_loading.step_added()
-		
 		self._pool.start(thread)
 
 		# Save last bin path if it's a good 'un
@@ -703,6 +1094,11 @@ class LBTRTCalculator(LBUtilityTab):
 			view_item = self.model().item_to_dict(bin_info)
 			self._treeview_model.updateSequenceInfo(idx, view_item)
 	
+	def resourcesLoaded(self):
+		"""Mark in/out icons and such live in the compiled resources, which load after the first paint"""
+		self.trt_trims.refreshIcons()
+		self.updateSequenceInfo()
+	
 	@QtCore.Slot(list)
 	def refresh_bins(self, selected:list[int]):
 		
@@ -788,6 +1184,7 @@ class LBTRTCalculator(LBUtilityTab):
 		menu.exec(menu.parent().mapToGlobal(pos))
 	
 	def showColumnChooserWindow(self, *args):
+		from ...lbb_features.trt import dlg_choose_columns
 		wnd_choosecolumns = dlg_choose_columns.TRTChooseColumnsDialog(self.list_trts)
 		
 		for idx in range(self._treeview_model.columnCount()):
@@ -878,6 +1275,15 @@ class LBTRTCalculator(LBUtilityTab):
 		
 		self.add_bins_from_paths(files)
 	
+	def choose_folder_recursive(self):
+		last_bin_path = self.settingsManager().value(TRTSettingsKeys.LAST_BIN)
+		folder = QtWidgets.QFileDialog.getExistingDirectory(caption="Choose a folder of Avid bins for calculation...", dir=QtCore.QFileInfo(last_bin_path).absolutePath() if last_bin_path else "")
+
+		if not folder:
+			return
+		
+		self.add_bins_from_paths([folder])
+	
 	@QtCore.Slot(str, QtCore.Qt.SortOrder)
 	def saveSorting(self, sort_field:str, sort_order:QtCore.Qt.SortOrder):
 		self.settingsManager().setValue(TRTSettingsKeys.LIST_SORT_FIELD, sort_field)
@@ -978,8 +1384,11 @@ class LBTRTCalculator(LBUtilityTab):
 		else:
 			self.settingsManager().setValue(TRTSettingsKeys.LAST_EXPORT, path_file)
 	
-	@QtCore.Slot()
-	def historyViewerRequsted(self):
+	def historyDatabase(self) -> QtSql.QSqlDatabase:
+		"""The snapshot history database, opened on first use"""
+
+		if QtSql.QSqlDatabase.contains("trt"):
+			return QtSql.QSqlDatabase.database("trt")
 
 		path_db = QtCore.QDir(QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.StandardLocation.AppDataLocation)).filePath("trt_db.db")
 		QtCore.QDir().mkpath(QtCore.QFileInfo(path_db).absolutePath())
@@ -989,12 +1398,51 @@ class LBTRTCalculator(LBUtilityTab):
 
 		db = QtSql.QSqlDatabase.addDatabase("QSQLITE", "trt")
 		db.setDatabaseName(QtCore.QFileInfo(path_db).absoluteFilePath())
-		db.open()
+
+		# Automatic snapshot compaction may briefly hold a write lock from another thread
+		db.setConnectOptions("QSQLITE_BUSY_TIMEOUT=5000")
 
 		if not db.open():
 			logging.getLogger(__name__).error("Couldn't open database at %s: %s", path_db, db.lastError().text())
 		
+		return db
+	
+	def currentSnapshotInfo(self) -> dict|None:
+		"""Package up the current sequences for an automatic snapshot (or `None` if there's nothing worth saving)"""
+
+		if not self.model().sequence_count():
+			return None
+
+		return {
+			"rate":               self.model().rate(),
+			"adjust_frames":      self.model().trimTotal().frame_number,
+			"duration_frames":    self.model().total_runtime().frame_number,
+			"timeline_info_list": exporters_trt.exportToSnapshot(self.list_trts.model()),
+		}
+
+	def queryService(self) -> service_trt.TRTQueryService:
+		return self._query_service
+
+	def serviceLiveDocuments(self) -> service_trt.ServiceDocuments:
+		"""Current TRT for the query service"""
+
+		return service_trt.live_documents(
+			timelines  = list(self.model().data()),
+			trim_total = self.model().trimTotal(),
+			rate       = self.model().rate(),
+			bin_stamps = {p: self._session_cache.binInfo(p).stamp for p in self._session_cache.binPaths()},
+		)
+
+	def serviceSnapshotDocuments(self) -> service_trt.ServiceDocuments:
+		"""Saved snapshots for the query service"""
+		return service_trt.snapshot_documents(self._auto_snapshots.databaseManager())
+
+	@QtCore.Slot()
+	def historyViewerRequsted(self):
+
+		db = self.historyDatabase()
 		
+		from ...lbb_features.trt import hist_main
 		self.wnd_history = hist_main.TRTHistoryViewer(db, parent=self)
 		
 		# Set "Current" card to use the same sorted view as our main list_trts
@@ -1009,6 +1457,13 @@ class LBTRTCalculator(LBUtilityTab):
 
 		self.wnd_history.setLiveRate(self.model().rate())
 		self.model().sig_rate_changed.connect(self.wnd_history.setLiveRate)
+
+		# Show automatic snapshots as they come and go
+		self._auto_snapshots.sig_snapshot_saved.connect(self.wnd_history.updateModelQueries)
+		self._auto_snapshots.sig_snapshots_compacted.connect(self.wnd_history.updateModelQueries)
+
+		# Snapshots saved or deleted by hand
+		self.wnd_history.sig_snapshots_changed.connect(self._query_service.invalidateSnapshots)
 		
 		# Just really try to delete this thing
 		self.wnd_history.sig_is_closing.connect(self.wnd_history.deleteLater)
@@ -0,0 +1,235 @@
+"""
+How far along the bins are, by the byte rather than by the bin: so one big reel doesn't
+leave the progress bar sitting at 95% for most of the load.
+
+Workers report through a `BinProgressReporter`; whoever's waiting on them adds it all up
+with a `LoadProgressTracker`.
+"""
+
+import dataclasses, io, time, typing
+
+PROGRESS_STEP_BYTES:int = 256 * 1024
+"""Bytes to read between progress reports"""
+
+PROGRESS_STEP_OBJECTS:int = 500
+"""Objects to decode between progress reports"""
+
+PROGRESS_READ_SHARE:float = 0.25
+"""How much of a bin's place on the progress bar is reading it; the rest is decoding it"""
+
+@dataclasses.dataclass(frozen=True)
+class BinProgress:
+	"""Word from a worker on how a bin's coming along"""
+
+	bin_path:str
+	bytes_read:int
+	bin_size:int
+	objects_decoded:int
+	object_count:int = 0
+	"""Objects in the bin altogether, once that's known"""
+
+
+class BinProgressReporter:
+	"""Reports a bin's progress from inside the worker, every so often"""
+
+	def __init__(self, bin_path:str, bin_size:int, progress_queue):
+		"""`progress_queue` is anything with a `put()`: a `queue.SimpleQueue`, or a `multiprocessing.Manager().Queue()`"""
+
+		self._bin_path = bin_path
+		self._bin_size = bin_size
+		self._progress_queue = progress_queue
+
+		self._bytes_read = 0
+		self._objects_decoded = 0
+		self._object_count = 0
+		self._last_reported = (0, 0, 0)
+
+	def bytesRead(self, byte_count:int):
+		"""Got this far into the file"""
+
+		self._bytes_read = max(self._bytes_read, min(byte_count, self._bin_size))
+
+		if self._bytes_read - self._last_reported[0] >= PROGRESS_STEP_BYTES:
+			self.flush()
+
+	def setObjectCount(self, object_count:int):
+		"""The bin's been opened, and it turns out to have this many objects"""
+		self._object_count = max(0, int(object_count))
+
+	def objectDecoded(self):
+		"""Decoded one more object from the bin"""
+
+		self._objects_decoded += 1
+
+		if self._objects_decoded - self._last_reported[1] >= PROGRESS_STEP_OBJECTS:
+			self.flush()
+
+	def flush(self):
+		"""Report where things are at, regardless"""
+
+		if (self._bytes_read, self._objects_decoded, self._object_count) == self._last_reported:
+			return
+
+		self._last_reported = (self._bytes_read, self._objects_decoded, self._object_count)
+
+		try:
+			self._progress_queue.put(BinProgress(self._bin_path, self._bytes_read, self._bin_size, self._objects_decoded, self._object_count))
+		except Exception:
+			# Nobody's listening anymore; that's their problem
+			pass
+
+
+class ProgressReportingFile(io.RawIOBase):
+	"""Wraps a file (or file-like) for `avb` to read, reporting how far into it reading has gotten"""
+
+	def __init__(self, source:typing.BinaryIO, reporter:BinProgressReporter):
+		super().__init__()
+		self._source = source
+		self._reporter = reporter
+
+	def readable(self) -> bool:
+		return True
+
+	def seekable(self) -> bool:
+		return True
+
+	def readinto(self, buffer) -> int:
+		byte_count = self._source.readinto(buffer)
+		self._reporter.bytesRead(self._source.tell())
+		return byte_count
+
+	def read(self, size:int=-1) -> bytes:
+		data = self._source.read(size)
+		self._reporter.bytesRead(self._source.tell())
+		return data
+
+	def seek(self, offset:int, whence:int=io.SEEK_SET) -> int:
+		return self._source.seek(offset, whence)
+
+	def tell(self) -> int:
+		return self._source.tell()
+
+	def close(self):
+		if not self.closed:
+			self._source.close()
+		super().close()
+
+
+class LoadProgressTracker:
+	"""Adds up progress across a batch of bins, for throughput and a guess at the time left"""
+
+	def __init__(self):
+		self.reset()
+
+	def reset(self):
+
+		self._bin_sizes:dict[str, int] = {}
+		self._bytes_done:dict[str, int] = {}
+		self._objects_decoded:dict[str, int] = {}
+		self._object_counts:dict[str, int] = {}
+		self._bins_complete:set[str] = set()
+		self._time_started:float|None = None
+
+		# Parsing only gets to some of a bin's objects; going by the bins done so far, this share of them
+		self._decoded_share_total = 0.0
+		self._decoded_share_samples = 0
+
+	def binAdded(self, bin_path:str, bin_size:int):
+		"""A bin's been queued up"""
+
+		if self._time_started is None:
+			self._time_started = time.perf_counter()
+
+		self._bin_sizes[bin_path] = max(0, int(bin_size))
+		self._bytes_done[bin_path] = 0
+		self._bins_complete.discard(bin_path)
+
+	def binProgress(self, progress:BinProgress):
+		"""A worker says a bin is coming along"""
+
+		if progress.bin_path not in self._bin_sizes or progress.bin_path in self._bins_complete:
+			return
+
+		# Size may have changed since it was queued; go with what the worker saw
+		self._bin_sizes[progress.bin_path] = max(self._bin_sizes[progress.bin_path], progress.bin_size)
+		self._bytes_done[progress.bin_path] = max(self._bytes_done[progress.bin_path], progress.bytes_read)
+		self._objects_decoded[progress.bin_path] = progress.objects_decoded
+		if progress.object_count:
+			self._object_counts[progress.bin_path] = progress.object_count
+
+	def binComplete(self, bin_path:str):
+		"""A bin is done with (loaded or not)"""
+
+		if bin_path not in self._bin_sizes or bin_path in self._bins_complete:
+			return
+
+		if self._object_counts.get(bin_path) and self._objects_decoded.get(bin_path):
+			self._decoded_share_total += min(1.0, self._objects_decoded[bin_path] / self._object_counts[bin_path])
+			self._decoded_share_samples += 1
+
+		self._bytes_done[bin_path] = self._bin_sizes[bin_path]
+		self._bins_complete.add(bin_path)
+
+	def binCount(self) -> int:
+		return len(self._bin_sizes)
+
+	def binsComplete(self) -> int:
+		return len(self._bins_complete)
+
+	def isComplete(self) -> bool:
+		return self.binsComplete() == self.binCount()
+
+	def bytesTotal(self) -> int:
+		return sum(self._bin_sizes.values())
+
+	def bytesDone(self) -> int:
+		return sum(self._bytes_done.values())
+
+	def objectsDecoded(self) -> int:
+		return sum(self._objects_decoded.values())
+
+	def decodedShare(self) -> float:
+		"""Share of a bin's objects that parsing it is expected to get to"""
+		return self._decoded_share_total / self._decoded_share_samples if self._decoded_share_samples else 1.0
+
+	def binWorkDone(self, bin_path:str) -> float:
+		"""How far along a bin is, in bytes: reading it gets it so far, and decoding it the rest of the way"""
+
+		bin_size = self._bin_sizes.get(bin_path, 0)
+
+		if bin_path in self._bins_complete:
+			return bin_size
+
+		read_done = self._bytes_done.get(bin_path, 0) / bin_size if bin_size else 0.0
+
+		objects_expected = self._object_counts.get(bin_path, 0) * self.decodedShare()
+		decode_done = min(1.0, self._objects_decoded.get(bin_path, 0) / objects_expected) if objects_expected else 0.0
+
+		return bin_size * (PROGRESS_READ_SHARE * read_done + (1 - PROGRESS_READ_SHARE) * decode_done)
+
+	def workDone(self) -> float:
+		"""How far along the whole batch is, in (weighted) bytes, out of `bytesTotal()`"""
+		return sum(self.binWorkDone(bin_path) for bin_path in self._bin_sizes)
+
+	def elapsed(self) -> float:
+		return time.perf_counter() - self._time_started if self._time_started is not None else 0.0
+
+	def bytesPerSecond(self) -> float:
+		return self.bytesDone() / self.elapsed() if self.elapsed() > 0 else 0.0
+
+	def binsPerSecond(self) -> float:
+		return self.binsComplete() / self.elapsed() if self.elapsed() > 0 else 0.0
+
+	def secondsRemaining(self) -> float|None:
+		"""Time left at the going rate, or `None` if there's no going rate yet"""
+
+		work_done = self.workDone()
+
+		if not work_done or not self.elapsed():
+			return None
+
+		return (self.bytesTotal() - work_done) / (work_done / self.elapsed())
+
+	def summary(self) -> str:
+		"""The numbers, for the logs"""
+		return f"{self.binsComplete()} of {self.binCount()} bin(s), {self.bytesDone() / 1_000_000:.1f} of {self.bytesTotal() / 1_000_000:.1f} MB, {self.objectsDecoded()} object(s) decoded in {self.elapsed():.2f} s ({self.bytesPerSecond() / 1_000_000:.1f} MB/s, {self.binsPerSecond():.1f} bins/s)"
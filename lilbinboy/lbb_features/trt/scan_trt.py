@@ -0,0 +1,97 @@
+"""
+Find bins in folders (and their folders, and theirs...) as a stream, so they can be
+parsed while the rest of the project is still being looked through.
+"""
+
+import dataclasses, fnmatch, logging, os, typing
+import avbutils
+
+@dataclasses.dataclass(frozen=True)
+class BinScanOptions:
+	"""What to look for in folders, and how far down to look"""
+
+	include:tuple[str,...] = ("*.avb",)
+	"""File name patterns for bins"""
+
+	exclude:tuple[str,...] = ("Avid Attic", "Unity Attic", "*.lck", ".*")
+	"""File or folder name patterns to skip entirely"""
+
+	max_depth:int|None = 8
+	"""How many folders deep to go (0 = just the folder itself), or `None` for no limit"""
+
+	follow_symlinks:bool = False
+	"""Follow symlinked folders (loops are caught either way)"""
+
+	def isIncluded(self, name:str) -> bool:
+		return _matches_any(name, self.include) and not self.isExcluded(name)
+
+	def isExcluded(self, name:str) -> bool:
+		return _matches_any(name, self.exclude)
+
+DEFAULT_SCAN_OPTIONS = BinScanOptions()
+
+def _matches_any(name:str, patterns:typing.Iterable[str]) -> bool:
+	# Case-insensitive everywhere, since `Reel 1.AVB` is still a bin
+	return any(fnmatch.fnmatchcase(name.lower(), pattern.lower()) for pattern in patterns)
+
+def iter_bin_paths(paths:typing.Iterable[str], options:BinScanOptions=DEFAULT_SCAN_OPTIONS) -> typing.Iterator[str]:
+	"""
+	Yield bin paths from a mix of bins and folders.  Bins given directly are passed through as-is;
+	folders are walked (in human-sorted order, one folder at a time) and their bins yielded as they're found.
+	"""
+
+	visited_dirs:set[tuple[int,int]|str] = set()
+
+	for path in paths:
+		if os.path.isdir(path):
+			yield from _walk(path, options, visited_dirs)
+		else:
+			yield path
+
+def _dir_key(dir_path:str) -> tuple[int,int]|str:
+	"""Something to recognize a folder by, however it was reached: device and inode, or its real path on filesystems without inodes"""
+
+	dir_stat = os.stat(dir_path)
+
+	if dir_stat.st_ino:
+		return (dir_stat.st_dev, dir_stat.st_ino)
+
+	# Some SMB and FAT mounts report 0 for everything
+	return os.path.normcase(os.path.realpath(dir_path))
+
+def _walk(root_path:str, options:BinScanOptions, visited_dirs:set[tuple[int,int]|str]) -> typing.Iterator[str]:
+
+	# Depth-first, with a stack rather than recursion so deep projects can't blow it up
+	dirs_pending:list[tuple[str,int]] = [(root_path, 0)]
+
+	while dirs_pending:
+
+		dir_path, depth = dirs_pending.pop()
+
+		try:
+			dir_key = _dir_key(dir_path)
+			if dir_key in visited_dirs:
+				continue
+			visited_dirs.add(dir_key)
+
+			with os.scandir(dir_path) as dir_entries:
+				entries = sorted(dir_entries, key=lambda e: avbutils.human_sort(e.name))
+
+		except OSError as e:
+			logging.getLogger(__name__).warning("Couldn't look in %s: %s", dir_path, e)
+			continue
+
+		subdirs = []
+
+		for entry in entries:
+			try:
+				if entry.is_dir(follow_symlinks=options.follow_symlinks):
+					if not options.isExcluded(entry.name) and (options.max_depth is None or depth < options.max_depth):
+						subdirs.append((entry.path, depth + 1))
+				elif options.isIncluded(entry.name) and entry.is_file():
+					yield entry.path
+			except OSError as e:
+				logging.getLogger(__name__).debug("Skipping %s: %s", entry.path, e)
+
+		# Reversed onto the stack, so they come back off in order
+		dirs_pending.extend(reversed(subdirs))
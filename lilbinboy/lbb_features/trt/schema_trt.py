@@ -0,0 +1,218 @@
+"""
+Per-sequence rows and TRT summaries, shaped just like the TRT panel's JSON and
+CSV/TSV exports, but without a view model (or QtWidgets) in sight.
+
+NOTE: Formatting here needs to stay in step with the items in `wdg_sequence_treeview`
+"""
+
+import csv, dataclasses, typing
+from datetime import timezone
+from PySide6 import QtCore, QtGui
+from timecode import Timecode
+from ...lbb_features.trt import calc_trt
+
+DATETIME_FORMAT = "dd MMM yyyy hh:mm:ss AP"
+
+@dataclasses.dataclass(frozen=True)
+class SequenceValue:
+	"""One field of one sequence"""
+
+	display:str
+	"""As shown in the list (and delimited exports)"""
+
+	raw:typing.Any
+	"""Raw value, which gets summed for totals"""
+
+	json:typing.Any
+	"""As written to JSON exports"""
+
+def _string_value(value:str) -> SequenceValue:
+	return SequenceValue(str(value), str(value), str(value))
+
+def _numeric_value(value:int) -> SequenceValue:
+	return SequenceValue(str(value), value, value)
+
+def _timecode_value(tc:Timecode, display:str|None=None) -> SequenceValue:
+
+	display = str(tc) if display is None else display
+
+	return SequenceValue(display, tc, {
+		"type": "timecode",
+		"frames": tc.frame_number,
+		"rate": tc.rate,
+		"formatted": display.strip()
+	})
+
+def _duration_value(tc:Timecode) -> SequenceValue:
+	return _timecode_value(tc, calc_trt.format_duration(tc))
+
+def _feet_frames_value(frames:int) -> SequenceValue:
+
+	display = calc_trt.format_feet_frames(frames)
+
+	return SequenceValue(display, frames, {
+		"type":      "feet_frames",
+		"format":    "35mm",
+		"perfs":     4,
+		"frames":    frames,
+		"formatted": display.strip()
+	})
+
+def _datetime_value(date_time) -> SequenceValue:
+
+	q_date_time = QtCore.QDateTime(date_time.astimezone(timezone.utc))
+	display = q_date_time.toLocalTime().toString(DATETIME_FORMAT)
+
+	return SequenceValue(display, q_date_time, {
+		"type": "datetime",
+		"timestamp": q_date_time.toSecsSinceEpoch(),
+		"formatted": display
+	})
+
+def _color_value(clip_color) -> SequenceValue:
+
+	color = QtGui.QColor.fromRgba64(*clip_color.as_rgb16(), clip_color.max_16b()) if clip_color else QtGui.QColor()
+
+	if not color.isValid():
+		return SequenceValue("", color, None)
+
+	color_64 = color.rgba64()
+
+	return SequenceValue("", color, {
+		"type": "color",
+		"rgb16": [color_64.red(), color_64.green(), color_64.blue()],
+		"rgb8": [color.red(), color.green(), color.blue()],
+		"hex": color.name()
+	})
+
+def _path_value(bin_path:str) -> SequenceValue:
+
+	file_info = QtCore.QFileInfo(bin_path)
+	return SequenceValue(file_info.fileName(), file_info, QtCore.QDir.toNativeSeparators(file_info.absoluteFilePath()))
+
+def _lock_value(bin_lock) -> SequenceValue:
+
+	lock_name = bin_lock.name if bin_lock else ""
+	return SequenceValue(lock_name, bin_lock, lock_name or None)
+
+def sequence_row(timeline:calc_trt.TrimmedTimeline) -> dict[str, SequenceValue]:
+	"""All fields for a trimmed timeline"""
+
+	timeline_info = timeline.timelineInfo()
+	extents = timeline.timelineTimecodeExtents()
+	trimmed = timeline.timelineTimecodeTrimmed()
+
+	return {
+		"sequence_name":           _string_value(timeline.timelineName()),
+		"sequence_color":          _color_value(timeline_info.timeline_color),
+		"sequence_start_tc":       _timecode_value(extents.start),
+		"duration_total_tc":       _duration_value(extents.duration),
+		"duration_total_ff":       _feet_frames_value(extents.duration.frame_number),
+		"duration_total_frames":   _numeric_value(extents.duration.frame_number),
+		"duration_trimmed_tc":     _duration_value(trimmed.duration),
+		"duration_trimmed_ff":     _feet_frames_value(trimmed.duration.frame_number),
+		"duration_trimmed_frames": _numeric_value(trimmed.duration.frame_number),
+		"head_trimmed_tc":         _duration_value(timeline.ffoaOffset()),
+		"head_trimmed_ff":         _feet_frames_value(timeline.ffoaOffset().frame_number),
+		"head_trimmed_frames":     _numeric_value(timeline.ffoaOffset().frame_number),
+		"tail_trimmed_tc":         _duration_value(timeline.lfoaOffset()),
+		"tail_trimmed_ff":         _feet_frames_value(timeline.lfoaOffset().frame_number),
+		"tail_trimmed_frames":     _numeric_value(timeline.lfoaOffset().frame_number),
+		"ffoa_tc":                 _timecode_value(trimmed.start),
+		"ffoa_ff":                 _feet_frames_value(trimmed.start.frame_number),
+		"lfoa_tc":                 _timecode_value(trimmed.end),
+		"lfoa_ff":                 _feet_frames_value(timeline.ffoaOffset().frame_number + trimmed.duration.frame_number),
+		"date_modified":           _datetime_value(timeline_info.date_modified),
+		"date_created":            _datetime_value(timeline_info.date_created),
+		"bin_path":                _path_value(timeline_info.bin_path),
+		"bin_lock":                _lock_value(timeline_info.bin_lock),
+	}
+
+def format_json(timelines:list[calc_trt.TrimmedTimeline], trim_total:Timecode, rate:int, fields:list[calc_trt.SequenceField]|None=None) -> dict:
+	"""Format a TRT and its sequences as the JSON export does"""
+
+	fields = fields or calc_trt.SEQUENCE_FIELDS
+	total_runtime = calc_trt.total_runtime(timelines, trim_total, rate)
+
+	gen_time = QtCore.QDateTime.currentDateTime()
+
+	json_formatted = {
+		"schema_version": 1,
+		"total_runtime_tc": {
+			"type":"timecode",
+			"frames": total_runtime.frame_number,
+			"rate": total_runtime.rate,
+			"formatted": str(total_runtime),
+		},
+		"total_runtime_ff": {
+			"type": "feet_frames",
+			"format": "35mm",
+			"perfs": 4,
+			"frames": total_runtime.frame_number,
+			"formatted": calc_trt.format_feet_frames(total_runtime.frame_number)
+		},
+		"total_adjustment_tc": {
+			"type": "timecode",
+			"frames": trim_total.frame_number,
+			"rate": trim_total.rate,
+			"formatted": str(trim_total)
+		},
+		"total_adjustment_ff": {
+			"type": "feet_frames",
+			"format": "35mm",
+			"perfs": 4,
+			"frames": trim_total.frame_number,
+			"formatted": calc_trt.format_feet_frames(trim_total.frame_number)
+		},
+		"datetime_output": {
+			"type": "datetime",
+			"timestamp": gen_time.toSecsSinceEpoch(),
+			"formatted": gen_time.toLocalTime().toString(DATETIME_FORMAT)
+		}
+	}
+
+	json_sequences:list[dict] = []
+
+	for timeline in timelines:
+		row = sequence_row(timeline)
+		json_sequences.append({field.field: row[field.field].json for field in fields})
+
+	json_formatted["sequence_count"] = len(json_sequences)
+	json_formatted["sequences"] = json_sequences
+
+	return json_formatted
+
+def write_delimited(timelines:list[calc_trt.TrimmedTimeline], file_handle:typing.TextIO, format:str, fields:list[calc_trt.SequenceField]|None=None):
+	"""Write sequences (and a totals row) as the CSV/TSV export does"""
+
+	fields = fields or calc_trt.SEQUENCE_FIELDS
+
+	# Sequence color gets no header label, same as in the list
+	headers = ["" if field.field == "sequence_color" else field.name for field in fields]
+
+	rows:list[dict[str,typing.Any]] = []
+	row_total:dict[str,typing.Any] = {}
+
+	for timeline in timelines:
+		row = sequence_row(timeline)
+		row_data = {}
+
+		for header, field in zip(headers, fields):
+			row_data[header] = row[field.field].display.strip()
+
+			if field.is_accumulating_value:
+				if header not in row_total:
+					row_total[header] = row[field.field].raw
+				else:
+					row_total[header] += row[field.field].raw
+
+		rows.append(row_data)
+
+	if row_total:
+		row_total[headers[0]] = "Totals"
+		rows.append(row_total)
+
+	writer = csv.DictWriter(file_handle, fieldnames=headers, delimiter="\t" if format=="tsv" else ",")
+	writer.writeheader()
+	for row in rows:
+		writer.writerow(row)
@@ -0,0 +1,390 @@
+"""
+Serve the current TRT to other tools over a local HTTP port (or Unix socket).
+
+Responses are rendered once on the GUI thread whenever something changes, and served
+as-is from then on with an `ETag`, so a room full of dashboards polling every second
+costs us a dictionary lookup apiece.  Nobody out here gets to trigger a bin parse.
+
+	GET /trt             Total runtime, adjustment and counts
+	GET /sequences       The above, plus every sequence (same as the JSON export)
+	GET /bins            Bins in use, and what the parse cache knows about them
+	GET /snapshots       Saved snapshots
+	GET /snapshots/<id>  A saved snapshot and its sequences
+"""
+
+import dataclasses, hashlib, http, http.server, json, logging, os, socket, socketserver, threading, typing
+from PySide6 import QtCore
+from ...lbb_features.trt import calc_trt, schema_trt, session_cache
+from ...lbb_features.trt.db_hist_sqlite import SnapshotDatabaseManager
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+"""Where to listen unless told otherwise: `host:port`, `port`, or `unix:/path/to.sock`"""
+
+VOLATILE_KEYS = ("datetime_output",)
+"""Top-level keys that change on every render, and so are left out of the `ETag`"""
+
+ServiceDocuments = dict[str, dict|list]
+"""Response bodies (to be JSON'd) by request path"""
+
+@dataclasses.dataclass(frozen=True)
+class CachedResponse:
+	"""A response, rendered and ready to go"""
+
+	body:bytes
+	etag:str
+
+	@classmethod
+	def fromDocument(cls, document:dict|list) -> "CachedResponse":
+
+		fingerprint_document = {k:v for k,v in document.items() if k not in VOLATILE_KEYS} if isinstance(document, dict) else document
+		etag = '"' + hashlib.sha1(json.dumps(fingerprint_document, sort_keys=True, default=str).encode("utf-8")).hexdigest() + '"'
+
+		return cls(body=json.dumps(document, default=str).encode("utf-8"), etag=etag)
+
+	def matches(self, if_none_match:str|None) -> bool:
+		"""The client already has this (per `If-None-Match`)"""
+
+		if not if_none_match:
+			return False
+
+		client_etags = [e.strip().removeprefix("W/") for e in if_none_match.split(",")]
+		return "*" in client_etags or self.etag in client_etags
+
+
+class TRTServiceResponseCache:
+	"""Rendered responses, swapped in whole from the GUI thread and read from the server threads"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._live_responses:dict[str, CachedResponse] = {}
+		self._snapshot_responses:dict[str, CachedResponse] = {}
+
+	def _render(self, documents:ServiceDocuments, previous:dict[str, CachedResponse]) -> dict[str, CachedResponse]:
+
+		responses = {}
+
+		for path, document in documents.items():
+			response = CachedResponse.fromDocument(document)
+			# Keep the old body if nothing (but the timestamp) changed, so it matches its ETag
+			responses[path] = previous[path] if path in previous and previous[path].etag == response.etag else response
+
+		return responses
+
+	def publishLive(self, documents:ServiceDocuments):
+		responses = self._render(documents, self._live_responses)
+		with self._lock:
+			self._live_responses = responses
+
+	def publishSnapshots(self, documents:ServiceDocuments):
+		responses = self._render(documents, self._snapshot_responses)
+		with self._lock:
+			self._snapshot_responses = responses
+
+	def response(self, path:str) -> CachedResponse|None:
+		with self._lock:
+			return self._live_responses.get(path) or self._snapshot_responses.get(path)
+
+
+class TRTServiceRequestHandler(http.server.BaseHTTPRequestHandler):
+	"""Hands out cached responses, and that's all"""
+
+	server_version = "LilBinBoyTRT/1"
+
+	def address_string(self) -> str:
+		# Unix sockets don't have much of an address
+		return self.client_address[0] if isinstance(self.client_address, tuple) and self.client_address else "local"
+
+	def log_message(self, format:str, *args):
+		logging.getLogger(__name__).debug("%s - " + format, self.address_string(), *args)
+
+	def _sendCached(self, include_body:bool):
+
+		path = self.path.split("?", 1)[0].rstrip("/") or "/"
+		response = self.server.response_cache.response(path)
+
+		if response is None:
+			self.send_error(http.HTTPStatus.NOT_FOUND, f"Nothing at {path}")
+			return
+
+		if response.matches(self.headers.get("If-None-Match")):
+			self.send_response(http.HTTPStatus.NOT_MODIFIED)
+			self.send_header("ETag", response.etag)
+			self.send_header("Cache-Control", "no-cache")
+			self.end_headers()
+			return
+
+		self.send_response(http.HTTPStatus.OK)
+		self.send_header("Content-Type", "application/json; charset=utf-8")
+		self.send_header("Content-Length", str(len(response.body)))
+		self.send_header("ETag", response.etag)
+		self.send_header("Cache-Control", "no-cache")
+		self.end_headers()
+
+		if include_body:
+			self.wfile.write(response.body)
+
+	def do_GET(self):
+		self._sendCached(include_body=True)
+
+	def do_HEAD(self):
+		self._sendCached(include_body=False)
+
+
+class TRTServiceTCPServer(http.server.ThreadingHTTPServer):
+	daemon_threads = True
+
+	def __init__(self, server_address, response_cache:TRTServiceResponseCache):
+		self.response_cache = response_cache
+		super().__init__(server_address, TRTServiceRequestHandler)
+
+if hasattr(socket, "AF_UNIX"):
+
+	class TRTServiceUnixServer(socketserver.ThreadingUnixStreamServer):
+		daemon_threads = True
+
+		def __init__(self, server_address:str, response_cache:TRTServiceResponseCache):
+			self.response_cache = response_cache
+			super().__init__(server_address, TRTServiceRequestHandler)
+
+		def server_close(self):
+			super().server_close()
+			try:
+				os.unlink(self.server_address)
+			except OSError:
+				pass
+
+def parse_address(address:str) -> tuple[str, int]|str:
+	"""`(host, port)` for TCP, or a socket path for `unix:/path/to.sock`"""
+
+	address = address.strip()
+
+	if address.startswith("unix:"):
+		return address.removeprefix("unix:")
+
+	host, _, port = address.rpartition(":")
+
+	try:
+		return (host or "127.0.0.1", int(port))
+	except ValueError:
+		raise ValueError(f"Invalid service address \"{address}\" (use host:port, port, or unix:/path/to.sock)")
+
+
+def live_documents(timelines:list[calc_trt.TrimmedTimeline], trim_total, rate:int, bin_stamps:dict[str, session_cache.BinStamp|None]) -> ServiceDocuments:
+	"""Responses for the current TRT, its sequences, and its bins"""
+
+	sequences_document = schema_trt.format_json(timelines, trim_total, rate)
+	trt_document = {k:v for k,v in sequences_document.items() if k != "sequences"}
+
+	bins_used:dict[str, list[calc_trt.TrimmedTimeline]] = {}
+	for timeline in timelines:
+		# The model's timelines know which bin they're from, whatever path they were read by
+		bin_key = timeline.binKey() if hasattr(timeline, "binKey") else session_cache.normalized_bin_path(timeline.timelineInfo().bin_path)
+		bins_used.setdefault(bin_key, []).append(timeline)
+
+	bins_document = {"bins": []}
+	for bin_path, bin_timelines in bins_used.items():
+		stamp = bin_stamps.get(bin_path)
+		bin_lock = bin_timelines[0].timelineInfo().bin_lock
+		bins_document["bins"].append({
+			"bin_path":       QtCore.QDir.toNativeSeparators(bin_path),
+			"sequence_count": len(bin_timelines),
+			"bin_lock":       bin_lock.name if bin_lock else None,
+			"is_cached":      any(getattr(t, "isCached", lambda: False)() for t in bin_timelines),
+			"stamp":          {"size": stamp[0], "mtime_ns": stamp[1]} if stamp else None,
+		})
+
+	trt_document["bin_count"] = len(bins_used)
+	trt_document["locked_bin_count"] = sum(1 for b in bins_document["bins"] if b["bin_lock"])
+	bins_document["bin_count"] = len(bins_used)
+
+	return {
+		"/trt":       trt_document,
+		"/sequences": sequences_document,
+		"/bins":      bins_document,
+	}
+
+def snapshot_documents(db_manager:SnapshotDatabaseManager) -> ServiceDocuments:
+	"""Responses for the snapshot list, and each snapshot"""
+
+	query_labels = db_manager.getModelQuery()
+
+	snapshots:dict[int, dict] = {}
+	records = []
+
+	while query_labels.next():
+		record = query_labels.record()
+		records.append(record)
+
+		id_snapshot = int(record.value("id_snapshot"))
+		snapshots[id_snapshot] = {
+			"id_snapshot":             id_snapshot,
+			"label_name":              record.value("label_name"),
+			"label_color":             record.value("label_color") or None,
+			"rate":                    record.value("rate"),
+			"duration_trimmed_frames": record.value("duration_trimmed_frames"),
+			"duration_trimmed_tc":     record.value("duration_trimmed_tc"),
+			"duration_trimmed_ff":     record.value("duration_trimmed_ff"),
+			"duration_offset_frames":  record.value("duration_offset_frames"),
+			"is_current":              bool(record.value("is_current")),
+			"datetime_created":        record.value("datetime_created_local"),
+		}
+
+	sequences:dict[int, list[dict]] = {id_snapshot: [] for id_snapshot in snapshots}
+
+	if records:
+		query_sequences = db_manager.getSnapshotRecords(records)
+		while query_sequences.next():
+			sequences.setdefault(int(query_sequences.value("id_snapshot")), []).append({
+				"sequence_name":           query_sequences.value("sequence_name"),
+				"sequence_color":          query_sequences.value("sequence_color") or None,
+				"duration_trimmed_tc":     query_sequences.value("duration_trimmed_tc"),
+				"duration_trimmed_ff":     query_sequences.value("duration_trimmed_ff"),
+				"duration_trimmed_frames": query_sequences.value("duration_trimmed_frames"),
+			})
+
+	documents:ServiceDocuments = {"/snapshots": {"snapshot_count": len(snapshots), "snapshots": list(snapshots.values())}}
+
+	for id_snapshot, snapshot in snapshots.items():
+		documents[f"/snapshots/{id_snapshot}"] = {**snapshot, "sequence_count": len(sequences[id_snapshot]), "sequences": sequences[id_snapshot]}
+
+	return documents
+
+
+class TRTQueryService(QtCore.QObject):
+	"""Local query service for the TRT.  Sources are called on the GUI thread; requests never are."""
+
+	DEFAULT_PUBLISH_DELAY:int = 250
+	"""Milliseconds to let changes settle before re-rendering"""
+
+	sig_service_started = QtCore.Signal(str)
+	"""Listening, at this address"""
+
+	sig_service_stopped = QtCore.Signal()
+	"""No longer listening"""
+
+	def __init__(self, live_source:typing.Callable[[], ServiceDocuments], snapshot_source:typing.Callable[[], ServiceDocuments]|None=None, *args, **kwargs):
+
+		super().__init__(*args, **kwargs)
+
+		self._live_source = live_source
+		self._snapshot_source = snapshot_source
+
+		self._response_cache = TRTServiceResponseCache()
+		self._server:socketserver.BaseServer|None = None
+		self._server_thread:threading.Thread|None = None
+		self._address = ""
+
+		self._timer_publish_live = QtCore.QTimer(self, singleShot=True, interval=self.DEFAULT_PUBLISH_DELAY)
+		self._timer_publish_live.timeout.connect(self.publishLive)
+
+		self._timer_publish_snapshots = QtCore.QTimer(self, singleShot=True, interval=self.DEFAULT_PUBLISH_DELAY)
+		self._timer_publish_snapshots.timeout.connect(self.publishSnapshots)
+
+	def isRunning(self) -> bool:
+		return self._server is not None
+
+	def address(self) -> str:
+		"""Where we're listening (empty if we're not)"""
+		return self._address
+
+	def responseCache(self) -> TRTServiceResponseCache:
+		return self._response_cache
+
+	def start(self, address:str=DEFAULT_ADDRESS) -> bool:
+		"""Start listening.  Returns `False` (and logs why) if that didn't work out."""
+
+		if self.isRunning():
+			self.stop()
+
+		try:
+			server_address = parse_address(address)
+
+			if isinstance(server_address, str):
+				if not hasattr(socket, "AF_UNIX"):
+					raise ValueError("Unix sockets aren't available on this system")
+				# A stale socket from a crash would block us forever
+				if os.path.exists(server_address):
+					os.unlink(server_address)
+				self._server = TRTServiceUnixServer(server_address, self._response_cache)
+				self._address = "unix:" + server_address
+			else:
+				self._server = TRTServiceTCPServer(server_address, self._response_cache)
+				self._address = "{}:{}".format(*self._server.server_address[:2])
+
+		except (OSError, ValueError) as e:
+			logging.getLogger(__name__).error("Couldn't start the TRT service at %s: %s", address, e)
+			self._server = None
+			self._address = ""
+			return False
+
+		# Have something to serve before anyone asks
+		self.publishLive()
+		self.publishSnapshots()
+
+		self._server_thread = threading.Thread(target=self._server.serve_forever, name="lbb_trt_service", daemon=True)
+		self._server_thread.start()
+
+		logging.getLogger(__name__).info("TRT service listening at %s", self._address)
+		self.sig_service_started.emit(self._address)
+		return True
+
+	@QtCore.Slot()
+	def stop(self):
+		"""Stop listening"""
+
+		if not self.isRunning():
+			return
+
+		self._timer_publish_live.stop()
+		self._timer_publish_snapshots.stop()
+
+		self._server.shutdown()
+		self._server.server_close()
+		self._server_thread.join()
+
+		logging.getLogger(__name__).info("TRT service at %s stopped", self._address)
+
+		self._server = None
+		self._server_thread = None
+		self._address = ""
+
+		self.sig_service_stopped.emit()
+
+	@QtCore.Slot()
+	def invalidateLive(self):
+		"""The TRT or its sequences changed; re-render once things settle"""
+
+		if self.isRunning():
+			self._timer_publish_live.start()
+
+	@QtCore.Slot()
+	def invalidateSnapshots(self):
+		"""Snapshots came or went; re-render once things settle"""
+
+		if self.isRunning() and self._snapshot_source is not None:
+			self._timer_publish_snapshots.start()
+
+	@QtCore.Slot()
+	def publishLive(self):
+		"""Render the live responses now"""
+
+		self._timer_publish_live.stop()
+
+		try:
+			self._response_cache.publishLive(self._live_source())
+		except Exception as e:
+			logging.getLogger(__name__).error("Couldn't render TRT service responses: %s", e)
+
+	@QtCore.Slot()
+	def publishSnapshots(self):
+		"""Render the snapshot responses now"""
+
+		self._timer_publish_snapshots.stop()
+
+		if self._snapshot_source is None:
+			return
+
+		try:
+			self._response_cache.publishSnapshots(self._snapshot_source())
+		except Exception as e:
+			logging.getLogger(__name__).error("Couldn't render TRT service snapshot responses: %s", e)
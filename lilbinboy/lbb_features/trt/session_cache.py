@@ -0,0 +1,123 @@
+"""
+Keep the last session's parsed bins around, so they can be shown right away on launch
+and quietly checked against the real bins afterwards
+"""
+
+import os, pickle, dataclasses, logging, typing
+from PySide6 import QtCore
+from ...lbb_features.trt import logic_trt
+from ...lbb_features.trt.index_trt import BinStamp, bin_stamp
+
+def normalized_bin_path(bin_path:str) -> str:
+	"""Bin path as used for cache keys"""
+	return QtCore.QFileInfo(bin_path).absoluteFilePath()
+
+
+@dataclasses.dataclass(frozen=True)
+class CachedBinInfo:
+	"""Parsed timelines for a bin, as they were when the bin had a given stamp"""
+
+	stamp:BinStamp|None
+	timelines:list[logic_trt.TimelineInfo]
+
+
+class TRTSessionCache:
+	"""Cache of parsed bins from the last session, by canonical path (see `identity_trt`)"""
+
+	CACHE_VERSION:int = 1
+	"""Bump this when `TimelineInfo` changes shape, to toss out old caches"""
+
+	def __init__(self):
+		self._bins:dict[str, CachedBinInfo] = {}
+
+	@classmethod
+	def load(cls, cache_path:str) -> "TRTSessionCache":
+		"""Load a cache from disk.  A missing or unreadable cache just comes back empty."""
+
+		session_cache = cls()
+
+		if not os.path.isfile(cache_path):
+			return session_cache
+
+		try:
+			with open(cache_path, "rb") as cache_file:
+				cache_data = pickle.load(cache_file)
+
+			if cache_data.get("version") != cls.CACHE_VERSION:
+				logging.getLogger(__name__).info("Ignoring session cache from a different version (%s)", cache_data.get("version"))
+				return session_cache
+
+			session_cache._bins = dict(cache_data.get("bins", {}))
+
+		except Exception as e:
+			logging.getLogger(__name__).warning("Couldn't read session cache at %s: %s", cache_path, e)
+
+		return session_cache
+
+	def save(self, cache_path:str):
+		"""Write the cache to disk"""
+
+		temp_path = cache_path + ".tmp"
+
+		try:
+			with open(temp_path, "wb") as cache_file:
+				pickle.dump({"version": self.CACHE_VERSION, "bins": self._bins}, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+			os.replace(temp_path, cache_path)
+
+		except Exception as e:
+			logging.getLogger(__name__).error("Couldn't save session cache to %s: %s", cache_path, e)
+
+	def binPaths(self) -> list[str]:
+		return list(self._bins.keys())
+
+	def contains(self, bin_path:str) -> bool:
+		return normalized_bin_path(bin_path) in self._bins
+
+	def binInfo(self, bin_path:str) -> CachedBinInfo|None:
+		return self._bins.get(normalized_bin_path(bin_path))
+
+	def setBinInfo(self, bin_path:str, stamp:BinStamp|None, timelines:list[logic_trt.TimelineInfo]):
+		self._bins[normalized_bin_path(bin_path)] = CachedBinInfo(stamp=stamp, timelines=list(timelines))
+
+	def removeBin(self, bin_path:str):
+		self._bins.pop(normalized_bin_path(bin_path), None)
+
+	def prune(self, keep_bin_paths:list[str]):
+		"""Drop any bins not in `keep_bin_paths`"""
+
+		keep_bin_paths = set(normalized_bin_path(p) for p in keep_bin_paths)
+		self._bins = {p: info for p, info in self._bins.items() if p in keep_bin_paths}
+
+
+class TRTSessionRevalidationJob(QtCore.QRunnable):
+	"""Check cached bins against the ones on disk, in the background since the disks may be far away"""
+
+	class TRTSessionRevalidationSignals(QtCore.QObject):
+		sig_revalidation_complete = QtCore.Signal(list, list)
+		"""Bins that have changed, and bins that are still good"""
+
+	def __init__(self, cached_stamps:dict[str, BinStamp|None], missing_bin_paths:typing.Iterable[str]=()):
+		"""`missing_bin_paths` were gone last time, and aren't a change if they still are"""
+		super().__init__()
+		self._cached_stamps = cached_stamps
+		self._missing_bin_paths = set(missing_bin_paths)
+		self._signals = self.TRTSessionRevalidationSignals()
+
+	def signals(self) -> TRTSessionRevalidationSignals:
+		return self._signals
+
+	def run(self):
+
+		changed_bins   = []
+		unchanged_bins = []
+
+		for bin_path, cached_stamp in self._cached_stamps.items():
+			current_stamp = bin_stamp(bin_path)
+			if current_stamp is None and bin_path in self._missing_bin_paths:
+				unchanged_bins.append(bin_path)
+			elif cached_stamp is None or current_stamp != cached_stamp:
+				changed_bins.append(bin_path)
+			else:
+				unchanged_bins.append(bin_path)
+
+		self.signals().sig_revalidation_complete.emit(changed_bins, unchanged_bins)
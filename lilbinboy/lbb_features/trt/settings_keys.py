@@ -24,6 +24,39 @@ class TRTSettingsKeys(StrEnum):
 	
 	TRIM_TOTAL_DURATION = "trim_settings/trim_total"
 
+	AUTO_SNAPSHOT_ENABLED = "snapshots/auto_enabled"
+	AUTO_SNAPSHOT_INTERVAL = "snapshots/auto_interval_msec"
+	AUTO_SNAPSHOT_SETTLE_DELAY = "snapshots/auto_settle_delay_msec"
+	SNAPSHOT_RETENTION_KEEP_ALL_DAYS = "snapshots/retention_keep_all_days"
+	SNAPSHOT_RETENTION_KEEP_DAILY_DAYS = "snapshots/retention_keep_daily_days"
+
+	BIN_READ_MODE = "bin_reading/read_mode"
+	PARSE_BACKEND = "bin_reading/parse_backend"
+	PARSE_WORKERS = "bin_reading/parse_workers"
+	PARSE_STATS = "bin_reading/parse_stats"
+	BIN_RETRY_MAX = "bin_reading/retry_max"
+	BIN_RETRY_DELAY = "bin_reading/retry_delay_msec"
+	PARSE_MEMORY_BUDGET = "bin_reading/memory_budget_mb"
+	PARSE_RECYCLE_RSS = "bin_reading/worker_recycle_mb"
+
+	BIN_INDEX_READ_ENABLED = "bin_index/read_enabled"
+	BIN_INDEX_WRITE_ENABLED = "bin_index/write_enabled"
+	BIN_INDEX_CACHE_DIR = "bin_index/cache_dir"
+
+	FOLDER_SCAN_INCLUDE = "folder_scan/include"
+	FOLDER_SCAN_EXCLUDE = "folder_scan/exclude"
+	FOLDER_SCAN_MAX_DEPTH = "folder_scan/max_depth"
+
+	WATCH_ENABLED = "watch/enabled"
+	WATCH_SETTLE_DELAY = "watch/settle_delay_msec"
+	WATCH_POLL_INTERVAL = "watch/poll_interval_msec"
+
+	LOCK_SCAN_ENABLED = "locks/scan_enabled"
+	LOCK_SCAN_INTERVAL = "locks/scan_interval_msec"
+
+	SERVICE_ENABLED = "service/enabled"
+	SERVICE_ADDRESS = "service/address"
+
 	BINS_LIST = "saved_state/bin_paths"
 	
 	LAST_BIN = "saved_state/last_bin"
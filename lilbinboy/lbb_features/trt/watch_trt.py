@@ -0,0 +1,395 @@
+"""
+Watch the loaded bins and let us know which ones actually changed on disk.
+
+Local bins are watched with `QFileSystemWatcher` (and their folders, since Avid saves by
+swapping in a new file).  Bins on network mounts don't reliably send change notifications,
+so those get a cheap stat every so often instead.  Either way, nobody gets told about a bin
+until its stamp has really changed, and a burst of writes from one save is one change.
+
+Locks get their own, much cheaper, lookout: `TRTBinLockMonitor`.
+"""
+
+import logging, os, typing
+from PySide6 import QtCore
+from ...lbb_features.trt import session_cache, locks_trt
+
+NETWORK_FILESYSTEMS = {"cifs", "smb2", "smb3", "smbfs", "nfs", "nfs4", "afpfs", "webdav", "davfs", "fuse.sshfs", "9p"}
+"""Filesystem types (as `QStorageInfo` reports them) that get polled rather than watched"""
+
+def is_network_path(path:str) -> bool:
+	"""Best guess as to whether a path lives on a network mount"""
+
+	if path.startswith("//") or path.startswith("\\\\"):
+		return True
+
+	storage_info = QtCore.QStorageInfo(path)
+	return storage_info.isValid() and bytes(storage_info.fileSystemType()).decode(errors="ignore").lower() in NETWORK_FILESYSTEMS
+
+
+class TRTBinWatcher(QtCore.QObject):
+	"""Keep an eye on bins, and report the ones whose stamps change"""
+
+	DEFAULT_SETTLE_DELAY:int = 1500
+	"""Milliseconds to wait after the last filesystem event before checking stamps"""
+
+	DEFAULT_POLL_INTERVAL:int = 5000
+	"""Milliseconds between stat checks of bins on network mounts"""
+
+	sig_bins_changed = QtCore.Signal(list)
+	"""Bins whose stamps no longer match what was loaded"""
+
+	def __init__(self, stamp_source:typing.Callable[[str], session_cache.BinStamp|None], *args, **kwargs):
+		"""`stamp_source` gives the stamp a bin had when it was last loaded"""
+
+		super().__init__(*args, **kwargs)
+
+		self._stamp_source = stamp_source
+		self._is_enabled = False
+
+		self._local_bins:set[str] = set()
+		self._polled_bins:set[str] = set()
+		self._network_dirs:dict[str, bool] = {}
+		"""Folders we've already checked for network-ness"""
+
+		self._dirty_bins:set[str] = set()
+		"""Bins with filesystem events since the last check"""
+
+		self._reloading_bins:set[str] = set()
+		"""Bins already reported as changed, and not yet reloaded"""
+
+		self._failed_stamps:dict[str, session_cache.BinStamp|None] = {}
+		"""Bins that couldn't be reloaded, and the stamps they had at the time; no sense trying again until those change"""
+
+		self._is_checking = False
+
+		self._pool = QtCore.QThreadPool.globalInstance()
+
+		self._watcher = QtCore.QFileSystemWatcher(self)
+		self._watcher.fileChanged.connect(self.fileChanged)
+		self._watcher.directoryChanged.connect(self.directoryChanged)
+
+		self._timer_settle = QtCore.QTimer(self, singleShot=True, interval=self.DEFAULT_SETTLE_DELAY)
+		self._timer_settle.timeout.connect(self.checkDirtyBins)
+
+		self._timer_poll = QtCore.QTimer(self, interval=self.DEFAULT_POLL_INTERVAL)
+		self._timer_poll.timeout.connect(self.pollBins)
+
+	def isEnabled(self) -> bool:
+		return self._is_enabled
+
+	@QtCore.Slot(bool)
+	def setEnabled(self, is_enabled:bool):
+		"""Start or stop watching"""
+
+		if bool(is_enabled) == self._is_enabled:
+			return
+
+		self._is_enabled = bool(is_enabled)
+
+		if self._is_enabled:
+			self._updateWatches()
+		else:
+			self._clearWatches()
+			self._dirty_bins.clear()
+			self._timer_settle.stop()
+
+		logging.getLogger(__name__).debug("Bin watching %s (%i local, %i polled)", "enabled" if self._is_enabled else "disabled", len(self._local_bins), len(self._polled_bins))
+
+	def settleDelay(self) -> int:
+		return self._timer_settle.interval()
+
+	def setSettleDelay(self, delay_msec:int):
+		self._timer_settle.setInterval(max(int(delay_msec), 0))
+
+	def pollInterval(self) -> int:
+		return self._timer_poll.interval()
+
+	def setPollInterval(self, interval_msec:int):
+		self._timer_poll.setInterval(max(int(interval_msec), 500))
+
+	def binPaths(self) -> list[str]:
+		return sorted(self._local_bins | self._polled_bins)
+
+	@QtCore.Slot(list)
+	def setBinPaths(self, bin_paths:list[str]):
+		"""Set the bins to watch"""
+
+		bin_paths = set(session_cache.normalized_bin_path(p) for p in bin_paths)
+
+		# This gets called a lot while bins are loading
+		if bin_paths == self._local_bins | self._polled_bins:
+			return
+
+		local_bins  = set()
+		polled_bins = set()
+
+		for bin_path in bin_paths:
+			bin_dir = os.path.dirname(bin_path)
+			if bin_dir not in self._network_dirs:
+				self._network_dirs[bin_dir] = is_network_path(bin_dir)
+			(polled_bins if self._network_dirs[bin_dir] else local_bins).add(bin_path)
+
+		self._local_bins  = local_bins
+		self._polled_bins = polled_bins
+		self._dirty_bins &= bin_paths
+		self._reloading_bins &= bin_paths
+		self._failed_stamps = {p: stamp for p, stamp in self._failed_stamps.items() if p in bin_paths}
+
+		if self.isEnabled():
+			self._updateWatches()
+
+	@QtCore.Slot(str)
+	def binReloaded(self, bin_path:str):
+		"""A changed bin has been dealt with; report it again if it changes again"""
+		self._reloading_bins.discard(session_cache.normalized_bin_path(bin_path))
+		self._failed_stamps.pop(session_cache.normalized_bin_path(bin_path), None)
+
+	@QtCore.Slot(str, object)
+	def binReloadFailed(self, bin_path:str, stamp:session_cache.BinStamp|None):
+		"""A changed bin couldn't be read, as of `stamp`; only report it again once that changes"""
+
+		bin_path = session_cache.normalized_bin_path(bin_path)
+		self._reloading_bins.discard(bin_path)
+		self._failed_stamps[bin_path] = stamp
+
+	def _updateWatches(self):
+
+		watched_files = set(self._watcher.files())
+		watched_dirs  = set(self._watcher.directories())
+
+		wanted_dirs  = set(os.path.dirname(p) for p in self._local_bins)
+
+		if watched_files - self._local_bins:
+			self._watcher.removePaths(list(watched_files - self._local_bins))
+		if watched_dirs - wanted_dirs:
+			self._watcher.removePaths(list(watched_dirs - wanted_dirs))
+
+		# Only bins that exist can be watched; the folder watch will catch them coming back
+		new_files = [p for p in self._local_bins - watched_files if os.path.isfile(p)]
+
+		failed_paths = []
+		if new_files:
+			failed_paths += self._watcher.addPaths(new_files)
+		if wanted_dirs - watched_dirs:
+			failed_paths += self._watcher.addPaths(list(wanted_dirs - watched_dirs))
+
+		# Out of watches (or not allowed); stat 'em instead
+		for failed_path in failed_paths:
+			if failed_path in self._local_bins:
+				self._local_bins.discard(failed_path)
+				self._polled_bins.add(failed_path)
+
+		if self._polled_bins:
+			self._timer_poll.start()
+		else:
+			self._timer_poll.stop()
+
+	def _clearWatches(self):
+
+		self._timer_poll.stop()
+
+		if self._watcher.files() or self._watcher.directories():
+			self._watcher.removePaths(self._watcher.files() + self._watcher.directories())
+
+	@QtCore.Slot(str)
+	def fileChanged(self, path:str):
+
+		if path in self._local_bins:
+			self._dirty_bins.add(path)
+			self._timer_settle.start()
+
+	@QtCore.Slot(str)
+	def directoryChanged(self, path:str):
+
+		# Could be a bin saved-by-swapping, or just a .lck coming or going.  Stamps will tell.
+		self._dirty_bins.update(p for p in self._local_bins if os.path.dirname(p) == path)
+
+		if self._dirty_bins:
+			self._timer_settle.start()
+
+	@QtCore.Slot()
+	def pollBins(self):
+		"""Check the stamps of bins that can't be watched"""
+
+		if self._is_checking:
+			return
+
+		self._checkBins(self._polled_bins)
+
+	@QtCore.Slot()
+	def checkDirtyBins(self):
+		"""Check the stamps of bins that have had filesystem events"""
+
+		if self._is_checking:
+			self._timer_settle.start()
+			return
+
+		dirty_bins = self._dirty_bins
+		self._dirty_bins = set()
+
+		self._checkBins(dirty_bins)
+
+		# Swapped-in files drop off the watcher
+		if self.isEnabled():
+			self._updateWatches()
+
+	def _checkBins(self, bin_paths:typing.Iterable[str]):
+
+		# Don't bother with bins that are already on their way back in
+		known_stamps = {p: self._failed_stamps[p] if p in self._failed_stamps else self._stamp_source(p) for p in bin_paths if p not in self._reloading_bins}
+
+		if not known_stamps:
+			return
+
+		self._is_checking = True
+
+		# Stats can hang on a sleepy file server, so off the GUI thread they go
+		check_job = session_cache.TRTSessionRevalidationJob(known_stamps, [p for p in known_stamps if p in self._failed_stamps and self._failed_stamps[p] is None])
+		check_job.signals().sig_revalidation_complete.connect(self.binsChecked)
+		self._pool.start(check_job)
+
+	@QtCore.Slot(list, list)
+	def binsChecked(self, changed_bin_paths:list[str], unchanged_bin_paths:list[str]):
+
+		self._is_checking = False
+
+		# Watching may have stopped, or the bins been removed, while we were out
+		watched_bins = self._local_bins | self._polled_bins
+		changed_bin_paths = [p for p in changed_bin_paths if p in watched_bins and p not in self._reloading_bins and os.path.isfile(p)]
+
+		if not self.isEnabled() or not changed_bin_paths:
+			return
+
+		self._reloading_bins.update(changed_bin_paths)
+
+		logging.getLogger(__name__).info("Bins changed on disk: %s", changed_bin_paths)
+		self.sig_bins_changed.emit(changed_bin_paths)
+
+
+class TRTBinLockScanJob(QtCore.QRunnable):
+	"""Look up the locks on a bunch of bins, off the GUI thread"""
+
+	class TRTBinLockScanSignals(QtCore.QObject):
+		sig_locks_scanned = QtCore.Signal(dict)
+		"""Lock info (or `None`) for each bin path"""
+
+	def __init__(self, scanner:locks_trt.BinLockScanner, bin_paths:list[str]):
+		super().__init__()
+		self._scanner = scanner
+		self._bin_paths = bin_paths
+		self._signals = self.TRTBinLockScanSignals()
+
+	def signals(self) -> TRTBinLockScanSignals:
+		return self._signals
+
+	def run(self):
+		self.signals().sig_locks_scanned.emit(self._scanner.scan(self._bin_paths))
+
+
+class TRTBinLockMonitor(QtCore.QObject):
+	"""Keep the lock state of bins up to date, without re-reading the bins themselves"""
+
+	DEFAULT_SCAN_INTERVAL:int = 5000
+	"""Milliseconds between lock scans"""
+
+	sig_bin_locks_changed = QtCore.Signal(dict)
+	"""Lock info (or `None`) for bins whose lock has changed since the last scan"""
+
+	def __init__(self, *args, **kwargs):
+
+		super().__init__(*args, **kwargs)
+
+		self._scanner = locks_trt.BinLockScanner()
+		self._bin_paths:list[str] = []
+		self._known_locks:dict[str, typing.Any] = {}
+
+		self._is_enabled = False
+		self._is_scanning = False
+		self._rescan_requested = False
+
+		self._pool = QtCore.QThreadPool.globalInstance()
+
+		self._timer_scan = QtCore.QTimer(self, interval=self.DEFAULT_SCAN_INTERVAL)
+		self._timer_scan.timeout.connect(self.scanLocks)
+
+	def isEnabled(self) -> bool:
+		return self._is_enabled
+
+	@QtCore.Slot(bool)
+	def setEnabled(self, is_enabled:bool):
+		"""Start or stop scanning periodically"""
+
+		self._is_enabled = bool(is_enabled)
+		self._updateTimer()
+
+	def _updateTimer(self):
+
+		if self._is_enabled and self._bin_paths:
+			if not self._timer_scan.isActive():
+				self._timer_scan.start()
+		else:
+			self._timer_scan.stop()
+
+	def scanInterval(self) -> int:
+		return self._timer_scan.interval()
+
+	def setScanInterval(self, interval_msec:int):
+		self._timer_scan.setInterval(max(int(interval_msec), 500))
+
+	@QtCore.Slot(list)
+	def setBinPaths(self, bin_paths:list[str]):
+		"""Set the bins to keep an eye on"""
+
+		bin_paths = sorted(set(session_cache.normalized_bin_path(p) for p in bin_paths))
+
+		if bin_paths == self._bin_paths:
+			return
+
+		self._bin_paths = bin_paths
+		self._known_locks = {p: lock for p, lock in self._known_locks.items() if p in bin_paths}
+		self._updateTimer()
+
+	@QtCore.Slot(str, object)
+	def binLockKnown(self, bin_path:str, lock_info:typing.Any):
+		"""A bin was just read, lock and all; no need to report it again unless it changes"""
+		self._known_locks[session_cache.normalized_bin_path(bin_path)] = lock_info
+
+	@QtCore.Slot()
+	def scanLocks(self):
+		"""Look up the locks on all the bins now"""
+
+		if not self._bin_paths:
+			return
+
+		if self._is_scanning:
+			self._rescan_requested = True
+			return
+
+		self._is_scanning = True
+
+		scan_job = TRTBinLockScanJob(self._scanner, list(self._bin_paths))
+		scan_job.signals().sig_locks_scanned.connect(self.locksScanned)
+		self._pool.start(scan_job)
+
+	@QtCore.Slot(dict)
+	def locksScanned(self, bin_locks:dict):
+
+		self._is_scanning = False
+
+		changed_locks = {}
+
+		for bin_path, lock_info in bin_locks.items():
+			# Bins may have been removed while we were out
+			if bin_path not in self._bin_paths:
+				continue
+			if bin_path not in self._known_locks or self._known_locks[bin_path] != lock_info:
+				changed_locks[bin_path] = lock_info
+			self._known_locks[bin_path] = lock_info
+
+		if changed_locks:
+			logging.getLogger(__name__).debug("Bin locks changed: %s", {p: getattr(l, "name", None) for p, l in changed_locks.items()})
+			self.sig_bin_locks_changed.emit(changed_locks)
+
+		if self._rescan_requested:
+			self._rescan_requested = False
+			self.scanLocks()
@@ -2,8 +2,8 @@ import typing, enum
 import avbutils
 from PySide6 import QtCore, QtGui, QtWidgets
 from timecode import Timecode
-from ...lbb_features.trt import model_trt
-from ...lbb_common.paint_delegates import LBClipColorPainter
+from ...lbb_features.trt import model_trt, calc_trt
+from ...lbb_common.paint_delegates import LBCachedClipColorPainter
 
 #
 # Cell items
@@ -153,18 +153,7 @@ class TRTDurationItem(TRTTimecodeItem):
 	
 	@classmethod
 	def to_string(cls, data):
-
-		tc_str = str(data)
-		is_neg =tc_str.startswith("-")
-		
-		# Get the index of the last separator
-		leading_chars = 1
-		sep = ":"
-		idx_last_sep = tc_str.rfind(sep) - leading_chars
-		pre, post = tc_str[:idx_last_sep], tc_str[idx_last_sep:]
-		pre = pre.lstrip("-00" + sep)
-
-		return f"{'-' if is_neg else ''}{pre}{post}".rjust(cls.STRING_PADDING)
+		return calc_trt.format_duration(data).rjust(cls.STRING_PADDING)
 
 class TRTFeetFramesItem(TRTNumericItem):
 
@@ -188,7 +177,7 @@ class TRTFeetFramesItem(TRTNumericItem):
 	
 	@classmethod
 	def to_string(cls, data):
-		return str(str(data // 16) + "+" + str(data % 16).zfill(2)).rjust(cls.STRING_PADDING)
+		return calc_trt.format_feet_frames(data).rjust(cls.STRING_PADDING)
 
 class TRTClipColorItem(TRTAbstractItem):
 	"""A clip color"""
@@ -336,7 +325,7 @@ class TRTClipColorDisplayDelegate(QtWidgets.QStyledItemDelegate):
 		rect_colorbox.moveCenter(rect_device.center())
 		
 		# Draw that sucker
-		LBClipColorPainter(rect_colorbox, painter, clip_color=clip_color)
+		LBCachedClipColorPainter(rect_colorbox, painter, clip_color=clip_color)
 	
 
 
@@ -361,7 +350,7 @@ class TRTTreeView(QtWidgets.QTreeView):
 			"""Get the display message for a given status"""
 			
 			if self is self.EMPTY:
-				return  "Add Bins To Begin\nTo load in sequences from your Avid bins, click the \"Add From Bins...\" button above, or drag-and-drop Avid bin (.avb) files here."
+				return  "Add Bins To Begin\nTo load in sequences from your Avid bins, click the \"Add From Bins...\" button above, or drag-and-drop Avid bin (.avb) files or folders here."
 			
 			if self is self.INITIAL_LOADING:
 				return "Now Loading...\nSequences will begin to appear here shortly."
@@ -42,13 +42,23 @@ class TRTControlsTrims(QtWidgets.QWidget):
 		self._from_head_marker = markers_trt.LBMarkerPresetComboBox()
 		self._from_tail_marker = markers_trt.LBMarkerPresetComboBox()
 
-		self._icon_mark_in  = QtWidgets.QLabel(pixmap=QtGui.QIcon(self.PATH_MARK_IN).pixmap(QtCore.QSize(16,16)))
-		self._icon_mark_out = QtWidgets.QLabel(pixmap=QtGui.QIcon(self.PATH_MARK_OUT).pixmap(QtCore.QSize(16,16)))
+		self._icon_mark_in  = QtWidgets.QLabel()
+		self._icon_mark_out = QtWidgets.QLabel()
+		self.refreshIcons()
 
 		self._lbl_total_note = QtWidgets.QLabel()
 
 		self._setupWidgets()
 		self._setupSignals()
+	
+	def refreshIcons(self):
+		"""Load the mark in/out icons, if the resources they're in are around yet"""
+
+		if not QtCore.QFile.exists(self.PATH_MARK_IN):
+			return
+
+		self._icon_mark_in.setPixmap(QtGui.QIcon(self.PATH_MARK_IN).pixmap(QtCore.QSize(16,16)))
+		self._icon_mark_out.setPixmap(QtGui.QIcon(self.PATH_MARK_OUT).pixmap(QtCore.QSize(16,16)))
 
 	
 	def _setupWidgets(self):
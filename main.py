@@ -9,6 +9,8 @@
 # nuitka-project: --plugin-enable=pyside6
 # nuitka-project: --include-qt-plugins=sqldrivers
 # nuitka-project: --noinclude-setuptools-mode="nofollow"
+# Feature tabs and such are imported by name once they're needed, so Nuitka won't see them coming
+# nuitka-project: --include-package=lilbinboy
 # ---
 
 # Addtional flags for local builds
@@ -0,0 +1,83 @@
+"""
+Benchmark the ways of reading bins for parsing (stream vs buffer vs mmap).
+
+	python widget_tests/bench_binreading.py /Volumes/Reels/*.avb --repeat 5
+	python widget_tests/bench_binreading.py ~/Desktop/*.avb --latency-ms 2
+
+Run it against bins on the actual file server for real numbers.  --latency-ms fakes a
+round trip per read on local bins, to get a feel for it without leaving your desk.
+"""
+
+import argparse, io, statistics, sys, time
+from lilbinboy.lbb_features.trt import logic_trt
+
+class LaggyFile(io.FileIO):
+	"""A file that takes its time with each read, like a far-away file server would, and counts them"""
+
+	latency:float = 0.0
+	read_count:int = 0
+
+	def _roundTrip(self):
+		LaggyFile.read_count += 1
+		time.sleep(self.latency)
+
+	def readinto(self, buffer):
+		self._roundTrip()
+		return super().readinto(buffer)
+
+	def read(self, size:int=-1):
+		self._roundTrip()
+		return super().read(size)
+
+	def readall(self):
+		# Servers hand out big reads in pieces, too
+		chunks = []
+		while chunk := self.read(1024 * 1024):
+			chunks.append(chunk)
+		return b"".join(chunks)
+
+def laggy_bin_source(bin_path:str, read_mode:logic_trt.BinReadMode=logic_trt.BinReadMode.AUTO, progress=None):
+
+	if read_mode is logic_trt.BinReadMode.STREAM:
+		# Same as avb.open() would do with a path
+		return io.BufferedReader(LaggyFile(bin_path), io.DEFAULT_BUFFER_SIZE)
+
+	if read_mode is logic_trt.BinReadMode.BUFFER:
+		with LaggyFile(bin_path) as bin_file:
+			return io.BytesIO(bin_file.readall())
+
+	return logic_trt.MappedBinFile(bin_path)
+
+def main():
+
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("bins", nargs="+")
+	parser.add_argument("--repeat", type=int, default=3, help="Parse each bin this many times per mode (default: %(default)s)")
+	parser.add_argument("--latency-ms", type=float, default=0.0, help="Fake round trip per read, in msec (default: %(default)s)")
+	parser.add_argument("--modes", default="stream,buffer,mmap", help="Modes to compare (default: %(default)s)")
+	args = parser.parse_args()
+
+	LaggyFile.latency = args.latency_ms / 1000
+	logic_trt.open_bin_source = laggy_bin_source
+
+	modes = [logic_trt.BinReadMode(m.strip()) for m in args.modes.split(",")]
+
+	print(f"{len(args.bins)} bin(s), {args.repeat} run(s) each, {args.latency_ms} ms fake latency\n")
+	print(f"{'Mode':<8} {'Total (ms)':>12} {'Median/bin (ms)':>16} {'Reads/bin':>10}")
+
+	for mode in modes:
+
+		timings = []
+		LaggyFile.read_count = 0
+
+		for _ in range(args.repeat):
+			for bin_path in args.bins:
+				time_start = time.perf_counter()
+				logic_trt.get_timelines_from_bin(bin_path, index_options=None, read_mode=mode)
+				timings.append((time.perf_counter() - time_start) * 1000)
+
+		reads_per_bin = f"{LaggyFile.read_count / len(timings):.0f}" if mode is not logic_trt.BinReadMode.MMAP else "-"
+		print(f"{mode.value:<8} {sum(timings):>12.1f} {statistics.median(timings):>16.2f} {reads_per_bin:>10}")
+
+if __name__ == "__main__":
+	sys.exit(main())